@@ -0,0 +1,58 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+
+"""Measure the Python memory held per received message, with the default
+Message classes and with the compact classes used by receivers opened
+with `compact=True`.
+
+Usage: python benchmark_message_memory.py [message_count]
+"""
+
+import sys
+import tracemalloc
+
+from uamqp import Message
+from uamqp.message import MessageHeader, MessageProperties
+from uamqp.message import _CompactMessage  # pylint: disable=protected-access
+
+
+def create_encoded_message():
+    message = Message(
+        body=b'x' * 256,
+        properties=MessageProperties(message_id=b'message-id', content_type=b'application/json'),
+        annotations={
+            b'x-opt-sequence-number': 1000,
+            b'x-opt-offset': b'123456',
+            b'x-opt-enqueued-time': 1600000000000},
+        application_properties={b'key': b'value'})
+    message.header = MessageHeader()
+    return message.encode_message()
+
+
+def measure(message_type, encoded, count, parse_sections):
+    tracemalloc.start()
+    messages = [message_type.decode_from_bytes(encoded) for _ in range(count)]
+    if parse_sections:
+        for message in messages:
+            message.properties  # pylint: disable=pointless-statement
+            message.header  # pylint: disable=pointless-statement
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del messages
+    return size / float(count)
+
+
+def benchmark_message_memory(count):
+    encoded = create_encoded_message()
+    for name, message_type in (('default', Message), ('compact', _CompactMessage)):
+        print("Bytes per received message ({}): {:.0f}".format(
+            name, measure(message_type, encoded, count, False)))
+        print("Bytes per received message with properties and header ({}): {:.0f}".format(
+            name, measure(message_type, encoded, count, True)))
+
+
+if __name__ == "__main__":
+    benchmark_message_memory(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -6,6 +6,8 @@
 
 # Python imports
 from enum import Enum
+from datetime import datetime
+import calendar
 import logging
 import uuid
 import copy
@@ -16,6 +18,7 @@ import six
 from libc cimport stdint
 from libc.stdlib cimport malloc, realloc, free
 from libc.string cimport memcpy
+from cpython.bytearray cimport PyByteArray_AS_STRING, PyByteArray_GET_SIZE, PyByteArray_Resize
 
 cimport cython
 cimport c_amqpvalue
@@ -26,11 +29,53 @@ _logger = logging.getLogger(__name__)
 
 
 cdef int encode_bytes_callback(void* context, const unsigned char* encoded_bytes, size_t length):
+    cdef Py_ssize_t offset
     context_obj = <object>context
-    context_obj.append(encoded_bytes[:length])
+    if type(context_obj) is bytearray:
+        # Grow the buffer in place rather than creating an intermediate bytes object.
+        offset = PyByteArray_GET_SIZE(context_obj)
+        if PyByteArray_Resize(context_obj, offset + length) != 0:
+            return 1
+        memcpy(PyByteArray_AS_STRING(context_obj) + offset, encoded_bytes, length)
+    elif type(context_obj) is EncodeBuffer:
+        return (<EncodeBuffer>context_obj).write(encoded_bytes, length)
+    else:
+        context_obj.append(encoded_bytes[:length])
     return 0
 
 
+cdef class EncodeBuffer(object):
+    """Encoder output that writes into a caller-supplied writable
+    buffer, starting at an offset.
+    """
+
+    cdef unsigned char[::1] _buffer
+    cdef readonly Py_ssize_t offset
+    cdef readonly bint overflow
+
+    def __cinit__(self, buffer, Py_ssize_t offset=0):
+        self._buffer = buffer
+        if offset < 0 or offset > self._buffer.shape[0]:
+            raise ValueError("Offset {} is outside the buffer of {} bytes.".format(offset, self._buffer.shape[0]))
+        self.offset = offset
+        self.overflow = False
+
+    cdef bint reserve(self, size_t length):
+        if <size_t>(self._buffer.shape[0] - self.offset) < length:
+            self.overflow = True
+        return not self.overflow
+
+    cdef int write(self, const unsigned char* encoded_bytes, size_t length):
+        if length == 0:
+            return 0
+        if <size_t>(self._buffer.shape[0] - self.offset) < length:
+            self.overflow = True
+            return 1
+        memcpy(&self._buffer[self.offset], encoded_bytes, length)
+        self.offset += length
+        return 0
+
+
 cdef get_amqp_value_type(c_amqpvalue.AMQP_VALUE value):
     type_val = c_amqpvalue.amqpvalue_get_type(value)
     try:
@@ -132,6 +177,282 @@ cdef value_factory(c_amqpvalue.AMQP_VALUE value):
     return new_obj
 
 
+cpdef to_python(AMQPValue value):
+    """Convert an AMQP value into native Python objects, recursing into
+    lists, maps, arrays and described values.
+    """
+    return _to_python(<c_amqpvalue.AMQP_VALUE>value._c_value)
+
+
+cdef _to_python(c_amqpvalue.AMQP_VALUE value):
+    # Walks the C value in place, so no intermediate AMQPValue wrappers are created.
+    cdef c_amqpvalue.AMQP_TYPE_TAG type_val
+    cdef bint bool_value
+    cdef unsigned char ubyte_value
+    cdef stdint.uint16_t ushort_value
+    cdef stdint.uint32_t uint_value
+    cdef stdint.uint64_t ulong_value
+    cdef char byte_value
+    cdef stdint.int16_t short_value
+    cdef stdint.int32_t int_value
+    cdef stdint.int64_t long_value
+    cdef float float_value
+    cdef double double_value
+    cdef c_amqpvalue.uuid uuid_value
+    cdef c_amqpvalue.amqp_binary binary_value
+    cdef const char* string_value
+    cdef stdint.uint32_t count
+    cdef stdint.uint32_t index
+    cdef c_amqpvalue.AMQP_VALUE item
+    cdef c_amqpvalue.AMQP_VALUE key
+
+    if <void*>value == NULL:
+        return None
+    type_val = c_amqpvalue.amqpvalue_get_type(value)
+    if type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_NULL:
+        return None
+    elif type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_BOOL:
+        # The C library writes a single byte bool, so only read back that byte.
+        bool_value = 0
+        if c_amqpvalue.amqpvalue_get_boolean(value, &bool_value) == 0:
+            return (<unsigned char*>&bool_value)[0] != 0
+    elif type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_UBYTE:
+        if c_amqpvalue.amqpvalue_get_ubyte(value, &ubyte_value) == 0:
+            return ubyte_value
+    elif type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_USHORT:
+        if c_amqpvalue.amqpvalue_get_ushort(value, &ushort_value) == 0:
+            return ushort_value
+    elif type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_UINT:
+        if c_amqpvalue.amqpvalue_get_uint(value, &uint_value) == 0:
+            return uint_value
+    elif type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_ULONG:
+        if c_amqpvalue.amqpvalue_get_ulong(value, &ulong_value) == 0:
+            return ulong_value
+    elif type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_BYTE:
+        if c_amqpvalue.amqpvalue_get_byte(value, &byte_value) == 0:
+            return byte_value
+    elif type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_SHORT:
+        if c_amqpvalue.amqpvalue_get_short(value, &short_value) == 0:
+            return short_value
+    elif type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_INT:
+        if c_amqpvalue.amqpvalue_get_int(value, &int_value) == 0:
+            return int_value
+    elif type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_LONG:
+        if c_amqpvalue.amqpvalue_get_long(value, &long_value) == 0:
+            return long_value
+    elif type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_FLOAT:
+        if c_amqpvalue.amqpvalue_get_float(value, &float_value) == 0:
+            return float_value
+    elif type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_DOUBLE:
+        if c_amqpvalue.amqpvalue_get_double(value, &double_value) == 0:
+            return double_value
+    elif type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_CHAR:
+        if c_amqpvalue.amqpvalue_get_char(value, &uint_value) == 0:
+            return chr(uint_value)
+    elif type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_TIMESTAMP:
+        if c_amqpvalue.amqpvalue_get_timestamp(value, &long_value) == 0:
+            return long_value
+    elif type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_UUID:
+        if c_amqpvalue.amqpvalue_get_uuid(value, &uuid_value) == 0:
+            return uuid.UUID(bytes=(<char*>uuid_value)[:16])
+    elif type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_BINARY:
+        if c_amqpvalue.amqpvalue_get_binary(value, &binary_value) == 0:
+            if binary_value.length == 0:
+                return b""
+            return (<char*>binary_value.bytes)[:binary_value.length]
+    elif type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_STRING:
+        if c_amqpvalue.amqpvalue_get_string(value, <char**>&string_value) == 0:
+            return <bytes>string_value
+    elif type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_SYMBOL:
+        if c_amqpvalue.amqpvalue_get_symbol(value, <char**>&string_value) == 0:
+            return <bytes>string_value
+    elif type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_LIST:
+        if c_amqpvalue.amqpvalue_get_list_item_count(value, &count) == 0:
+            result = []
+            for index in range(count):
+                result.append(_to_python(c_amqpvalue.amqpvalue_get_list_item_in_place(value, index)))
+            return result
+    elif type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_MAP:
+        if c_amqpvalue.amqpvalue_get_map_pair_count(value, &count) == 0:
+            result = {}
+            for index in range(count):
+                if c_amqpvalue.amqpvalue_get_map_key_value_pair(value, index, &key, &item) != 0:
+                    raise ValueError("Failed to get map item {}.".format(index))
+                try:
+                    result[_to_python(key)] = _to_python(item)
+                finally:
+                    c_amqpvalue.amqpvalue_destroy(key)
+                    c_amqpvalue.amqpvalue_destroy(item)
+            return result
+    elif type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_ARRAY:
+        if c_amqpvalue.amqpvalue_get_array_item_count(value, &count) == 0:
+            result = []
+            for index in range(count):
+                item = c_amqpvalue.amqpvalue_get_array_item(value, index)
+                if <void*>item == NULL:
+                    raise ValueError("Failed to get array item {}.".format(index))
+                try:
+                    result.append(_to_python(item))
+                finally:
+                    c_amqpvalue.amqpvalue_destroy(item)
+            return result
+    elif type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_DESCRIBED:
+        return _to_python(c_amqpvalue.amqpvalue_get_inplace_described_value(value))
+    elif type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_COMPOSITE:
+        return None
+    else:
+        error = "Unrecognized AMQPType: {}".format(get_amqp_value_type(value))
+        _logger.info(error)
+        raise TypeError(error)
+    raise ValueError("Failed to get value of AMQPType {}.".format(get_amqp_value_type(value)))
+
+
+cpdef from_python(value, encoding='UTF-8'):
+    """Convert a Python object into the equivalent AMQP value, building the
+    C value tree directly so that only the returned value is wrapped.
+    An ~uamqp.types.AMQPType or AMQPValue will be returned as-is, and None
+    will be returned for unsupported types.
+    """
+    cdef c_amqpvalue.AMQP_VALUE c_value
+    if value is None:
+        return null_value()
+    if isinstance(value, AMQPValue):
+        return value
+    if hasattr(value, 'c_data'):
+        return value.c_data
+    c_value = _from_python(value, encoding, False)
+    if <void*>c_value == NULL:
+        return None
+    return value_factory(c_value)
+
+
+cdef c_amqpvalue.AMQP_VALUE _create_integer(value) except *:
+    # Use the smallest of int, long or double that will hold the value.
+    if -2147483648 <= value <= 2147483647:
+        return c_amqpvalue.amqpvalue_create_int(value)
+    if -9223372036854775808 <= value <= 9223372036854775807:
+        return c_amqpvalue.amqpvalue_create_long(value)
+    return c_amqpvalue.amqpvalue_create_double(value)
+
+
+cdef c_amqpvalue.AMQP_VALUE _create_binary(bytes value) except *:
+    cdef c_amqpvalue.amqp_binary _binary
+    _binary.length = len(value)
+    _binary.bytes = <char*>value
+    return c_amqpvalue.amqpvalue_create_binary(_binary)
+
+
+cdef c_amqpvalue.AMQP_VALUE _create_map(dict value, encoding) except *:
+    cdef c_amqpvalue.AMQP_VALUE c_map
+    cdef c_amqpvalue.AMQP_VALUE c_key = <c_amqpvalue.AMQP_VALUE>NULL
+    cdef c_amqpvalue.AMQP_VALUE c_item = <c_amqpvalue.AMQP_VALUE>NULL
+    c_map = c_amqpvalue.amqpvalue_create_map()
+    if <void*>c_map == NULL:
+        raise MemoryError("Failed to create AMQP map.")
+    try:
+        for key, item in value.items():
+            c_key = _from_python(key, encoding, True)
+            c_item = _from_python(item, encoding, True)
+            if c_amqpvalue.amqpvalue_set_map_value(c_map, c_key, c_item) != 0:
+                raise ValueError("Failed to set AMQP map value.")
+            c_amqpvalue.amqpvalue_destroy(c_key)
+            c_amqpvalue.amqpvalue_destroy(c_item)
+            c_key = <c_amqpvalue.AMQP_VALUE>NULL
+            c_item = <c_amqpvalue.AMQP_VALUE>NULL
+    except:
+        if <void*>c_key != NULL:
+            c_amqpvalue.amqpvalue_destroy(c_key)
+        if <void*>c_item != NULL:
+            c_amqpvalue.amqpvalue_destroy(c_item)
+        c_amqpvalue.amqpvalue_destroy(c_map)
+        raise
+    return c_map
+
+
+cdef c_amqpvalue.AMQP_VALUE _create_list(value, encoding) except *:
+    cdef c_amqpvalue.AMQP_VALUE c_list
+    cdef c_amqpvalue.AMQP_VALUE c_item = <c_amqpvalue.AMQP_VALUE>NULL
+    cdef stdint.uint32_t index = 0
+    c_list = c_amqpvalue.amqpvalue_create_list()
+    if <void*>c_list == NULL:
+        raise MemoryError("Failed to create AMQP list.")
+    try:
+        if c_amqpvalue.amqpvalue_set_list_item_count(c_list, len(value)) != 0:
+            raise ValueError("Failed to set AMQP list size.")
+        for item in value:
+            c_item = _from_python(item, encoding, True)
+            if c_amqpvalue.amqpvalue_set_list_item(c_list, index, c_item) != 0:
+                raise ValueError("Failed to set AMQP list item.")
+            c_amqpvalue.amqpvalue_destroy(c_item)
+            c_item = <c_amqpvalue.AMQP_VALUE>NULL
+            index += 1
+    except:
+        if <void*>c_item != NULL:
+            c_amqpvalue.amqpvalue_destroy(c_item)
+        c_amqpvalue.amqpvalue_destroy(c_list)
+        raise
+    return c_list
+
+
+cdef c_amqpvalue.AMQP_VALUE _from_python(value, encoding, bint nested) except *:
+    # Returns a new C value owned by the caller. For an unsupported type this raises
+    # TypeError if nested within a container, otherwise returns NULL.
+    cdef c_amqpvalue.AMQP_VALUE result = <c_amqpvalue.AMQP_VALUE>NULL
+    value_type = type(value)
+    # Check the exact types most common in properties and annotations first.
+    if value_type is six.text_type:
+        encoded = value.encode(encoding)
+        result = c_amqpvalue.amqpvalue_create_string(<char*>encoded)
+    elif value_type is six.binary_type:
+        result = c_amqpvalue.amqpvalue_create_string(<char*>value)
+    elif value_type is bool:
+        result = c_amqpvalue.amqpvalue_create_boolean(1 if value else 0)
+    elif value_type is int:
+        result = _create_integer(value)
+    elif value_type is float:
+        result = c_amqpvalue.amqpvalue_create_double(value)
+    elif value_type is dict:
+        return _create_map(value, encoding)
+    elif value is None:
+        result = c_amqpvalue.amqpvalue_create_null()
+    elif isinstance(value, AMQPValue):
+        result = c_amqpvalue.amqpvalue_clone((<AMQPValue>value)._c_value)
+    elif hasattr(value, 'c_data'):
+        result = c_amqpvalue.amqpvalue_clone((<AMQPValue>value.c_data)._c_value)
+    # Fall back to the same checks as utils.data_factory for subclasses.
+    elif isinstance(value, bool):
+        result = c_amqpvalue.amqpvalue_create_boolean(1 if value else 0)
+    elif isinstance(value, six.text_type):
+        encoded = value.encode(encoding)
+        result = c_amqpvalue.amqpvalue_create_string(<char*>encoded)
+    elif isinstance(value, six.binary_type):
+        encoded = six.binary_type(value)
+        result = c_amqpvalue.amqpvalue_create_string(<char*>encoded)
+    elif isinstance(value, uuid.UUID):
+        encoded = value.bytes
+        result = c_amqpvalue.amqpvalue_create_uuid(<unsigned char*>encoded)
+    elif isinstance(value, bytearray):
+        return _create_binary(six.binary_type(value))
+    elif isinstance(value, six.integer_types):
+        return _create_integer(value)
+    elif isinstance(value, float):
+        result = c_amqpvalue.amqpvalue_create_double(value)
+    elif isinstance(value, dict):
+        return _create_map(dict(value), encoding)
+    elif isinstance(value, (list, set, tuple)):
+        return _create_list(value, encoding)
+    elif isinstance(value, datetime):
+        timestamp = int((calendar.timegm(value.utctimetuple()) * 1000) + (value.microsecond/1000))
+        result = c_amqpvalue.amqpvalue_create_timestamp(timestamp)
+    elif nested:
+        raise TypeError("Unable to convert type {} to an AMQP value.".format(value_type))
+    else:
+        return <c_amqpvalue.AMQP_VALUE>NULL
+    if <void*>result == NULL:
+        raise MemoryError("Failed to create AMQP value.")
+    return result
+
+
 cpdef null_value():
     new_obj = AMQPValue()
     new_obj.create()
@@ -740,10 +1061,7 @@ cdef class ListValue(AMQPValue):
     @property
     def value(self):
         assert self.type
-        value = []
-        for i in range(self.size):
-            value.append(copy.deepcopy(self[i].value))
-        return value
+        return _to_python(self._c_value)
 
 
 cdef class DictValue(AMQPValue):
@@ -792,11 +1110,7 @@ cdef class DictValue(AMQPValue):
     @property
     def value(self):
         assert self.type
-        value = {}
-        for i in range(self.size):
-            key, item = self.get(i)
-            value[copy.deepcopy(key.value)] = copy.deepcopy(item.value)
-        return value
+        return _to_python(self._c_value)
 
 
 cdef class ArrayValue(AMQPValue):
@@ -838,10 +1152,7 @@ cdef class ArrayValue(AMQPValue):
     @property
     def value(self):
         assert self.type
-        value = []
-        for i in range(self.size):
-            value.append(copy.deepcopy(self[i].value))
-        return value
+        return _to_python(self._c_value)
 
 
 cdef class CompositeValue(AMQPValue):
@@ -943,6 +1254,4 @@ cdef class DescribedValue(AMQPValue):
     @property
     def value(self):
         assert self.type
-        #descriptor = self.description
-        described = self.data
-        return copy.deepcopy(described.value)
+        return _to_python(self._c_value)
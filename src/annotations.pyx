@@ -6,7 +6,6 @@
 
 # Python imports
 import logging
-import copy
 
 # C imports
 from libc cimport stdint
@@ -127,17 +126,42 @@ cdef class cAnnotations(StructBase):
         except TypeError:
             return None
 
+    cdef c_amqpvalue.AMQP_VALUE _get_map(self):
+        cdef c_amqpvalue.AMQP_VALUE mapped
+        if c_amqpvalue.amqpvalue_get_map(<c_amqpvalue.AMQP_VALUE>self._c_value, &mapped) == 0:
+            return mapped
+        return <c_amqpvalue.AMQP_VALUE>NULL
+
     @property
     def map(self):
-        cdef c_amqpvalue.AMQP_VALUE unmapped
         cdef c_amqpvalue.AMQP_VALUE mapped
-        unmapped = c_amqpvalue.amqpvalue_clone(<c_amqpvalue.AMQP_VALUE>self._c_value)
-        if c_amqpvalue.amqpvalue_get_map(unmapped, &mapped) == 0:
-            if <void*>mapped == NULL:
-                return None
-            return copy.deepcopy(value_factory(mapped).value)
-        else:
+        mapped = self._get_map()
+        if <void*>mapped == NULL:
             return None
+        return _to_python(mapped)
+
+    cpdef get(self, key, default=None):
+        """Look up the value for a single key, converting only the keys
+        and the matching value rather than the whole map.
+        """
+        cdef c_amqpvalue.AMQP_VALUE mapped
+        cdef c_amqpvalue.AMQP_VALUE c_key
+        cdef c_amqpvalue.AMQP_VALUE c_item
+        cdef stdint.uint32_t count
+        cdef stdint.uint32_t index
+        mapped = self._get_map()
+        if <void*>mapped == NULL or c_amqpvalue.amqpvalue_get_map_pair_count(mapped, &count) != 0:
+            return default
+        for index in range(count):
+            if c_amqpvalue.amqpvalue_get_map_key_value_pair(mapped, index, &c_key, &c_item) != 0:
+                self._value_error()
+            try:
+                if _to_python(c_key) == key:
+                    return _to_python(c_item)
+            finally:
+                c_amqpvalue.amqpvalue_destroy(c_key)
+                c_amqpvalue.amqpvalue_destroy(c_item)
+        return default
 
 
 cdef class cApplicationProperties(cAnnotations):
@@ -148,26 +172,13 @@ cdef class cApplicationProperties(cAnnotations):
             <c_amqp_definitions.application_properties>value._c_value)
         self._validate()
 
-    @property
-    def map(self):
-        cdef c_amqpvalue.AMQP_VALUE unmapped
+    cdef c_amqpvalue.AMQP_VALUE _get_map(self):
         cdef c_amqpvalue.AMQP_VALUE mapped
-        cdef c_amqpvalue.AMQP_VALUE unextracted
         cdef c_amqpvalue.AMQP_VALUE extracted
-        unextracted = c_amqpvalue.amqpvalue_clone(<c_amqpvalue.AMQP_VALUE>self._c_value)
-        extracted = c_amqpvalue.amqpvalue_get_inplace_described_value(unextracted)
-        unmapped = c_amqpvalue.amqpvalue_clone(extracted)
-        if <void*>unmapped == NULL:
-            result = None
-        elif c_amqpvalue.amqpvalue_get_map(unmapped, &mapped) == 0:
-            if <void*>mapped == NULL:
-                result = None
-            else:
-                result = copy.deepcopy(value_factory(mapped).value)
-        else:
-            result = None
-        c_amqpvalue.amqpvalue_destroy(unextracted)
-        return result
+        extracted = c_amqpvalue.amqpvalue_get_inplace_described_value(<c_amqpvalue.AMQP_VALUE>self._c_value)
+        if <void*>extracted != NULL and c_amqpvalue.amqpvalue_get_map(extracted, &mapped) == 0:
+            return mapped
+        return <c_amqpvalue.AMQP_VALUE>NULL
 
 
 cdef class cDeliveryAnnotations(cAnnotations):
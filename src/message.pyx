@@ -6,10 +6,15 @@
 
 # Python imports
 from enum import Enum
+import array
 import logging
+import operator
 
 # C imports
 from libc cimport stdint
+from cpython.buffer cimport PyBuffer_FillInfo
+from libc.string cimport memcpy
+from libc.stdlib cimport realloc, free
 
 cimport c_message
 cimport c_amqp_definitions
@@ -18,6 +23,11 @@ cimport c_amqpvalue
 
 _logger = logging.getLogger(__name__)
 
+try:
+    _INT64_TYPECODE = array.array('q').typecode
+except ValueError:
+    _INT64_TYPECODE = 'l'
+
 
 class MessageBodyType(Enum):
     NoneType = c_message.MESSAGE_BODY_TYPE_TAG.MESSAGE_BODY_TYPE_NONE
@@ -243,12 +253,12 @@ cdef class cMessage(StructBase):
         else:
             self._value_error()
 
-    cpdef add_body_data(self, bytes value):
+    cpdef add_body_data(self, value):
         cdef c_message.BINARY_DATA _binary
-        length = len(value)
-        bytes = value[:length]
-        _binary.length = length
-        _binary.bytes = bytes
+        if not isinstance(value, (bytes, bytearray)):
+            raise TypeError("Body data must be bytes or bytearray.")
+        _binary.length = len(value)
+        _binary.bytes = value
         if c_message.message_add_body_amqp_data(self._c_value, _binary) != 0:
             self._value_error()
 
@@ -266,6 +276,26 @@ cdef class cMessage(StructBase):
         else:
             self._value_error()
 
+    cpdef get_body_data_view(self, size_t index):
+        cdef c_message.BINARY_DATA _value
+        if c_message.message_get_body_amqp_data_in_place(self._c_value, index, &_value) != 0:
+            self._value_error()
+        body_data = cMessageBodyData()
+        body_data.wrap(self, _value)
+        return memoryview(body_data)
+
+    cpdef get_body_data_length(self):
+        cdef c_message.BINARY_DATA _value
+        cdef size_t body_count
+        cdef size_t total_length = 0
+        if c_message.message_get_body_amqp_data_count(self._c_value, &body_count) != 0:
+            self._value_error()
+        for index in range(body_count):
+            if c_message.message_get_body_amqp_data_in_place(self._c_value, index, &_value) != 0:
+                self._value_error()
+            total_length += _value.length
+        return total_length
+
     cpdef set_body_value(self, AMQPValue value):
         if c_message.message_set_body_amqp_value(self._c_value, <c_amqpvalue.AMQP_VALUE>value._c_value) != 0:
             self._value_error()
@@ -299,6 +329,25 @@ cdef class cMessage(StructBase):
             self._value_error()
 
 
+cdef class cMessageBodyData(object):
+    """A read-only buffer over a single body data section of a cMessage.
+    The message is kept alive for as long as the buffer is referenced.
+    """
+
+    cdef cMessage _message
+    cdef c_message.BINARY_DATA _value
+
+    cdef wrap(self, cMessage message, c_message.BINARY_DATA value):
+        self._message = message
+        self._value = value
+
+    def __getbuffer__(self, Py_buffer *buffer, int flags):
+        PyBuffer_FillInfo(buffer, self, <void*>self._value.bytes, self._value.length, 1, flags)
+
+    def __releasebuffer__(self, Py_buffer *buffer):
+        pass
+
+
 cdef class Messaging(object):
 
     @staticmethod
@@ -584,6 +633,20 @@ cpdef size_t get_encoded_message_size(cMessage message, encoded_data):
                         total_encoded_size += encoded_size
                     c_amqpvalue.amqpvalue_destroy(body_amqp_data)
 
+        # without an output buffer only the encoded size is needed
+        if encoded_data is None:
+            destroy_amqp_objects_in_get_encoded_message_size(header, header_amqp_value, msg_annotations, footer, delivery_annotations,
+                properties, properties_amqp_value, application_properties, application_properties_value,
+                body_amqp_value)
+            return total_encoded_size
+
+        # check a fixed size output buffer has room before writing anything to it
+        if type(encoded_data) is EncodeBuffer and not (<EncodeBuffer>encoded_data).reserve(total_encoded_size):
+            destroy_amqp_objects_in_get_encoded_message_size(header, header_amqp_value, msg_annotations, footer, delivery_annotations,
+                properties, properties_amqp_value, application_properties, application_properties_value,
+                body_amqp_value)
+            return total_encoded_size
+
         # encode
         if <void*>header != NULL:
             if c_amqpvalue.amqpvalue_encode(
@@ -683,6 +746,127 @@ cpdef size_t get_encoded_message_size(cMessage message, encoded_data):
         return total_encoded_size
 
 
+cpdef encode_message_into(cMessage message, buffer, Py_ssize_t offset=0):
+    cdef EncodeBuffer encoded_data = EncodeBuffer(buffer, offset)
+    encoded_size = get_encoded_message_size(message, encoded_data)
+    if encoded_data.overflow:
+        raise ValueError("Buffer is too small to encode message of {} bytes at offset {}.".format(encoded_size, offset))
+    if <size_t>(encoded_data.offset - offset) != encoded_size:
+        raise ValueError("Failed to encode message.")
+    return encoded_size
+
+
+cdef object _to_int64(value):
+    """Convert an annotation value to an int64, or return None if it has
+    no exact int64 representation.
+    """
+    if isinstance(value, float):
+        if not value.is_integer():
+            return None
+        value = int(value)
+    elif isinstance(value, (bytes, unicode)):
+        try:
+            value = int(value)
+        except ValueError:
+            return None
+    else:
+        try:
+            value = operator.index(value)
+        except TypeError:
+            return None
+    if value < -2 ** 63 or value >= 2 ** 63:
+        return None
+    return value
+
+
+cdef _get_annotation_values(c_amqpvalue.AMQP_VALUE annotations, dict key_indexes, list columns, Py_ssize_t row):
+    cdef c_amqpvalue.AMQP_VALUE mapped
+    cdef c_amqpvalue.AMQP_VALUE c_key
+    cdef c_amqpvalue.AMQP_VALUE c_item
+    cdef stdint.uint32_t count
+    cdef stdint.uint32_t index
+    if c_amqpvalue.amqpvalue_get_map(annotations, &mapped) != 0:
+        return
+    if c_amqpvalue.amqpvalue_get_map_pair_count(mapped, &count) != 0:
+        raise ValueError("Failed to get message annotations count.")
+    for index in range(count):
+        if c_amqpvalue.amqpvalue_get_map_key_value_pair(mapped, index, &c_key, &c_item) != 0:
+            raise ValueError("Failed to get message annotation.")
+        try:
+            column_index = key_indexes.get(_to_python(c_key))
+            if column_index is not None:
+                value = _to_int64(_to_python(c_item))
+                if value is not None:
+                    columns[column_index][row] = value
+        finally:
+            c_amqpvalue.amqpvalue_destroy(c_key)
+            c_amqpvalue.amqpvalue_destroy(c_item)
+
+
+cpdef decode_columnar_batch(list messages, list annotation_keys, bint body=True, stdint.int64_t missing=-1):
+    """Decode the body data and integer annotations of a list of received
+    cMessages into columns. Returns a tuple of the body data of all messages
+    concatenated into a single bytearray, an int64 array of the offset of
+    each message body within it (with a final entry for the total length), and
+    an int64 array for each annotation key, using `missing` where the
+    annotation is not present or its value cannot be represented as an int64.
+    """
+    cdef cMessage message
+    cdef c_message.BINARY_DATA _value
+    cdef c_message.MESSAGE_BODY_TYPE_TAG body_type
+    cdef c_amqp_definitions.message_annotations annotations
+    cdef size_t body_count
+    cdef size_t total_length = 0
+    cdef size_t index
+    cdef Py_ssize_t row
+    cdef Py_ssize_t message_count = len(messages)
+    cdef char* body_buffer
+
+    body_offsets = array.array(_INT64_TYPECODE, [0]) * (message_count + 1)
+    columns = []
+    key_indexes = {}
+    for key in annotation_keys:
+        key_indexes[key] = len(columns)
+        columns.append(array.array(_INT64_TYPECODE, [missing]) * message_count)
+
+    for row in range(message_count):
+        message = messages[row]
+        if body:
+            if c_message.message_get_body_type(message._c_value, &body_type) != 0:
+                raise ValueError("Failed to get message body type.")
+            if body_type == c_message.MESSAGE_BODY_TYPE_TAG.MESSAGE_BODY_TYPE_DATA:
+                if c_message.message_get_body_amqp_data_count(message._c_value, &body_count) != 0:
+                    raise ValueError("Failed to get message body count.")
+                for index in range(body_count):
+                    if c_message.message_get_body_amqp_data_in_place(message._c_value, index, &_value) != 0:
+                        raise ValueError("Failed to get message body data.")
+                    total_length += _value.length
+        body_offsets[row + 1] = total_length
+        if key_indexes:
+            if c_message.message_get_message_annotations(message._c_value, &annotations) != 0:
+                raise ValueError("Failed to get message annotations.")
+            if <void*>annotations != NULL:
+                try:
+                    _get_annotation_values(<c_amqpvalue.AMQP_VALUE>annotations, key_indexes, columns, row)
+                finally:
+                    c_amqpvalue.amqpvalue_destroy(<c_amqpvalue.AMQP_VALUE>annotations)
+
+    body_data = bytearray(total_length)
+    if total_length:
+        body_buffer = body_data
+        for row in range(message_count):
+            message = messages[row]
+            total_length = body_offsets[row]
+            if body_offsets[row + 1] == total_length:
+                continue
+            c_message.message_get_body_amqp_data_count(message._c_value, &body_count)
+            for index in range(body_count):
+                c_message.message_get_body_amqp_data_in_place(message._c_value, index, &_value)
+                memcpy(body_buffer + total_length, _value.bytes, _value.length)
+                total_length += _value.length
+    return body_data, body_offsets, columns
+
+
 cdef class cMessageDecoder(object):
 
     cdef c_message.MESSAGE_HANDLE decoded_message
@@ -719,9 +903,135 @@ cpdef cMessage decode_message(stdint.uint32_t payload_size, const unsigned char*
     return message_factory(result)
 
 
+cdef struct StreamDecoderState:
+    c_message.MESSAGE_HANDLE message
+    c_message.MESSAGE_HANDLE* decoded
+    size_t decoded_count
+    size_t decoded_capacity
+    const char* decode_error
+
+
+cdef int complete_stream_message(StreamDecoderState* state) nogil:
+    cdef c_message.MESSAGE_HANDLE* decoded
+    if state.decoded_count == state.decoded_capacity:
+        decoded = <c_message.MESSAGE_HANDLE*>realloc(state.decoded, (state.decoded_capacity * 2 + 8) * sizeof(c_message.MESSAGE_HANDLE))
+        if decoded == NULL:
+            state.decode_error = b"Failed to allocate decoded messages"
+            return -1
+        state.decoded = decoded
+        state.decoded_capacity = state.decoded_capacity * 2 + 8
+    state.decoded[state.decoded_count] = state.message
+    state.decoded_count += 1
+    state.message = c_message.message_create()
+    if <void*>state.message == NULL:
+        state.decode_error = b"Failed to create message"
+        return -1
+    return 0
+
+
+cdef void decode_stream_data(void* context, c_amqpvalue.AMQP_VALUE decoded_value) nogil:
+    cdef StreamDecoderState* state = <StreamDecoderState*>context
+    if state.decode_error != NULL:
+        return
+    state.decode_error = set_message_section(state.message, decoded_value)
+
+
+cdef class cMessageStreamDecoder(object):
+    """Decode a stream of concatenated AMQP messages, reusing a single
+    value decoder. Each message is prefixed with its encoded size as a
+    4-byte big-endian integer.
+    """
+
+    cdef c_amqpvalue.AMQPVALUE_DECODER_HANDLE _decoder
+    cdef StreamDecoderState _state
+    cdef unsigned char _prefix[4]
+    cdef size_t _prefix_length
+    cdef size_t _remaining
+
+    def __cinit__(self):
+        self._state.message = c_message.message_create()
+        if <void*>self._state.message == NULL:
+            raise MemoryError("Failed to create message decoder.")
+        self._decoder = c_amqpvalue.amqpvalue_decoder_create(<c_amqpvalue.ON_VALUE_DECODED>decode_stream_data, <void*>&self._state)
+        if <void*>self._decoder == NULL:
+            raise MemoryError("Cannot create AMQP value decoder")
+
+    def __dealloc__(self):
+        _logger.debug("Deallocating cMessageStreamDecoder")
+        if <void*>self._decoder != NULL:
+            c_amqpvalue.amqpvalue_decoder_destroy(self._decoder)
+        if <void*>self._state.message != NULL:
+            c_message.message_destroy(self._state.message)
+        for index in range(self._state.decoded_count):
+            c_message.message_destroy(self._state.decoded[index])
+        free(self._state.decoded)
+
+    cdef int _decode_length_prefixed(self, const unsigned char* data, size_t size) nogil:
+        cdef size_t position = 0
+        cdef size_t length
+        while position < size and self._state.decode_error == NULL:
+            if self._remaining == 0 and self._prefix_length < 4:
+                self._prefix[self._prefix_length] = data[position]
+                self._prefix_length += 1
+                position += 1
+                if self._prefix_length == 4:
+                    self._remaining = ((<size_t>self._prefix[0] << 24) | (<size_t>self._prefix[1] << 16) |
+                                       (<size_t>self._prefix[2] << 8) | <size_t>self._prefix[3])
+                    if self._remaining == 0:
+                        self._prefix_length = 0
+                        if complete_stream_message(&self._state) != 0:
+                            return 0
+                continue
+            length = min(self._remaining, size - position)
+            if c_amqpvalue.amqpvalue_decode_bytes(self._decoder, <unsigned char*>data + position, length) != 0:
+                return -1
+            position += length
+            self._remaining -= length
+            if self._remaining == 0:
+                self._prefix_length = 0
+                if complete_stream_message(&self._state) != 0:
+                    return 0
+        return 0
+
+    cdef list _take_decoded(self):
+        decoded = []
+        for index in range(self._state.decoded_count):
+            decoded.append(message_factory(self._state.decoded[index]))
+        self._state.decoded_count = 0
+        if self._state.decode_error != NULL:
+            raise ValueError(self._state.decode_error.decode('UTF-8'))
+        return decoded
+
+    cpdef list decode(self, const unsigned char[:] data):
+        """Decode a chunk of the stream. Returns the messages completed within the chunk."""
+        cdef int result
+        cdef size_t size = data.shape[0]
+        cdef const unsigned char* data_bytes = &data[0] if size else NULL
+        if self._state.decode_error != NULL:
+            raise ValueError(self._state.decode_error.decode('UTF-8'))
+        with nogil:
+            result = self._decode_length_prefixed(data_bytes, size)
+        if result != 0:
+            self._state.decode_error = b"Cannot decode bytes"
+        return self._take_decoded()
+
+    cpdef list finish(self):
+        """Complete decoding at the end of the stream. Raises if the stream ended part way through a message."""
+        if self._remaining or self._prefix_length:
+            raise ValueError("Stream ended part way through a message.")
+        return self._take_decoded()
+
+
 cdef void decode_message_data(void* context, c_amqpvalue.AMQP_VALUE decoded_value):
     message_decoder = <cMessageDecoder>context
-    cdef c_message.MESSAGE_HANDLE decoded_message
+    cdef const char* decode_error
+    decode_error = set_message_section(message_decoder.decoded_message, decoded_value)
+    if decode_error != NULL:
+        message_decoder.decode_error = decode_error
+
+
+cdef const char* set_message_section(c_message.MESSAGE_HANDLE decoded_message, c_amqpvalue.AMQP_VALUE decoded_value) nogil:
+    cdef const char* decode_error = NULL
     cdef c_amqpvalue.AMQP_VALUE descriptor
     cdef c_amqp_definitions.PROPERTIES_HANDLE properties
     cdef c_amqp_definitions.annotations delivery_annotations
@@ -734,89 +1044,90 @@ cdef void decode_message_data(void* context, c_amqpvalue.AMQP_VALUE decoded_valu
     cdef c_amqp_definitions.data data_value
     cdef c_message.BINARY_DATA binary_data
 
-    decoded_message = message_decoder.decoded_message
     descriptor = c_amqpvalue.amqpvalue_get_inplace_descriptor(decoded_value)
 
     if c_amqp_definitions.is_application_properties_type_by_descriptor(descriptor):
         if c_message.message_set_application_properties(decoded_message, decoded_value) != 0:
-            message_decoder.decode_error = b"Error setting application properties on received message"
+            decode_error = b"Error setting application properties on received message"
 
     elif c_amqp_definitions.is_properties_type_by_descriptor(descriptor):
         if c_amqp_definitions.amqpvalue_get_properties(decoded_value, &properties) != 0:
-            message_decoder.decode_error = b"Error getting message properties"
+            decode_error = b"Error getting message properties"
 
         else:
             if c_message.message_set_properties(decoded_message, properties) != 0:
-                message_decoder.decode_error = b"Error setting message properties on received message"
+                decode_error = b"Error setting message properties on received message"
             c_amqp_definitions.properties_destroy(properties)
 
     elif c_amqp_definitions.is_delivery_annotations_type_by_descriptor(descriptor):
         delivery_annotations = c_amqpvalue.amqpvalue_get_inplace_described_value(decoded_value)
         if <void*>delivery_annotations == NULL:
-            message_decoder.decode_error = b"Error getting delivery annotations"
+            decode_error = b"Error getting delivery annotations"
         else:
             if c_message.message_set_delivery_annotations(decoded_message, delivery_annotations) != 0:
-                message_decoder.decode_error = b"Error setting delivery annotations on received message"
+                decode_error = b"Error setting delivery annotations on received message"
 
     elif c_amqp_definitions.is_message_annotations_type_by_descriptor(descriptor):
         message_annotations = c_amqpvalue.amqpvalue_get_inplace_described_value(decoded_value)
         if <void*>message_annotations == NULL:
-            message_decoder.decode_error = b"Error getting message annotations"
+            decode_error = b"Error getting message annotations"
         else:
             if c_message.message_set_message_annotations(decoded_message, message_annotations) != 0:
-                message_decoder.decode_error = b"Error setting message annotations on received message"
+                decode_error = b"Error setting message annotations on received message"
 
     elif c_amqp_definitions.is_header_type_by_descriptor(descriptor):
         if c_amqp_definitions.amqpvalue_get_header(decoded_value, &header) != 0:
-            message_decoder.decode_error = b"Error getting message header"
+            decode_error = b"Error getting message header"
         else:
             if c_message.message_set_header(decoded_message, header) != 0:
-                message_decoder.decode_error = b"Error setting message header on received message"
+                decode_error = b"Error setting message header on received message"
             c_amqp_definitions.header_destroy(header)
 
     elif c_amqp_definitions.is_footer_type_by_descriptor(descriptor):
         footer = c_amqpvalue.amqpvalue_get_inplace_described_value(decoded_value);
         if <void*>footer == NULL:
-            message_decoder.decode_error = b"Error getting message footer"
+            decode_error = b"Error getting message footer"
         else:
             if c_message.message_set_footer(decoded_message, footer) != 0:
-                message_decoder.decode_error = b"Error setting message footer on received message"
+                decode_error = b"Error setting message footer on received message"
 
     elif c_amqp_definitions.is_amqp_value_type_by_descriptor(descriptor):
         if c_message.message_get_body_type(decoded_message, &body_type) != 0:
-            message_decoder.decode_error = b"Error getting message body type"
+            decode_error = b"Error getting message body type"
 
         else:
             if body_type != c_message.MESSAGE_BODY_TYPE_TAG.MESSAGE_BODY_TYPE_NONE:
-                message_decoder.decode_error = b"Body already set on received message"
+                decode_error = b"Body already set on received message"
 
             else:
                 body_amqp_value = c_amqpvalue.amqpvalue_get_inplace_described_value(decoded_value)
                 if <void*>body_amqp_value == NULL:
-                    message_decoder.decode_error = b"Error getting body AMQP value"
+                    decode_error = b"Error getting body AMQP value"
                 else:
                     if c_message.message_set_body_amqp_value(decoded_message, body_amqp_value) != 0:
-                        message_decoder.decode_error = b"Error setting body AMQP value on received message"
+                        decode_error = b"Error setting body AMQP value on received message"
 
     elif c_amqp_definitions.is_data_type_by_descriptor(descriptor):
         if c_message.message_get_body_type(decoded_message, &body_type) != 0:
-            message_decoder.decode_error = b"Error getting message body type"
+            decode_error = b"Error getting message body type"
 
         else:
             if (body_type != c_message.MESSAGE_BODY_TYPE_TAG.MESSAGE_BODY_TYPE_NONE) and (body_type != c_message.MESSAGE_BODY_TYPE_TAG.MESSAGE_BODY_TYPE_DATA):
-                message_decoder.decode_error = b"Message body type already set to something different than AMQP DATA"
+                decode_error = b"Message body type already set to something different than AMQP DATA"
 
             else:
                 body_data_value = c_amqpvalue.amqpvalue_get_inplace_described_value(decoded_value)
                 if <void*>body_data_value == NULL:
-                    message_decoder.decode_error = b"Error getting body DATA value"
+                    decode_error = b"Error getting body DATA value"
 
                 else:
                     if c_amqpvalue.amqpvalue_get_binary(body_data_value, &data_value) != 0:
-                        message_decoder.decode_error = b"Error getting body DATA AMQP value"
+                        decode_error = b"Error getting body DATA AMQP value"
 
                     else:
                         binary_data.bytes = <const unsigned char*>data_value.bytes
                         binary_data.length = data_value.length
                         if c_message.message_add_body_amqp_data(decoded_message, binary_data) != 0:
-                            message_decoder.decode_error = b"Error adding body DATA to received message"
+                            decode_error = b"Error adding body DATA to received message"
+
+    return decode_error
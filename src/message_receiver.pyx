@@ -84,6 +84,22 @@ cdef class cMessageReceiver(StructBase):
             raise RuntimeError("Unable to send message dispostition 'released' for message number {}".format(message_number))
         c_amqpvalue.amqpvalue_destroy(delivery_state)
 
+    cpdef settle_accepted_messages(self, c_amqp_definitions.delivery_number first, c_amqp_definitions.delivery_number last):
+        cdef c_amqpvalue.AMQP_VALUE delivery_state
+        delivery_state = c_message.messaging_delivery_accepted()
+        if c_link.link_send_disposition_range(<c_link.LINK_HANDLE>self._link._c_value, first, last, delivery_state) != 0:
+            c_amqpvalue.amqpvalue_destroy(delivery_state)
+            raise RuntimeError("Unable to send message dispostition 'accepted' for message numbers {} to {}".format(first, last))
+        c_amqpvalue.amqpvalue_destroy(delivery_state)
+
+    cpdef settle_released_messages(self, c_amqp_definitions.delivery_number first, c_amqp_definitions.delivery_number last):
+        cdef c_amqpvalue.AMQP_VALUE delivery_state
+        delivery_state = c_message.messaging_delivery_released()
+        if c_link.link_send_disposition_range(<c_link.LINK_HANDLE>self._link._c_value, first, last, delivery_state) != 0:
+            c_amqpvalue.amqpvalue_destroy(delivery_state)
+            raise RuntimeError("Unable to send message dispostition 'released' for message numbers {} to {}".format(first, last))
+        c_amqpvalue.amqpvalue_destroy(delivery_state)
+
     cpdef settle_rejected_message(self, c_amqp_definitions.delivery_number message_number, const char* error_condition, const char* error_description, AMQPValue error_info=None):
         cdef c_amqpvalue.AMQP_VALUE delivery_state
         cdef c_amqp_definitions.fields delivery_fields
@@ -6,7 +6,6 @@
 
 # Python imports
 import logging
-import copy
 
 # C imports
 from libc cimport stdint
@@ -90,6 +89,34 @@ cdef class cMessageSender(StructBase):
             return False
         return True
 
+    cpdef send_many(self, list messages, list timeouts, list callback_contexts):
+        cdef cMessage message
+        cdef c_amqp_definitions.tickcounter_ms_t timeout
+        cdef c_async_operation.ASYNC_OPERATION_HANDLE operation
+        cdef list checked_timeouts = []
+        accepted = []
+        if len(timeouts) < len(messages) or len(callback_contexts) < len(messages):
+            raise ValueError("A timeout and callback context are required for each message.")
+        # Validate every message and timeout before any are sent, so that a bad one
+        # cannot raise after earlier messages have already been queued.
+        for index in range(len(messages)):
+            if not isinstance(messages[index], cMessage):
+                raise TypeError("Expected a cMessage, got {!r}.".format(type(messages[index])))
+            # Converting to tickcounter_ms_t raises TypeError or OverflowError for an invalid timeout.
+            timeout = timeouts[index]
+            checked_timeouts.append(timeout)
+        for index in range(len(messages)):
+            message = <cMessage>messages[index]
+            timeout = checked_timeouts[index]
+            callback_context = callback_contexts[index]
+            operation = c_message_sender.messagesender_send_async(self._c_value, <c_message.MESSAGE_HANDLE>message._c_value, on_message_send_complete, <void*>callback_context, timeout)
+            if <void*>operation is NULL:
+                _logger.info("Send operation result is NULL")
+                accepted.append(False)
+            else:
+                accepted.append(True)
+        return accepted
+
     cpdef set_trace(self, bint value):
         c_message_sender.messagesender_set_trace(self._c_value, value)
 
@@ -98,12 +125,10 @@ cdef class cMessageSender(StructBase):
 
 
 cdef void on_message_send_complete(void* context, c_message_sender.MESSAGE_SEND_RESULT_TAG send_result, c_amqpvalue.AMQP_VALUE delivery_state):
-    cdef c_amqpvalue.AMQP_VALUE send_data
     if <void*>delivery_state == NULL:
         wrapped = None
     else:
-        send_data = c_amqpvalue.amqpvalue_clone(delivery_state)
-        wrapped = copy.deepcopy(value_factory(send_data).value)
+        wrapped = _to_python(delivery_state)
     if context != NULL:
         context_pyobj = <PyObject*>context
         if context_pyobj.ob_refcnt == 0: # context is being garbage collected, skip the callback
@@ -258,4 +258,40 @@ def test_equal_values():
     assert value_a == value_b
     assert value_c == value_d
     assert value_a != value_c
-    assert value_d != value_e
\ No newline at end of file
+    assert value_d != value_e
+
+def test_to_python():
+    value = c_uamqp.dict_value()
+    nested = c_uamqp.list_value()
+    nested.size = 3
+    nested[0] = c_uamqp.bool_value(False)
+    nested[1] = c_uamqp.double_value(1.5)
+    nested[2] = c_uamqp.uuid_value(uuid.UUID('12345678-1234-5678-1234-567812345678'))
+    value[c_uamqp.symbol_value(b'nested')] = nested
+    value[c_uamqp.string_value(b'binary')] = c_uamqp.binary_value(b'\x00\x01')
+    value[c_uamqp.long_value(-1)] = c_uamqp.null_value()
+
+    expected = {
+        b'nested': [False, 1.5, uuid.UUID('12345678-1234-5678-1234-567812345678')],
+        b'binary': b'\x00\x01',
+        -1: None}
+    assert c_uamqp.to_python(value) == expected
+    assert value.value == expected
+    assert c_uamqp.to_python(c_uamqp.described_value(c_uamqp.ulong_value(0x74), value)) == expected
+
+def test_from_python():
+    value = c_uamqp.from_python({
+        u'list': [True, 2147483648, 2 ** 64, u'text', bytearray(b'\x00\x01')],
+        b'key': (None, 1.5, uuid.UUID('12345678-1234-5678-1234-567812345678')),
+        u'nested': {u'map': c_uamqp.symbol_value(b'symbol')}})
+
+    assert value.type == c_uamqp.AMQPType.DictValue
+    assert value.value == {
+        b'list': [True, 2147483648, float(2 ** 64), b'text', b'\x00\x01'],
+        b'key': [None, 1.5, uuid.UUID('12345678-1234-5678-1234-567812345678')],
+        b'nested': {b'map': b'symbol'}}
+    assert c_uamqp.from_python(42).type == c_uamqp.AMQPType.IntValue
+    assert c_uamqp.from_python(2147483648).type == c_uamqp.AMQPType.LongValue
+    assert c_uamqp.from_python(object()) is None
+    with pytest.raises(TypeError):
+        c_uamqp.from_python([object()])
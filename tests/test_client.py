@@ -0,0 +1,746 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+
+import functools
+import threading
+import time
+
+import pytest
+
+import uamqp
+from uamqp import constants
+
+
+class _MessageSender(object):
+
+    def __init__(self):
+        self.transferred = []
+
+    def send_many(self, messages, callback, timeout=0):
+        self.transferred.extend(messages)
+        return [True for _ in messages]
+
+
+class _Counter(object):
+    current_ms = 0
+
+    def get_current_ms(self):
+        return self.current_ms
+
+
+def _send_client(**kwargs):
+    send_client = uamqp.SendClient("amqps://localhost/queue", **kwargs)
+    send_client.message_handler = _MessageSender()
+    send_client.transferred = send_client.message_handler.transferred
+    return send_client
+
+
+def test_send_client_pending_messages():
+    send_client = _send_client()
+    messages = [uamqp.Message(body="Message {}".format(i)) for i in range(5)]
+    send_client.queue_message(*messages)
+    assert len(send_client.pending_messages) == 5
+    assert send_client.messages_pending()
+
+    send_client._filter_pending()
+    assert send_client.transferred == messages
+    assert all(m.state == constants.MessageState.WaitingForSendAck for m in messages)
+
+    send_client._on_message_sent(messages[0], constants.MessageSendResult.Ok)
+    send_client._on_message_sent(messages[1], constants.MessageSendResult.Error)
+    assert messages[0].state == constants.MessageState.SendComplete
+    assert messages[1].state == constants.MessageState.WaitingToBeSent
+    assert len(send_client.pending_messages) == 4
+    assert messages[0] not in send_client.pending_messages
+
+    send_client._filter_pending()
+    assert send_client.transferred[-1] is messages[1]
+    assert send_client._waiting_messages == 3
+
+    for message in messages[1:]:
+        send_client._on_message_sent(message, constants.MessageSendResult.Ok)
+    assert send_client.pending_messages == []
+    assert not send_client.messages_pending()
+
+
+def test_send_client_transfer_error():
+    send_client = _send_client()
+
+    def _failed_transfer(*args, **kwargs):
+        raise RuntimeError("Message sender failed to add message data to outgoing queue.")
+
+    send_client.message_handler.send_many = _failed_transfer
+    send_client._transfer_message = _failed_transfer
+    message = uamqp.Message(body="Message")
+    send_client.queue_message(message)
+    for attempt in range(send_client._error_policy.max_retries + 1):
+        send_client._filter_pending()
+    assert message.state == constants.MessageState.SendFailed
+    assert not send_client.messages_pending()
+
+
+def test_message_sender_send_many_invalid_timeout():
+    connection = uamqp.Connection("localhost", uamqp.authentication.SASLAnonymous("localhost"))
+    session = uamqp.Session(connection)
+    sender = uamqp.MessageSender(session, "source", uamqp.address.Target("amqps://localhost/queue"))
+    results = []
+
+    class _Context(object):
+
+        def _on_message_sent(self, message, result, delivery_state=None):
+            results.append(result)
+
+    contexts = [_Context(), _Context()]
+    c_messages = [uamqp.Message(body="Message {}".format(i)).get_message() for i in range(2)]
+    try:
+        with pytest.raises(TypeError):
+            sender._sender.send_many(c_messages, [0, "invalid"], contexts)
+        assert sender._sender.send_many(c_messages[:1], [0], contexts[:1]) == [True]
+    finally:
+        sender.destroy()
+        session.destroy()
+        connection.destroy()
+    assert len(results) == 1  # Only the second call queued a message, cancelled on destroy.
+
+
+def test_send_client_message_timeout():
+    send_client = _send_client(msg_timeout=1000)
+    send_client._counter = _Counter()
+    expired = uamqp.Message(body="Expired")
+    send_client.queue_message(expired)
+    send_client._counter.current_ms = 500
+    sent = uamqp.Message(body="Sent")
+    send_client.queue_message(sent)
+    assert send_client._pending_messages.waiting_to_be_sent == 2
+
+    send_client._counter.current_ms = 1200
+    send_client._filter_pending()
+    assert expired.state == constants.MessageState.SendFailed
+    assert isinstance(expired._response, uamqp.compat.TimeoutException)
+    assert send_client.transferred == [sent]
+    assert send_client.pending_messages == [sent]
+
+    send_client._counter.current_ms = 2000
+    send_client._filter_pending()
+    assert sent.state == constants.MessageState.WaitingForSendAck
+
+
+def test_send_client_transfer_not_accepted():
+    send_client = _send_client()
+    send_client.message_handler.send_many = lambda messages, callback, timeout: [True, False]
+    messages = [uamqp.Message(body="Message {}".format(i)) for i in range(2)]
+    send_client.queue_message(*messages)
+    send_client._filter_pending()
+    assert messages[0].state == constants.MessageState.WaitingForSendAck
+    assert messages[1].state == constants.MessageState.WaitingToBeSent
+    assert messages[1].retries == 1
+    assert send_client._pending_messages.waiting_to_be_sent == 1
+
+
+def test_receive_client_idle_wait():
+    receive_client = uamqp.ReceiveClient("amqps://localhost/queue", timeout=1000)
+    receive_client._last_activity_timestamp = 0
+    waits = [receive_client._get_idle_wait(0) for _ in range(8)]
+    assert waits == [0.001, 0.002, 0.004, 0.008, 0.016, 0.032, 0.05, 0.05]
+    assert receive_client._get_idle_wait(980) == pytest.approx(0.02)
+    assert receive_client._get_idle_wait(1200) == 0
+
+
+def test_link_credit_controller():
+    controller = uamqp.receiver.LinkCreditController(300, max_bytes=100000)
+    message = uamqp.Message(body=b'x' * 1000)
+    assert controller.get_credit(0, 0) == 300
+
+    # A consumer keeping up with 50 messages per second.
+    for now in range(100, 1100, 100):
+        for _ in range(5):
+            controller.message_received(message._message)
+        assert controller.get_credit(now, 0) == 51
+
+    # Messages are no longer consumed once the consumer stalls.
+    for now in range(1100, 3100, 100):
+        for _ in range(5):
+            controller.message_received(message._message)
+    assert controller.get_credit(3100, 100) == 0
+
+    # The credit is limited by the buffer size in bytes.
+    controller = uamqp.receiver.LinkCreditController(300, max_bytes=50000)
+    controller.message_received(message._message)
+    assert 0 < controller.get_credit(0, 10) < 40
+
+
+def test_receive_client_max_buffered_bytes():
+    class _MessageReceiver(object):
+
+        link_credit = None
+
+        def reset_link_credit(self, link_credit, **kwargs):
+            self.link_credit = link_credit
+
+    receive_client = uamqp.ReceiveClient("amqps://localhost/queue", max_buffered_bytes=3000)
+    receive_client.message_handler = _MessageReceiver()
+    message_size = uamqp.Message(body=b'x' * 1000).get_message_encoded_size()
+    for _ in range(3):
+        receive_client._received_messages.put(uamqp.Message(body=b'x' * 1000))
+    assert receive_client.buffered_bytes == 3 * message_size
+
+    assert not receive_client._link_credit_available()
+    assert receive_client.message_handler.link_credit == 0
+    receive_client._received_messages.get()
+    assert receive_client.buffered_bytes == 2 * message_size
+    assert not receive_client._link_credit_available()
+    receive_client._received_messages.get()
+    assert receive_client._link_credit_available()
+
+
+def test_receive_columnar_batch_leftover_messages():
+    receive_client = uamqp.ReceiveClient("amqps://localhost/queue", max_buffered_bytes=10000)
+    encoded = [uamqp.Message(body="Message {}".format(i)).encode_message() for i in range(3)]
+
+    def _receive_message_batch(max_batch_size=None, timeout=0):
+        # Simulate more raw messages arriving than fit in the batch.
+        for data in encoded:
+            receive_client._received_messages.put(uamqp.Message.decode_from_bytes(data)._message)
+        return [receive_client._received_messages.get()]
+
+    receive_client.receive_message_batch = _receive_message_batch
+    batch = receive_client.receive_columnar_batch(['body'], max_batch_size=1)
+    assert bytes(batch['body']) == b'Message 0'
+
+    leftover = [receive_client._received_messages.get() for _ in range(2)]
+    assert all(isinstance(m, uamqp.Message) for m in leftover)
+    assert [list(m.get_data()) for m in leftover] == [[b'Message 1'], [b'Message 2']]
+    assert receive_client.buffered_bytes == 0
+    for message in leftover:
+        receive_client._complete_message(message, True)
+
+
+def test_message_receiver_settle_batch():
+    class _Receiver(object):
+
+        def __init__(self):
+            self.dispositions = []
+
+        def settle_accepted_message(self, message_number):
+            self.dispositions.append(('accepted', message_number, message_number))
+
+        def settle_accepted_messages(self, first, last):
+            self.dispositions.append(('accepted', first, last))
+
+        def settle_released_messages(self, first, last):
+            self.dispositions.append(('released', first, last))
+
+        def settle_rejected_message(self, message_number, *args):
+            self.dispositions.append(('rejected', message_number, message_number))
+
+    message_receiver = uamqp.receiver.MessageReceiver.__new__(uamqp.receiver.MessageReceiver)
+    message_receiver._receiver = _Receiver()
+    message_receiver._counter = _Counter()
+    message_receiver._settle_batch_size = 3
+    message_receiver._settle_batch_timeout = 10
+    message_receiver._pending_settlement = None
+    dispositions = message_receiver._receiver.dispositions
+
+    for message_number in range(4):
+        message_receiver._settle_message(message_number, uamqp.errors.MessageAccepted())
+    assert dispositions == [('accepted', 0, 2)]
+    message_receiver._settle_message(4, uamqp.errors.MessageReleased())
+    message_receiver._settle_message(6, uamqp.errors.MessageReleased())
+    assert dispositions[1:] == [('accepted', 3, 3), ('released', 4, 4)]
+    message_receiver._settle_message(7, uamqp.errors.MessageReleased())
+    message_receiver.flush_settlements(expired_only=True)
+    assert len(dispositions) == 3
+    message_receiver._counter.current_ms = 10
+    message_receiver.flush_settlements(expired_only=True)
+    assert dispositions[3:] == [('released', 6, 7)]
+    message_receiver._settle_message(8, uamqp.errors.MessageAccepted())
+    message_receiver._settle_message(9, uamqp.errors.MessageRejected())
+    assert dispositions[4:] == [('accepted', 8, 8), ('rejected', 9, 9)]
+
+
+def test_message_receiver_destroy_flushes_settlements():
+    class _Receiver(object):
+
+        def __init__(self):
+            self.calls = []
+
+        def settle_accepted_messages(self, first, last):
+            self.calls.append(('accepted', first, last))
+
+        def destroy(self):
+            self.calls.append('destroy')
+
+    class _Link(object):
+
+        def __init__(self, receiver):
+            self._receiver = receiver
+
+        def do_work(self):
+            self._receiver.calls.append('work')
+
+        def destroy(self):
+            pass
+
+    message_receiver = uamqp.receiver.MessageReceiver.__new__(uamqp.receiver.MessageReceiver)
+    message_receiver._receiver = _Receiver()
+    message_receiver._link = _Link(message_receiver._receiver)
+    message_receiver._counter = _Counter()
+    message_receiver._settle_batch_size = 10
+    message_receiver._settle_batch_timeout = 1000
+    message_receiver._pending_settlement = None
+
+    message_receiver._settle_message(0, uamqp.errors.MessageAccepted())
+    message_receiver._settle_message(1, uamqp.errors.MessageAccepted())
+    message_receiver.destroy()
+    assert message_receiver._receiver.calls == [('accepted', 0, 1), 'work', 'destroy']
+    assert message_receiver._pending_settlement is None
+
+
+def test_receive_message_batch_min_batch_size():
+    receive_client = uamqp.ReceiveClient("amqps://localhost/queue")
+    receive_client._counter = _Counter()
+    receive_client.open = lambda: None
+    arrivals = []
+
+    def _do_work():
+        receive_client._counter.current_ms += 10
+        for _ in range(arrivals.pop(0) if arrivals else 0):
+            receive_client._received_messages.put(uamqp.Message(body=b"Message"))
+        return True
+
+    receive_client.do_work = _do_work
+    arrivals.extend([1, 0, 2, 0, 0, 3])
+    batch = receive_client.receive_message_batch(max_batch_size=10, min_batch_size=5, max_wait_time=1000)
+    assert len(batch) == 6
+    assert receive_client._counter.current_ms == 60
+
+    arrivals.extend([1])
+    batch = receive_client.receive_message_batch(max_batch_size=10, min_batch_size=5, max_wait_time=100)
+    assert len(batch) == 1
+    assert receive_client._counter.current_ms == 160
+    receive_client._idle_wait = 0.05
+    receive_client._wait_deadline = 170
+    assert receive_client._get_idle_wait(160) == pytest.approx(0.01)
+    receive_client._wait_deadline = 0
+
+    arrivals.extend([1, 0, 2])
+    batch = receive_client.receive_message_batch(max_batch_size=10)
+    assert len(batch) == 1
+
+    with pytest.raises(ValueError):
+        receive_client.receive_message_batch(max_batch_size=10, min_batch_size=20)
+
+
+def test_receive_client_dispatch_to_executor():
+    futures = pytest.importorskip("concurrent.futures")
+    encoded = uamqp.Message(body=b"Message").encode_message()
+    connection_thread = threading.current_thread()
+    settled = []
+    processed = []
+
+    def _settler(message_number, response):
+        assert threading.current_thread() is connection_thread
+        settled.append((message_number, type(response)))
+
+    def _callback(message):
+        if message.delivery_no % 3 == 0:
+            time.sleep(0.01)
+        processed.append(message.delivery_no)
+        if message.delivery_no == 4:
+            message.release()
+        if message.delivery_no == 5:
+            raise ValueError("Failed to process message.")
+
+    with futures.ThreadPoolExecutor(max_workers=4) as executor:
+        dispatcher = uamqp.client._MessageDispatcher(
+            executor, _callback, ordering_key=lambda m: m.delivery_no % 2)
+        messages = []
+        for message_number in range(8):
+            message = uamqp.Message(
+                message=uamqp.Message.decode_from_bytes(encoded)._message,
+                settler=functools.partial(_settler, message_number),
+                delivery_no=message_number)
+            messages.append(message)
+            dispatcher.dispatch(message)
+        while dispatcher.pending:
+            time.sleep(0.001)
+    assert settled == []
+    dispatcher.send_settlements()
+
+    assert [n for n in processed if n % 2 == 0] == [0, 2, 4, 6]
+    assert [n for n in processed if n % 2 == 1] == [1, 3, 5, 7]
+    outcomes = dict(settled)
+    assert outcomes[4] is uamqp.errors.MessageReleased
+    assert outcomes[5] is uamqp.errors.MessageModified
+    assert all(outcomes[n] is uamqp.errors.MessageAccepted for n in (0, 1, 2, 3, 6, 7))
+    assert all(m.settled for m in messages)
+
+
+def test_receive_messages_drains_dispatcher_on_error():
+    futures = pytest.importorskip("concurrent.futures")
+    encoded = uamqp.Message(body=b"Message").encode_message()
+    release = threading.Event()
+    settled = []
+
+    class _Connection(object):
+
+        def work(self):
+            receive_client._counter.current_ms += 10
+
+    class _MessageReceiver(object):
+
+        def flush_settlements(self):
+            pass
+
+    def _callback(message):
+        if message.delivery_no:
+            release.wait(5)
+
+    receive_client = uamqp.ReceiveClient(
+        "amqps://localhost/queue", timeout=100, shutdown_after_timeout=False)
+    receive_client._counter = _Counter()
+    receive_client._connection = _Connection()
+    receive_client.message_handler = _MessageReceiver()
+    receive_client.open = lambda: None
+
+    def _do_work():
+        for message_number in range(2):
+            receive_client._dispatcher.dispatch(uamqp.Message(
+                message=uamqp.Message.decode_from_bytes(encoded)._message,
+                settler=lambda response, n=message_number: settled.append(n),
+                delivery_no=message_number))
+        raise ValueError("Connection failed.")
+
+    receive_client.do_work = _do_work
+    with futures.ThreadPoolExecutor(max_workers=2) as executor:
+        with pytest.raises(ValueError):
+            receive_client.receive_messages(_callback, executor=executor)
+        release.set()
+    assert settled == [0]
+    assert receive_client._dispatcher is None
+    assert receive_client._counter.current_ms >= 100
+
+
+def test_connection_pool():
+    class _Connection(object):
+
+        def __init__(self, hostname, auth, container_id=None, channel_max=None, **kwargs):
+            self.hostname = hostname
+            self.auth = auth
+            self.container_id = container_id
+            self.channel_max = channel_max or 65535
+            self.destroyed = False
+            self._error = None
+
+        def destroy(self):
+            self.destroyed = True
+
+    pool = uamqp.ConnectionPool(idle_ttl=1000)
+    pool._counter = _Counter()
+    auth = uamqp.authentication.SASLPlain("localhost", "user", "password")
+    other_auth = uamqp.authentication.SASLPlain("localhost", "other", "password")
+
+    def _lease(auth, hostname="localhost"):
+        return pool.lease(hostname, auth, connection_type=_Connection, handle_max=2, channel_max=7)
+
+    first = _lease(auth)
+    assert _lease(uamqp.authentication.SASLPlain("localhost", "user", "password")) is first
+    assert _lease(auth) is first
+    assert _lease(auth) is not first  # The handle_max allows three links per connection.
+    assert _lease(other_auth) is not first
+    assert _lease(auth, hostname=b"otherhost") is not first
+
+    for _ in range(3):
+        pool.release(first)
+    assert not first.destroyed
+    with pytest.raises(ValueError):
+        pool.release(first)
+    pool._counter.current_ms = 500
+    assert _lease(auth) is first
+    pool.release(first)
+
+    pool._counter.current_ms = 1500
+    pool.close_idle()
+    assert first.destroyed
+    assert _lease(auth) is not first
+
+    # Clients only share a Connection if they have the same credential.
+    def _sas_token(token):
+        return uamqp.authentication.SASTokenAuth(
+            "audience", "amqps://localhost/queue", token, expires_at=time.time() + 3600)
+
+    def _jwt_token(get_token):
+        return uamqp.authentication.JWTTokenAuth("audience", "amqps://localhost/queue", get_token)
+
+    def _get_token():
+        return None
+
+    assert _lease(_sas_token("first")) is _lease(_sas_token("first"))
+    assert _lease(_sas_token("first")) is not _lease(_sas_token("second"))
+    assert _lease(_jwt_token(_get_token)) is _lease(_jwt_token(_get_token))
+    assert _lease(_jwt_token(_get_token)) is not _lease(_jwt_token(lambda: None))
+    assert _lease(auth) is not _lease(uamqp.authentication.SASLPlain("localhost", "user", "other"))
+
+    client = uamqp.AMQPClient(
+        "amqps://localhost/queue", auth=_sas_token("first"), connection_pool=pool)
+    client.connection_type = _Connection
+    leased = client._lease_connection()
+    leased.auth = _sas_token("second")
+    with pytest.raises(ValueError):
+        client._lease_connection()
+
+
+def test_connection_pool_async():
+    asyncio = pytest.importorskip("asyncio")
+    pool_async = pytest.importorskip("uamqp.async_ops.pool_async")
+
+    class _Connection(object):
+
+        def __init__(self, hostname, auth, loop=None, **kwargs):
+            self.loop = loop
+            self.channel_max = 65535
+            self.container_id = None
+            self.destroyed = False
+            self._error = None
+
+        def destroy(self):
+            raise AssertionError("Connection must be destroyed asynchronously.")
+
+        def destroy_async(self):
+            self.destroyed = True
+            return asyncio.sleep(0)
+
+    loop = asyncio.new_event_loop()
+    other_loop = asyncio.new_event_loop()
+    pool = pool_async.ConnectionPoolAsync(idle_ttl=1000)
+    pool._counter = _Counter()
+    auth = uamqp.authentication.SASLPlain("localhost", "user", "password")
+
+    def _lease(lease_loop):
+        return loop.run_until_complete(
+            pool.lease_async("localhost", auth, connection_type=_Connection, loop=lease_loop))
+
+    try:
+        first = _lease(loop)
+        assert _lease(loop) is first
+        assert _lease(other_loop) is not first
+        loop.run_until_complete(pool.release_async(first))
+        loop.run_until_complete(pool.release_async(first))
+        pool._counter.current_ms = 1500
+        loop.run_until_complete(pool.close_idle_async())
+        assert first.destroyed
+        assert _lease(loop) is not first
+        loop.run_until_complete(pool.close_async())
+    finally:
+        loop.close()
+        other_loop.close()
+
+
+def test_reactor():
+    class _Client(uamqp.AMQPClient):
+
+        def __init__(self, connection, error=None):
+            super(_Client, self).__init__("amqps://localhost/queue")
+            self._connection = connection
+            self._error = error
+            self.iterations = 0
+
+        def open(self, connection=None):
+            pass
+
+        def client_ready(self):
+            return True
+
+        def _reactor_idle_wait(self):
+            return 0.001
+
+        def _client_run(self):
+            self.iterations += 1
+            if self._error:
+                raise self._error
+            if self.iterations == 3:
+                self._wait_idle(10)
+            return True
+
+    class _Connection(object):
+        _owner = None
+
+        def _check_owner(self, operation):
+            pass
+
+    shared, other = _Connection(), _Connection()
+    first, second, third = _Client(shared), _Client(shared), _Client(other)
+    failing = _Client(other, error=ValueError("Iteration failed."))
+    with uamqp.Reactor(threads=2) as reactor:
+        for client in (first, second, third):
+            reactor.register(client)
+        assert reactor.clients == 3
+        assert reactor._assigned[id(first)][0] is reactor._assigned[id(second)][0]
+        assert reactor._assigned[id(third)][0] is not reactor._assigned[id(first)][0]
+
+        while first.iterations < 3:
+            assert first.do_work()
+        time.sleep(0.1)
+        assert first.iterations == 3  # Waiting on its timer rather than running.
+        reactor.wake(first)
+        while first.iterations < 4:
+            assert first.do_work()
+
+        reactor.register(failing)
+        with pytest.raises(ValueError):
+            while True:
+                failing.do_work()
+        assert failing._reactor is None
+
+        second.close()
+        assert second._reactor is None
+        iterations = second.iterations
+        time.sleep(0.1)
+        assert second.iterations == iterations
+        assert reactor.clients == 2
+    assert reactor.clients == 0
+    assert first._reactor is None and third._reactor is None
+
+
+def test_timer_service():
+    from uamqp.timers import TimerService
+
+    service = TimerService()
+    calls = {'first': 0, 'second': 0}
+
+    def _callback(name, runs):
+        calls[name] += 1
+        return calls[name] < runs
+
+    first = service.schedule(0.01, functools.partial(_callback, 'first', 3))
+    second = service.schedule(0.02, functools.partial(_callback, 'second', 1000))
+    thread = service._thread
+    assert len(service) == 2
+    while calls['first'] < 3:
+        time.sleep(0.01)
+    time.sleep(0.05)
+    assert calls['first'] == 3  # Stopped by returning False.
+    second.cancel()
+    runs = calls['second']
+    assert runs > 0
+    time.sleep(0.05)
+    assert calls['second'] == runs
+    thread.join(1)
+    assert not thread.is_alive()  # The thread exits once no timers remain.
+    assert service._thread is None
+    first.cancel()
+
+
+def test_keep_alive_works_connection_only():
+    class _Auth(object):
+
+        def handle_token(self):
+            raise AssertionError("The keep-alive must not block on the CBS token.")
+
+    class _Connection(object):
+        _cbs = object()
+
+        def __init__(self):
+            self.work_calls = 0
+
+        def _pinned_to_other_thread(self):
+            return False
+
+        def work(self):
+            self.work_calls += 1
+            if self.work_calls > 1:
+                raise ValueError("Connection failed.")
+
+    client = uamqp.AMQPClient("amqps://localhost/queue")
+    client._auth = _Auth()
+    client._connection = _Connection()
+    assert client._keep_alive() is True
+    assert client._connection.work_calls == 1
+    assert client._keep_alive() is False  # A failure stops the timer.
+    client._shutdown = True
+    assert client._keep_alive() is False
+
+
+def test_open_all():
+    log = []
+
+    class _Connection(object):
+        def __init__(self, state):
+            self._state = state
+
+    class _Client(object):
+        _reactor = None
+        _connection = None
+        message_handler = None
+
+        def __init__(self, name, iterations):
+            self.name = name
+            self.iterations = iterations
+            self.connection = None
+
+        def open(self, connection=None):
+            self.connection = connection
+            log.append(('open', self.name))
+
+        def client_ready(self):
+            log.append(('work', self.name))
+            if self.iterations is None:
+                raise ValueError("Failed to open.")
+            self.iterations -= 1
+            return self.iterations <= 0
+
+        def close(self):
+            log.append(('close', self.name))
+
+    connection = object()
+    clients = [_Client(0, 3), _Client(1, 1), _Client(2, 2)]
+    uamqp.open_all(clients, connection=connection)
+    assert all(c.connection is connection for c in clients)
+    # All the clients are opened up front and worked together, one pass per round trip.
+    assert log == [
+        ('open', 0), ('open', 1), ('open', 2),
+        ('work', 0), ('work', 1), ('work', 2),
+        ('work', 0), ('work', 2),
+        ('work', 0)]
+
+    del log[:]
+    clients = [_Client(0, 2), _Client(1, 1), _Client(2, 1)]
+    uamqp.open_all(clients, concurrency=2)
+    assert log == [
+        ('open', 0), ('open', 1),
+        ('work', 0), ('work', 1),
+        ('open', 2),
+        ('work', 0), ('work', 2)]
+
+    del log[:]
+    clients = [_Client(0, 1), _Client(1, None), _Client(2, 1)]
+    with pytest.raises(ValueError):
+        uamqp.open_all(clients, concurrency=2)
+    # Only the clients opened by the call are closed.
+    assert log[-2:] == [('close', 0), ('close', 1)]
+
+    del log[:]
+    clients = [_Client(0, 1000)]
+    with pytest.raises(uamqp.compat.TimeoutException):
+        uamqp.open_all(clients, timeout=100)
+    assert log[-1] == ('close', 0)
+    assert 1 < len(log) < 20  # Backs off between passes without progress rather than spinning.
+
+    # Passes in which the state of a Connection changes are not followed by a wait.
+    class _ProgressingClient(_Client):
+        def client_ready(self):
+            self._connection = _Connection(self.iterations)
+            return _Client.client_ready(self)
+
+    del log[:]
+    start = time.time()
+    uamqp.open_all([_ProgressingClient(0, 100)])
+    assert len(log) == 101
+    assert time.time() - start < 1
+
+    clients[0]._reactor = object()
+    with pytest.raises(ValueError):
+        uamqp.open_all(clients)
@@ -0,0 +1,139 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+
+import threading
+
+import pytest
+
+import uamqp
+from uamqp import compat
+
+
+class _Conn(object):
+
+    def __init__(self):
+        self.iterations = 0
+
+    def do_work(self):
+        self.iterations += 1
+
+
+def _run_in_thread(target):
+    result = {}
+
+    def _target():
+        try:
+            result['value'] = target()
+        except Exception as e:  # pylint: disable=broad-except
+            result['error'] = e
+
+    thread = threading.Thread(target=_target)
+    thread.start()
+    thread.join()
+    return result
+
+
+def test_connection_pinned_to_thread():
+    connection = uamqp.Connection("localhost", uamqp.authentication.SASLAnonymous("localhost"))
+    c_connection, connection._conn = connection._conn, _Conn()
+    try:
+        connection.pin()
+        connection.work()
+        connection.lock()
+        assert not connection._lock.locked()  # The owning thread does not take the lock.
+        connection.release()
+        assert connection._conn.iterations == 1
+
+        submitted = []
+        assert _run_in_thread(lambda: connection.submit(submitted.append, 1)) == {'value': None}
+        assert isinstance(_run_in_thread(connection.lock)['error'], compat.TimeoutException)
+        _run_in_thread(connection.work)
+        assert connection._conn.iterations == 1
+        assert submitted == []
+
+        connection.work()
+        assert submitted == [1]
+        assert connection._conn.iterations == 2
+
+        assert isinstance(_run_in_thread(connection.unpin)['error'], ValueError)
+        connection.unpin()
+        assert _run_in_thread(lambda: connection.submit(submitted.append, 2)) == {'value': None}
+        assert submitted == [1, 2]
+        _run_in_thread(connection.work)
+        assert connection._conn.iterations == 3
+    finally:
+        connection._conn = c_connection
+        connection.destroy()
+
+
+def test_pinned_connection_submitted_send_failure():
+    class _Sender(object):
+
+        def send(self, c_message, timeout, message):
+            return False
+
+        def send_many(self, c_messages, timeouts, messages):
+            raise TypeError("Invalid timeout.")
+
+    class _Session(object):
+        _connection = None
+
+    connection = uamqp.Connection("localhost", uamqp.authentication.SASLAnonymous("localhost"))
+    c_connection, connection._conn = connection._conn, _Conn()
+    message_sender = uamqp.MessageSender.__new__(uamqp.MessageSender)
+    message_sender._error = None
+    message_sender._sender = _Sender()
+    message_sender._session = _Session()
+    message_sender._session._connection = connection
+    results = []
+
+    def _callback(message, result, delivery_state=None):
+        results.append((message, result, type(delivery_state)))
+
+    try:
+        messages = [uamqp.Message(body=b"Message") for _ in range(3)]
+        assert message_sender.send(messages[0], _callback) is False  # Not pinned, so no callback.
+        assert results == []
+
+        connection.pin()
+        assert _run_in_thread(lambda: message_sender.send(messages[0], _callback)) == {'value': True}
+        assert _run_in_thread(lambda: message_sender.send_many(messages[1:], _callback)) == {'value': [True, True]}
+        assert results == []
+        connection.work()
+        assert results == [
+            (messages[0], uamqp.constants.MessageSendResult.Error, RuntimeError),
+            (messages[1], uamqp.constants.MessageSendResult.Error, TypeError),
+            (messages[2], uamqp.constants.MessageSendResult.Error, TypeError)]
+        connection.unpin()
+    finally:
+        connection._conn = c_connection
+        connection.destroy()
+
+
+def test_pinned_connection_owner_only_operations():
+    connection = uamqp.Connection("localhost", uamqp.authentication.SASLAnonymous("localhost"))
+    c_connection, connection._conn = connection._conn, _Conn()
+    client = uamqp.AMQPClient("amqps://localhost/queue")
+    client._connection = connection
+    client._session = object()
+    client.open = lambda connection=None: None
+    try:
+        connection.pin()
+        assert isinstance(_run_in_thread(connection.destroy)['error'], ValueError)
+        assert isinstance(_run_in_thread(lambda: connection.redirect(None, None))['error'], ValueError)
+        assert isinstance(_run_in_thread(client.close)['error'], ValueError)
+        assert client._session is not None
+        assert _run_in_thread(client._keep_alive) == {'value': True}
+        assert connection._conn.iterations == 0  # Left to the owning thread.
+        with uamqp.Reactor() as reactor:
+            with pytest.raises(ValueError):
+                reactor.register(client)
+            assert client._reactor is None
+        connection.unpin()
+    finally:
+        client._connection = None
+        connection._conn = c_connection
+        connection.destroy()
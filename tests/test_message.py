@@ -1,4 +1,12 @@
-from uamqp.message import MessageProperties
+import io
+import struct
+
+import pytest
+
+from uamqp import constants, errors, types
+from uamqp import message as message_module
+from uamqp.message import (
+    BatchMessage, ColumnarBatch, Message, MessageHeader, MessageProperties, PreEncodedMessage, decode_stream)
 
 
 def test_message_proeprties():
@@ -29,3 +37,234 @@ def test_message_proeprties():
     properties = MessageProperties()
     properties.user_id = 'werid/0\0\1\t\n'
     assert properties.user_id == b'werid/0\0\1\t\n'
+
+
+def test_pre_encoded_message(monkeypatch):
+    message = Message(
+        body=b'data',
+        properties=MessageProperties(message_id='id', subject='subject'),
+        application_properties={'key': 'value'})
+    encoded = message.encode_message()
+
+    pre_encoded = Message.from_encoded(encoded)
+    assert isinstance(pre_encoded, PreEncodedMessage)
+    assert pre_encoded.state == constants.MessageState.WaitingToBeSent
+    assert pre_encoded.gather() == [pre_encoded]
+    assert pre_encoded.get_message_encoded_size() == len(encoded)
+    assert pre_encoded.encode_message() == encoded
+    def _populate_message_attributes(*args):
+        raise AssertionError("A pre-encoded message must not be re-encoded.")
+
+    monkeypatch.setattr(Message, '_populate_message_attributes', _populate_message_attributes)
+    assert pre_encoded.get_message() is pre_encoded.get_message()
+    monkeypatch.undo()
+    assert pre_encoded.properties.message_id == b'id'
+    assert pre_encoded.application_properties == {b'key': b'value'}
+    assert list(pre_encoded.get_data()) == [b'data']
+
+
+def test_message_sections_cached():
+    properties = MessageProperties(message_id='id')
+    header = MessageHeader()
+    header.durable = True
+    message = Message(body=b'data', properties=properties, header=header, application_properties={'key': 'value'})
+    encoded = message.encode_message()
+
+    assert properties.get_properties_obj() is properties.get_properties_obj()
+    assert header.get_header_obj() is header.get_header_obj()
+    app_props = message._sections['application_properties'][1]
+    assert message.encode_message() == encoded
+    assert message._sections['application_properties'][1] is app_props
+
+    cached_properties = properties.get_properties_obj()
+    properties.subject = 'subject'
+    assert properties.get_properties_obj() is not cached_properties
+    cached_header = header.get_header_obj()
+    header.priority = 1
+    assert header.get_header_obj() is not cached_header
+
+    message.application_properties['key'] = 'updated'
+    decoded = Message.decode_from_bytes(message.encode_message())
+    assert message._sections['application_properties'][1] is not app_props
+    assert decoded.application_properties == {b'key': b'updated'}
+    assert decoded.properties.subject == b'subject'
+    assert decoded.header.priority == 1
+
+
+def test_message_sections_with_containers_not_cached():
+    message = Message(body=b'data', application_properties={b'lst': [1]})
+    message.encode_message()
+    message.application_properties[b'lst'].append(2)
+    decoded = Message.decode_from_bytes(message.encode_message())
+    assert decoded.application_properties == {b'lst': [1, 2]}
+    assert 'application_properties' not in message._sections
+
+
+def test_batch_message_try_add():
+    batch = BatchMessage(data=[])
+    batch.max_message_length = 1024
+    added = 0
+    while batch.try_add(Message(body=b'x' * 100, application_properties={'index': added})):
+        added += 1
+    assert added > 1
+
+    gathered = batch.gather()
+    assert len(gathered) == 1
+    assert gathered[0].get_message_encoded_size() == batch.encoded_size <= 1024
+    assert len(list(gathered[0].get_data())) == added
+    assert len(list(batch.gather()[0].get_data())) == added
+
+    inner = Message.decode_from_bytes(list(gathered[0].get_data())[-1])
+    assert inner.application_properties == {b'index': added - 1}
+
+
+def test_batch_message_multi_messages():
+    batch = BatchMessage(data=[b'x' * 300 for _ in range(10)], multi_messages=True)
+    batch.max_message_length = 1024
+    gathered = list(batch.gather())
+    assert len(gathered) > 1
+    assert sum(len(list(m.get_data())) for m in gathered) == 10
+    assert all(m.get_message_encoded_size() <= 1024 for m in gathered)
+
+    batch = BatchMessage(data=[b'x' * 2048])
+    batch.max_message_length = 1024
+    with pytest.raises(errors.MessageContentTooLarge):
+        batch.gather()
+
+
+def test_message_encode_into():
+    message = Message(body=b'data', application_properties={'key': 'value'})
+    encoded = message.encode_message()
+
+    buffer = bytearray(len(encoded) + 10)
+    assert message.encode_into(buffer, offset=10) == len(encoded)
+    assert buffer[10:] == encoded
+    assert buffer[:10] == bytearray(10)
+
+    pre_encoded = Message.from_encoded(encoded)
+    view = memoryview(bytearray(len(encoded)))
+    assert pre_encoded.encode_into(view) == len(encoded)
+    assert view.tobytes() == encoded
+
+    with pytest.raises(ValueError):
+        message.encode_into(bytearray(len(encoded) - 1))
+    with pytest.raises(ValueError):
+        pre_encoded.encode_into(bytearray(len(encoded)), offset=1)
+    with pytest.raises((TypeError, ValueError, BufferError)):
+        message.encode_into(bytes(len(encoded)))
+
+
+def test_data_body_views():
+    message = Message.decode_from_bytes(Message(body=[b'first', b'x' * 1024]).encode_message())
+    body = message._body
+    assert body.total_length == 5 + 1024
+    views = list(body.views)
+    assert [v.tobytes() for v in views] == list(message.get_data())
+    assert views[0].readonly
+    with pytest.raises(TypeError):
+        views[0][0] = 0
+    assert bytes(body) == b'first' + b'x' * 1024
+
+    del message, body
+    assert views[1].tobytes() == b'x' * 1024
+
+
+def test_received_message_lazy_sections():
+    encoded = Message(
+        body=b'data',
+        annotations={b'x-opt-sequence-number': 42, b'x-opt-offset': b'100'},
+        application_properties={b'key': b'value'}).encode_message()
+
+    message = Message.decode_from_bytes(encoded)
+    assert message.get_annotation(b'x-opt-sequence-number') == 42
+    assert message.get_annotation(b'missing', default=-1) == -1
+    assert message._unparsed_sections & message_module._ANNOTATIONS
+
+    assert message.annotations == {b'x-opt-sequence-number': 42, b'x-opt-offset': b'100'}
+    assert not message._unparsed_sections & message_module._ANNOTATIONS
+    assert message._unparsed_sections & message_module._APPLICATION_PROPERTIES
+    assert message.get_annotation(b'x-opt-offset') == b'100'
+
+    message.application_properties = {b'other': b'value'}
+    assert message.application_properties == {b'other': b'value'}
+    assert message.properties is None
+    assert message._unparsed_sections == (
+        message_module._HEADER | message_module._FOOTER | message_module._DELIVERY_ANNOTATIONS)
+
+
+def test_columnar_batch():
+    messages = [
+        Message.decode_from_bytes(Message(
+            body=[b'body', b'-0'],
+            annotations={b'x-opt-sequence-number': 10, b'x-opt-offset': b'100'}).encode_message()),
+        Message.decode_from_bytes(Message(body=b'').encode_message()),
+        Message.decode_from_bytes(Message(
+            body=b'body-2',
+            annotations={b'x-opt-sequence-number': 12}).encode_message())]
+
+    batch = ColumnarBatch(messages, ['body', b'x-opt-sequence-number', b'x-opt-offset'])
+    assert len(batch) == 3
+    assert bytes(batch['body']) == b'body-0body-2'
+    assert list(batch.body_offsets) == [0, 6, 6, 12]
+    assert batch.get_body(2).tobytes() == b'body-2'
+    assert list(batch[b'x-opt-sequence-number']) == [10, -1, 12]
+    assert list(batch[b'x-opt-offset']) == [100, -1, -1]
+    assert memoryview(batch[b'x-opt-sequence-number']).itemsize == 8
+
+    annotations_only = ColumnarBatch([m._message for m in messages], [b'x-opt-sequence-number'], missing=0)
+    assert len(annotations_only.body) == 0
+    assert list(annotations_only.columns[b'x-opt-sequence-number']) == [10, 0, 12]
+
+
+def test_columnar_batch_unconvertible_annotations():
+    values = [b'abc', b'12.5', 12.5, 2 ** 63, b'7', 8.0, types.AMQPuLong(2 ** 64 - 1)]
+    messages = [
+        Message.decode_from_bytes(Message(
+            body=b'body', annotations={b'x-opt-sequence-number': value}).encode_message())
+        for value in values]
+    batch = ColumnarBatch(messages, [b'x-opt-sequence-number'])
+    assert list(batch[b'x-opt-sequence-number']) == [-1, -1, -1, -1, 7, 8, -1]
+
+
+def test_decode_stream():
+    messages = [
+        Message(body=b'first', properties=MessageProperties(message_id=b'1')),
+        Message(body=[b'second', b'part'], annotations={b'key': 2}),
+        Message(body={b'third': 3}, application_properties={b'key': b'value'})]
+    encoded = [m.encode_message() for m in messages]
+
+    stream = b''.join(struct.pack('>I', len(e)) + e for e in encoded)
+    for source, chunk_size in [(stream, 1024), (io.BytesIO(stream), 7), (memoryview(bytearray(stream)), 1)]:
+        decoded = list(decode_stream(source, chunk_size=chunk_size))
+        assert [m.encode_message() for m in decoded] == encoded
+        assert decoded[0].properties.message_id == b'1'
+        assert decoded[1].get_data() and list(decoded[1].get_data()) == [b'second', b'part']
+        assert decoded[2].get_data() == {b'third': 3}
+        assert decoded[2].state == constants.MessageState.ReceivedSettled
+
+    # Messages with only body sections are kept apart by their length prefixes.
+    encoded = [Message(body=b'first').encode_message(), Message(body=b'second').encode_message()]
+    decoded = list(decode_stream(b''.join(struct.pack('>I', len(e)) + e for e in encoded), chunk_size=5))
+    assert [list(m.get_data()) for m in decoded] == [[b'first'], [b'second']]
+
+    with pytest.raises(ValueError):
+        list(decode_stream(stream[:-1]))
+
+
+def test_message_slots():
+    encoded = Message(
+        body=b'data',
+        properties=MessageProperties(message_id=b'id'),
+        header=MessageHeader()).encode_message()
+    message = Message.decode_from_bytes(encoded)
+    compact = message_module._CompactMessage.decode_from_bytes(encoded)
+    for obj, compact_obj in zip(
+            (message, message.properties, message.header, message._body),
+            (compact, compact.properties, compact.header, compact._body)):
+        assert isinstance(compact_obj, type(obj))
+        assert not compact_obj.__dict__
+        obj.custom_attribute = compact_obj.custom_attribute = 1
+        assert obj.custom_attribute == compact_obj.custom_attribute == 1
+    assert list(compact.get_data()) == list(message.get_data())
+    assert compact.properties.message_id == message.properties.message_id
+    assert not hasattr(message, '_on_message_sent')
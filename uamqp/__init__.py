@@ -11,12 +11,14 @@ import sys
 
 from uamqp import c_uamqp  # pylint: disable=import-self
 
-from uamqp.message import Message, BatchMessage
+from uamqp.message import Message, BatchMessage, PreEncodedMessage, ColumnarBatch
 from uamqp.address import Source, Target
 
 from uamqp.connection import Connection
+from uamqp.pool import ConnectionPool
+from uamqp.reactor import Reactor
 from uamqp.session import Session
-from uamqp.client import AMQPClient, SendClient, ReceiveClient
+from uamqp.client import AMQPClient, SendClient, ReceiveClient, open_all
 from uamqp.sender import MessageSender
 from uamqp.receiver import MessageReceiver
 from uamqp.constants import TransportType
@@ -26,11 +28,13 @@ try:
     from uamqp.async_ops import SessionAsync
     from uamqp.async_ops import MessageSenderAsync
     from uamqp.async_ops import MessageReceiverAsync
+    from uamqp.async_ops import ConnectionPoolAsync
     from uamqp.async_ops.client_async import (
         AMQPClientAsync,
         SendClientAsync,
         ReceiveClientAsync,
-        AsyncMessageIter)
+        AsyncMessageIter,
+        open_all_async)
 except (SyntaxError, ImportError):
     pass  # Async not supported.
 
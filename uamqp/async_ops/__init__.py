@@ -9,3 +9,4 @@ from .session_async import SessionAsync
 from .sender_async import MessageSenderAsync
 from .receiver_async import MessageReceiverAsync
 from .mgmt_operation_async import MgmtOperationAsync
+from .pool_async import ConnectionPoolAsync
@@ -8,16 +8,22 @@
 # pylint: disable=super-init-not-called,too-many-lines
 
 import asyncio
+import collections
 import collections.abc
 import logging
+import time
 import uuid
 
-from uamqp import address, authentication, client, constants, errors, compat
+from uamqp import address, authentication, client, constants, errors
+from uamqp.client import _OpenBackoff
+from uamqp.message import ColumnarBatch
 from uamqp.utils import get_running_loop
 from uamqp.async_ops.connection_async import ConnectionAsync
+from uamqp.async_ops.pool_async import ConnectionPoolAsync
 from uamqp.async_ops.receiver_async import MessageReceiverAsync
 from uamqp.async_ops.sender_async import MessageSenderAsync
 from uamqp.async_ops.session_async import SessionAsync
+from uamqp.async_ops.timers_async import get_timer_service_async
 
 try:
     TimeoutException = TimeoutError
@@ -51,11 +57,16 @@ class AMQPClientAsync(client.AMQPClient):
     :param error_policy: A policy for parsing errors on link, connection and message
      disposition to determine whether the error should be retryable.
     :type error_policy: ~uamqp.errors.ErrorPolicy
-    :param keep_alive_interval: If set, a thread will be started to keep the connection
-     alive during periods of user inactivity. The value will determine how long the
-     thread will sleep (in seconds) between pinging the connection. If 0 or None, no
-     thread will be started.
+    :param keep_alive_interval: If set, the connection is kept alive during periods of user
+     inactivity by a timer shared by all clients on the event loop. The value will determine
+     how long to wait (in seconds) between pinging the connection. If 0 or None, the
+     connection will not be kept alive.
     :type keep_alive_interval: int
+    :param connection_pool: If set, the Connection is leased from this pool, and may be
+     shared with other clients of the same host and credentials, rather than created for
+     this client alone. Unlike a Connection passed to `open`, a pooled Connection can be
+     redirected.
+    :type connection_pool: ~uamqp.async_ops.pool_async.ConnectionPoolAsync
     :param max_frame_size: Maximum AMQP frame size. Default is 63488 bytes.
     :type max_frame_size: int
     :param channel_max: Maximum number of Session channels in the Connection.
@@ -137,20 +148,22 @@ class AMQPClientAsync(client.AMQPClient):
         await self.close_async()
 
     async def _keep_alive_async(self):
-        start_time = self._counter.get_current_ms()
+        """Keep the connection alive during periods of user inactivity. This is run
+        every `keep_alive_interval` seconds by the timer service of the event loop.
+
+        :rtype: bool
+        """
+        if not self._connection or self._shutdown:
+            return False
         try:
-            while self._connection and not self._shutdown:
-                current_time = self._counter.get_current_ms()
-                elapsed_time = (current_time - start_time)/1000
-                if elapsed_time >= self._keep_alive_interval:
-                    _logger.info("Keeping %r connection alive. %r",
-                                 self.__class__.__name__,
-                                 self._connection.container_id)
-                    await asyncio.shield(self._connection.work_async(), loop=self.loop)
-                    start_time = current_time
-                await asyncio.sleep(1, loop=self.loop)
+            _logger.info("Keeping %r connection alive. %r",
+                         self.__class__.__name__,
+                         self._connection.container_id)
+            await asyncio.shield(self._connection.work_async(), loop=self.loop)
         except Exception as e:  # pylint: disable=broad-except
-            _logger.info("Connection keep-alive for %r failed: %r.", self.__class__.__name__, e)
+            _logger.warning("Connection keep-alive for %r failed: %r.", self.__class__.__name__, e)
+            return False
+        return True
 
     async def _client_ready_async(self):  # pylint: disable=no-self-use
         """Determine whether the client is ready to start sending and/or
@@ -165,6 +178,24 @@ class AMQPClientAsync(client.AMQPClient):
         """Perform a single Connection iteration."""
         await asyncio.shield(self._connection.work_async(), loop=self.loop)
 
+    async def _lease_connection_async(self):
+        """Lease a Connection for the client from its connection pool. The client then
+        authenticates with the credentials of the Connection, so they must be the same
+        as those of the client.
+
+        :rtype: ~uamqp.async_ops.connection_async.ConnectionAsync
+        :raises: ValueError if the Connection has other credentials.
+        """
+        if not isinstance(self._connection_pool, ConnectionPoolAsync):
+            raise TypeError("Async clients require a ConnectionPoolAsync.")
+        connection = await self._connection_pool.lease_async(
+            self._hostname, self._auth, loop=self.loop, **self._lease_settings())
+        if not self._leased_auth_matches(connection):
+            await self._connection_pool.release_async(connection)
+            raise ValueError("Pooled connection {!r} has different credentials to the client.".format(
+                connection.container_id))
+        return connection
+
     async def _redirect_async(self, redirect, auth):
         """Redirect the client endpoint using a Link DETACH redirect
         response.
@@ -181,6 +212,17 @@ class AMQPClientAsync(client.AMQPClient):
         self._session = None
         self._auth = auth
         self._hostname = self._remote_address.hostname
+        if self._leased_connection:
+            # A pooled connection may be shared, so lease another rather than redirect it.
+            await self._connection_pool.release_async(self._connection)
+            self._connection = await self._lease_connection_async()
+            self._auth = self._connection.auth
+            try:
+                await self._connection.lock_async()
+                await self._build_session_async()
+            finally:
+                self._connection.release_async()
+            return
         await self._connection.redirect_async(redirect, auth)
         await self._build_session_async()
 
@@ -226,6 +268,9 @@ class AMQPClientAsync(client.AMQPClient):
         if self._session:
             return  # already open
         try:
+            if not connection and self._connection_pool:
+                connection = await self._lease_connection_async()
+                self._leased_connection = True
             if connection:
                 _logger.info("Using existing connection.")
                 self._auth = connection.auth
@@ -245,7 +290,8 @@ class AMQPClientAsync(client.AMQPClient):
                 loop=self.loop)
             await self._build_session_async()
             if self._keep_alive_interval:
-                self._keep_alive_thread = asyncio.ensure_future(self._keep_alive_async(), loop=self.loop)
+                self._keep_alive_timer = get_timer_service_async(self.loop).schedule(
+                    self._keep_alive_interval, self._keep_alive_async)
         finally:
             if self._ext_connection:
                 connection.release_async()
@@ -260,9 +306,9 @@ class AMQPClientAsync(client.AMQPClient):
             await self.message_handler.destroy_async()
             self.message_handler = None
         self._shutdown = True
-        if self._keep_alive_thread:
-            await self._keep_alive_thread
-            self._keep_alive_thread = None
+        if self._keep_alive_timer:
+            await self._keep_alive_timer.cancel_async()
+            self._keep_alive_timer = None
         if not self._session:
             return  # already closed.
         if not self._connection._cbs:  # pylint: disable=protected-access
@@ -271,7 +317,11 @@ class AMQPClientAsync(client.AMQPClient):
         else:
             _logger.info("CBS session pending %r.", self._connection.container_id)
         self._session = None
-        if not self._ext_connection:
+        if self._leased_connection:
+            _logger.info("Returning pooled connection %r.", self._connection.container_id)
+            await self._connection_pool.release_async(self._connection)
+            self._leased_connection = False
+        elif not self._ext_connection:
             _logger.info("Closing exclusive connection %r.", self._connection.container_id)
             await asyncio.shield(self._connection.destroy_async(), loop=self.loop)
         else:
@@ -408,11 +458,16 @@ class SendClientAsync(client.SendClient, AMQPClientAsync):
     :param error_policy: A policy for parsing errors on link, connection and message
      disposition to determine whether the error should be retryable.
     :type error_policy: ~uamqp.errors.ErrorPolicy
-    :param keep_alive_interval: If set, a thread will be started to keep the connection
-     alive during periods of user inactivity. The value will determine how long the
-     thread will sleep (in seconds) between pinging the connection. If 0 or None, no
-     thread will be started.
+    :param keep_alive_interval: If set, the connection is kept alive during periods of user
+     inactivity by a timer shared by all clients on the event loop. The value will determine
+     how long to wait (in seconds) between pinging the connection. If 0 or None, the
+     connection will not be kept alive.
     :type keep_alive_interval: int
+    :param connection_pool: If set, the Connection is leased from this pool, and may be
+     shared with other clients of the same host and credentials, rather than created for
+     this client alone. Unlike a Connection passed to `open`, a pooled Connection can be
+     redirected.
+    :type connection_pool: ~uamqp.async_ops.pool_async.ConnectionPoolAsync
     :param send_settle_mode: The mode by which to settle message send
      operations. If set to `Unsettled`, the client will wait for a confirmation
      from the service that the message was successfully sent. If set to 'Settled',
@@ -527,29 +582,48 @@ class SendClientAsync(client.SendClient, AMQPClientAsync):
             _logger.info("Message not sent, raising RuntimeError.")
             raise RuntimeError("Message sender failed to add message data to outgoing queue.")
 
+    async def _transfer_messages_async(self, messages, timeouts):
+        if not messages:
+            return []
+        try:
+            accepted = await asyncio.shield(
+                self.message_handler.send_many_async(messages, self._on_message_sent, timeout=timeouts),
+                loop=self.loop)
+        except Exception:  # pylint: disable=broad-except
+            _logger.debug("Bulk message transfer failed, transferring messages individually.")
+        else:
+            return [None if sent else RuntimeError("Message sender failed to add message data to outgoing queue.")
+                    for sent in accepted]
+        results = []
+        for message, timeout in zip(messages, timeouts):
+            try:
+                await self._transfer_message_async(message, timeout)
+            except Exception as exp:  # pylint: disable=broad-except
+                results.append(exp)
+            else:
+                results.append(None)
+        return results
+
     async def _filter_pending_async(self):
-        filtered = []
-        for message in self._pending_messages:
-            if message.state in constants.DONE_STATES:
+        self._waiting_messages = self._pending_messages.waiting_for_send_ack
+        for message in self._pending_messages.pop_expired(self._counter.get_current_ms()):
+            self._on_message_sent(message, constants.MessageSendResult.Timeout)
+        batch = []
+        timeouts = []
+        for message in self._pending_messages.pop_waiting(self._pending_messages.waiting_to_be_sent):
+            message.state = constants.MessageState.WaitingForSendAck
+            timeout = self._get_msg_timeout(message)
+            if timeout is None:
+                self._on_message_sent(message, constants.MessageSendResult.Timeout)
                 continue
+            batch.append(message)
+            timeouts.append(timeout)
+        for message, exp in zip(batch, await self._transfer_messages_async(batch, timeouts)):
+            if exp is not None:
+                self._on_message_sent(message, constants.MessageSendResult.Error, delivery_state=exp)
             elif message.state == constants.MessageState.WaitingForSendAck:
-                self._waiting_messages += 1
-            elif message.state == constants.MessageState.WaitingToBeSent:
-                message.state = constants.MessageState.WaitingForSendAck
-                try:
-                    timeout = self._get_msg_timeout(message)
-                    if timeout is None:
-                        self._on_message_sent(message, constants.MessageSendResult.Timeout)
-                        if message.state != constants.MessageState.WaitingToBeSent:
-                            continue
-                    else:
-                        await self._transfer_message_async(message, timeout)
-                except Exception as exp:  # pylint: disable=broad-except
-                    self._on_message_sent(message, constants.MessageSendResult.Error, delivery_state=exp)
-                    if message.state != constants.MessageState.WaitingToBeSent:
-                        continue
-            filtered.append(message)
-        return filtered
+                self._pending_messages.update(message)
+        return self._pending_messages
 
     async def _client_run_async(self):
         """MessageSender Link is now open - perform message send
@@ -561,7 +635,6 @@ class SendClientAsync(client.SendClient, AMQPClientAsync):
         """
         # pylint: disable=protected-access
         await self.message_handler.work_async()
-        self._waiting_messages = 0
         async with self._pending_messages_lock:
             self._pending_messages = await self._filter_pending_async()
         if self._backoff and not self._waiting_messages:
@@ -580,7 +653,7 @@ class SendClientAsync(client.SendClient, AMQPClientAsync):
         :param auth: Authentication credentials to the redirected endpoint.
         :type auth: ~uamqp.authentication.common.AMQPAuth
         """
-        if self._ext_connection:
+        if self._ext_connection and not self._leased_connection:
             raise ValueError(
                 "Clients with a shared connection cannot be "
                 "automatically redirected.")
@@ -588,7 +661,7 @@ class SendClientAsync(client.SendClient, AMQPClientAsync):
             await self.message_handler.destroy_async()
             self.message_handler = None
         async with self._pending_messages_lock:
-            self._pending_messages = []
+            self._pending_messages = client._PendingMessages(self._msg_timeout)  # pylint: disable=protected-access
 
         self._remote_address = address.Target(redirect.address)
         await self._redirect_async(redirect, auth)
@@ -630,7 +703,13 @@ class SendClientAsync(client.SendClient, AMQPClientAsync):
             pending_batch.append(message)
         await self.open_async()
         try:
-            while any([m for m in pending_batch if m.state not in constants.DONE_STATES]):
+            completed = 0
+            while True:
+                # Messages generally complete in order, so only advance past those that are done.
+                while completed < len(pending_batch) and pending_batch[completed].state in constants.DONE_STATES:
+                    completed += 1
+                if completed == len(pending_batch):
+                    break
                 await self.do_work_async()
             failed = [m for m in pending_batch if m.state == constants.MessageState.SendFailed]
             if any(failed):
@@ -659,7 +738,7 @@ class SendClientAsync(client.SendClient, AMQPClientAsync):
         await self.open_async()
         try:
             async with self._pending_messages_lock:
-                messages = self._pending_messages[:]
+                messages = list(self._pending_messages)
             await self.wait_async()
             results = [m.state for m in messages]
             return results
@@ -706,11 +785,16 @@ class ReceiveClientAsync(client.ReceiveClient, AMQPClientAsync):
     :param error_policy: A policy for parsing errors on link, connection and message
      disposition to determine whether the error should be retryable.
     :type error_policy: ~uamqp.errors.ErrorPolicy
-    :param keep_alive_interval: If set, a thread will be started to keep the connection
-     alive during periods of user inactivity. The value will determine how long the
-     thread will sleep (in seconds) between pinging the connection. If 0 or None, no
-     thread will be started.
+    :param keep_alive_interval: If set, the connection is kept alive during periods of user
+     inactivity by a timer shared by all clients on the event loop. The value will determine
+     how long to wait (in seconds) between pinging the connection. If 0 or None, the
+     connection will not be kept alive.
     :type keep_alive_interval: int
+    :param connection_pool: If set, the Connection is leased from this pool, and may be
+     shared with other clients of the same host and credentials, rather than created for
+     this client alone. Unlike a Connection passed to `open`, a pooled Connection can be
+     redirected.
+    :type connection_pool: ~uamqp.async_ops.pool_async.ConnectionPoolAsync
     :param send_settle_mode: The mode by which to settle message send
      operations. If set to `Unsettled`, the client will wait for a confirmation
      from the service that the message was successfully sent. If set to 'Settled',
@@ -735,6 +819,30 @@ class ReceiveClientAsync(client.ReceiveClient, AMQPClientAsync):
      messages the Link will attempt to handle per connection iteration.
      The default is 300.
     :type prefetch: int
+    :param adaptive_prefetch: Whether to resize the Link credit from the rate at which
+     received messages are consumed, up to `prefetch` messages. No further credit is
+     issued while the consumer falls behind. The default is `False`.
+    :type adaptive_prefetch: bool
+    :param max_prefetch_bytes: With `adaptive_prefetch`, the maximum number of bytes of
+     messages to hold in the receive buffer and in flight, estimated from the average
+     encoded message size. The default is no limit.
+    :type max_prefetch_bytes: int
+    :param max_buffered_bytes: The maximum total encoded size in bytes of received messages
+     held in the buffer until they are consumed. Once reached, the outstanding Link credit
+     is withdrawn and no further messages are requested until the buffer has drained to
+     half this size. The current size is available as `buffered_bytes`. The default is no limit.
+    :type max_buffered_bytes: int
+    :param settle_batch_size: The maximum number of received messages settled by a single
+     disposition. If greater than 1, contiguous messages that are accepted or released
+     are settled together with a range disposition. The default is 1.
+    :type settle_batch_size: int
+    :param settle_batch_timeout: The time in milliseconds after which a pending batch
+     of settled messages is sent. The default is 10.
+    :type settle_batch_timeout: int
+    :param compact: Whether received messages, and the properties, header and body
+     decoded from them, hold their attributes in slots rather than instance
+     dictionaries to reduce the memory held by each message. The default is `False`.
+    :type compact: bool
     :param max_frame_size: Maximum AMQP frame size. Default is 63488 bytes.
     :type max_frame_size: int
     :param channel_max: Maximum number of Session channels in the Connection.
@@ -802,6 +910,7 @@ class ReceiveClientAsync(client.ReceiveClient, AMQPClientAsync):
         """
         # pylint: disable=protected-access
         if not self.message_handler:
+            self._credit_paused = False
             self.message_handler = self.receiver_type(
                 self._session, self._remote_address, self._name,
                 on_message_received=self._message_received,
@@ -815,6 +924,9 @@ class ReceiveClientAsync(client.ReceiveClient, AMQPClientAsync):
                 error_policy=self._error_policy,
                 encoding=self._encoding,
                 desired_capabilities=self._desired_capabilities,
+                settle_batch_size=self._settle_batch_size,
+                settle_batch_timeout=self._settle_batch_timeout,
+                compact=self._compact,
                 loop=self.loop)
             await asyncio.shield(self.message_handler.open_async(), loop=self.loop)
             return False
@@ -827,7 +939,9 @@ class ReceiveClientAsync(client.ReceiveClient, AMQPClientAsync):
             self._last_activity_timestamp = self._counter.get_current_ms()
             return False
         # once the receiver client is ready/connection established, we set prefetch as per the config
-        self.message_handler._link.set_prefetch_count(self._prefetch)  # pylint: disable=protected-access
+        if not self._credit_controller:
+            self.message_handler._link.set_prefetch_count(self._prefetch)  # pylint: disable=protected-access
+        self.message_handler.on_raw_message_received = self._raw_message_received if self._columnar_receive else None
         return True
 
     async def _client_run_async(self):
@@ -837,12 +951,15 @@ class ReceiveClientAsync(client.ReceiveClient, AMQPClientAsync):
 
         :rtype: bool
         """
-        await self.message_handler.work_async()
+        if self._link_credit_available():
+            await self.message_handler.work_async()
+        else:
+            self.message_handler.flush_settlements(expired_only=True)
         await self._connection.work_async()
         now = self._counter.get_current_ms()
         if self._last_activity_timestamp and not self._was_message_received:
             # If no messages are coming through, back off a little to keep CPU use low.
-            await asyncio.sleep(0.05, loop=self.loop)
+            await asyncio.sleep(self._get_idle_wait(now), loop=self.loop)
             if self._timeout > 0:
                 timespan = now - self._last_activity_timestamp
                 if timespan >= self._timeout:
@@ -855,6 +972,7 @@ class ReceiveClientAsync(client.ReceiveClient, AMQPClientAsync):
                         _logger.info("Timeout reached, keeping receiver open.")
         else:
             self._last_activity_timestamp = now
+            self._idle_wait = 0
         self._was_message_received = False
         return True
 
@@ -891,7 +1009,40 @@ class ReceiveClientAsync(client.ReceiveClient, AMQPClientAsync):
             if not receiving and self._shutdown_after_timeout:
                 await self.close_async()
 
-    async def receive_message_batch_async(self, max_batch_size=None, on_message_received=None, timeout=0):
+    async def receive_columnar_batch_async(self, fields, max_batch_size=None, timeout=0, missing=-1):
+        """Receive a batch of messages decoded into columns asynchronously, without creating a
+        ~uamqp.message.Message for each message. Messages are accepted as they are received,
+        regardless of `auto_complete`. The batching behaviour is the same as `receive_message_batch_async`.
+
+        :param fields: The fields to decode. Use `'body'` for the message body data, and
+         message annotation keys such as `b"x-opt-sequence-number"` for integer annotations.
+        :type fields: list[str or bytes]
+        :param max_batch_size: The maximum number of messages that can be returned in
+         one call. This value cannot be larger than the prefetch value, and if not specified,
+         the prefetch value will be used.
+        :type max_batch_size: int
+        :param timeout: I timeout in milliseconds for which to wait to receive any messages.
+         If no messages are received in this time, an empty batch will be returned. If set to
+         0, the client will continue to wait until at least one message is received. The
+         default is 0.
+        :type timeout: float
+        :param missing: The value to use where a message does not have a requested annotation,
+         or where its value cannot be represented as an int64. Default is -1.
+        :type missing: int
+        :rtype: ~uamqp.message.ColumnarBatch
+        """
+        self._columnar_receive = True
+        try:
+            batch = await self.receive_message_batch_async(max_batch_size=max_batch_size, timeout=timeout)
+        finally:
+            self._columnar_receive = False
+            if self.message_handler:
+                self.message_handler.on_raw_message_received = None
+            self._received_messages.wrap_raw_messages(self._encoding, compact=self._compact)
+        return ColumnarBatch(batch, fields, missing=missing)
+
+    async def receive_message_batch_async(
+            self, max_batch_size=None, on_message_received=None, timeout=0, min_batch_size=None, max_wait_time=None):
         """Receive a batch of messages asynchronously. This method will return as soon as some
         messages are available rather than waiting to achieve a specific batch size, and
         therefore the number of messages returned per call will vary up to the maximum allowed.
@@ -913,6 +1064,14 @@ class ReceiveClientAsync(client.ReceiveClient, AMQPClientAsync):
          0, the client will continue to wait until at least one message is received. The
          default is 0.
         :type timeout: float
+        :param min_batch_size: If set, rather than returning as soon as some messages are
+         available, wait until at least this many messages have been received or until
+         `max_wait_time` has passed. This cannot be larger than `max_batch_size`.
+        :type min_batch_size: int
+        :param max_wait_time: With `min_batch_size`, the maximum time in milliseconds to wait
+         for the minimum number of messages, after which the messages received so far are
+         returned, which may be none. If not set, `timeout` applies as usual.
+        :type max_wait_time: float
         """
         self._message_received_callback = on_message_received
         max_batch_size = max_batch_size or self._prefetch
@@ -920,35 +1079,48 @@ class ReceiveClientAsync(client.ReceiveClient, AMQPClientAsync):
             raise ValueError(
                 'Maximum batch size {} cannot be greater than the '
                 'connection link credit: {}'.format(max_batch_size, self._prefetch))
+        if min_batch_size and min_batch_size > max_batch_size:
+            raise ValueError(
+                'Minimum batch size {} cannot be greater than the '
+                'maximum batch size: {}'.format(min_batch_size, max_batch_size))
+        target_size = min_batch_size or max_batch_size
         timeout = self._counter.get_current_ms() + int(timeout) if timeout else 0
         expired = False
+        wait_deadline = 0
+        if min_batch_size and max_wait_time:
+            wait_deadline = self._counter.get_current_ms() + int(max_wait_time)
         await self.open_async()
         receiving = True
         batch = []
         while not self._received_messages.empty() and len(batch) < max_batch_size:
             batch.append(self._received_messages.get())
             self._received_messages.task_done()
-        if len(batch) >= max_batch_size:
+        if len(batch) >= target_size:
             return batch
 
         self._timeout_reached = False
         self._last_activity_timestamp = None
-        while receiving and not expired and len(batch) < max_batch_size and not self._timeout_reached:
-            while receiving and self._received_messages.qsize() < max_batch_size and not self._timeout_reached:
-                if timeout and self._counter.get_current_ms() > timeout:
-                    expired = True
-                    break
-                before = self._received_messages.qsize()
-                receiving = await self.do_work_async()
-                received = self._received_messages.qsize() - before
-                if self._received_messages.qsize() > 0 and received == 0:
-                    # No new messages arrived, but we have some - so return what we have.
-                    expired = True
-                    break
-
-            while not self._received_messages.empty() and len(batch) < max_batch_size:
-                batch.append(self._received_messages.get())
-                self._received_messages.task_done()
+        self._wait_deadline = wait_deadline
+        try:
+            while receiving and not expired and len(batch) < target_size and not self._timeout_reached:
+                while (receiving and len(batch) + self._received_messages.qsize() < target_size
+                       and not self._timeout_reached):
+                    now = self._counter.get_current_ms()
+                    if (timeout and now > timeout) or (wait_deadline and now >= wait_deadline):
+                        expired = True
+                        break
+                    before = self._received_messages.qsize()
+                    receiving = await self.do_work_async()
+                    received = self._received_messages.qsize() - before
+                    if not min_batch_size and self._received_messages.qsize() > 0 and received == 0:
+                        # No new messages arrived, but we have some - so return what we have.
+                        expired = True
+                        break
+                while not self._received_messages.empty() and len(batch) < max_batch_size:
+                    batch.append(self._received_messages.get())
+                    self._received_messages.task_done()
+        finally:
+            self._wait_deadline = 0
         return batch
 
     def receive_messages_iter_async(self, on_message_received=None):
@@ -978,7 +1150,7 @@ class ReceiveClientAsync(client.ReceiveClient, AMQPClientAsync):
         :param auth: Authentication credentials to the redirected endpoint.
         :type auth: ~uamqp.authentication.common.AMQPAuth
         """
-        if self._ext_connection:
+        if self._ext_connection and not self._leased_connection:
             raise ValueError(
                 "Clients with a shared connection cannot be "
                 "automatically redirected.")
@@ -988,7 +1160,7 @@ class ReceiveClientAsync(client.ReceiveClient, AMQPClientAsync):
         self._shutdown = False
         self._last_activity_timestamp = None
         self._was_message_received = False
-        self._received_messages = compat.queue.Queue()
+        self._received_messages = client._ReceiveBuffer(track_bytes=bool(self._max_buffered_bytes))  # pylint: disable=protected-access
 
         self._remote_address = address.Source(redirect.address)
         await self._redirect_async(redirect, auth)
@@ -1033,3 +1205,60 @@ class AsyncMessageIter(collections.abc.AsyncIterator):  # pylint: disable=no-mem
         finally:
             if not self.receiving and self._client._shutdown_after_timeout:
                 await self._client.close_async()
+
+
+async def open_all_async(clients, concurrency=None, connection=None, timeout=0):
+    """Open a number of clients asynchronously and wait until all of them are ready
+    to send or receive. Rather than each client being opened and made ready in turn,
+    every opening client is worked once per pass, so that their connection handshakes,
+    CBS authentication and Link attaches are in flight at the same time.
+
+    If a Connection is passed, all the clients are opened on it. Clients using CBS
+    authentication then share its CBS Session, and their Links are attached on that
+    Session together.
+
+    If a client fails to open, or the timeout is reached, all the clients opened by
+    this call are closed before the error is raised.
+
+    :param clients: The clients to open.
+    :type clients: list[~uamqp.async_ops.client_async.AMQPClientAsync]
+    :param concurrency: The maximum number of clients opening at a time. By default
+     all the clients are opened at once.
+    :type concurrency: int
+    :param connection: An existing Connection on which to open all the clients.
+    :type connection: ~uamqp.async_ops.connection_async.ConnectionAsync
+    :param timeout: A timeout in milliseconds for all the clients to be ready. The
+     default is 0, meaning no timeout.
+    :type timeout: int
+    :raises: TimeoutError or ~uamqp.errors.ClientTimeout if the timeout is reached.
+    """
+    deadline = time.time() + timeout / 1000.0 if timeout else None
+    waiting = collections.deque(clients)
+    opening = []
+    opened = []
+    backoff = _OpenBackoff()
+    try:
+        while waiting or opening:
+            while waiting and (not concurrency or len(opening) < concurrency):
+                client = waiting.popleft()
+                opened.append(client)
+                await client.open_async(connection=connection)
+                opening.append(client)
+            still_opening = []
+            for client in opening:
+                if not await client.client_ready_async():
+                    still_opening.append(client)
+            opening = still_opening
+            if opening:
+                if deadline and time.time() >= deadline:
+                    raise TimeoutException("Clients were not ready within the timeout.")
+                wait = backoff.next_wait(opening)
+                if wait:
+                    await asyncio.sleep(wait)
+    except:
+        for client in opened:
+            try:
+                await client.close_async()
+            except Exception as e:  # pylint: disable=broad-except
+                _logger.warning("Failed to close client %r: %r", client.__class__.__name__, e)
+        raise
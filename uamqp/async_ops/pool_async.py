@@ -0,0 +1,84 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+
+import logging
+
+from uamqp import pool
+from uamqp.async_ops.connection_async import ConnectionAsync
+
+_logger = logging.getLogger(__name__)
+
+
+class ConnectionPoolAsync(pool.ConnectionPool):
+    """A pool of async Connections shared between async clients. Connections are only
+    shared by clients running on the same event loop, and are closed without blocking it.
+
+    An async client uses the pool if it is passed as the `connection_pool` keyword argument.
+
+    :param max_links_per_connection: The maximum number of clients that may lease the
+     same Connection. By default this is only limited by the channel and handle limits.
+    :type max_links_per_connection: int
+    :param idle_ttl: The time in milliseconds after which a Connection that is not
+     leased by any client is closed. The default is 60000.
+    :type idle_ttl: int
+    """
+
+    async def __aenter__(self):
+        """Use the pool in an async context manager."""
+        return self
+
+    async def __aexit__(self, *args):
+        """Close all pooled Connections on exiting an async context manager."""
+        await self.close_async()
+
+    async def lease_async(
+            self, hostname, auth, transport_type=None, connection_type=ConnectionAsync, handle_max=None, **kwargs):
+        """Lease a Connection to a host asynchronously. An open Connection with the same host,
+        credentials, transport and event loop is returned if it has room for another Link,
+        otherwise a new Connection is created. Each lease must be returned with `release_async`.
+
+        :param hostname: The hostname of the AMQP service.
+        :type hostname: bytes or str
+        :param auth: Authentication credentials. A pooled Connection is only returned if it
+         was created with the same credential, such as the same password, shared access key,
+         token or `get_token` callable.
+        :type auth: ~uamqp.authentication.common.AMQPAuth
+        :param transport_type: The transport protocol type.
+        :type transport_type: ~uamqp.TransportType
+        :param connection_type: The type of Connection to create.
+        :type connection_type: type
+        :param handle_max: The maximum number of Links per Session of the client.
+        :type handle_max: int
+        :param kwargs: The settings of the Connection, if a new one is created.
+        :rtype: ~uamqp.async_ops.connection_async.ConnectionAsync
+        """
+        connection, removed = self._lease(
+            hostname, auth, transport_type, connection_type, handle_max, kwargs)
+        for idle in removed:
+            await idle.destroy_async()
+        return connection
+
+    async def release_async(self, connection):
+        """Return a Connection leased from the pool asynchronously. Once no client holds a
+        lease on the Connection, it is left open to be reused until `idle_ttl` has passed.
+
+        :param connection: The leased Connection.
+        :type connection: ~uamqp.async_ops.connection_async.ConnectionAsync
+        """
+        for idle in self._release(connection):
+            await idle.destroy_async()
+
+    async def close_idle_async(self):
+        """Close the pooled Connections that have not been leased for `idle_ttl` asynchronously."""
+        with self._lock:
+            removed = self._remove_idle(self._counter.get_current_ms())
+        for idle in removed:
+            await idle.destroy_async()
+
+    async def close_async(self):
+        """Close all the pooled Connections asynchronously, including any still leased by a client."""
+        for connection in self._remove_all():
+            await connection.destroy_async()
@@ -71,6 +71,20 @@ class MessageReceiverAsync(receiver.MessageReceiver):
     :param encoding: The encoding to use for parameters supplied as strings.
      Default is 'UTF-8'
     :type encoding: str
+    :param settle_batch_size: The maximum number of messages settled by a single
+     disposition. If greater than 1, contiguous messages that are accepted or released
+     are settled together with a range disposition once this many have been settled, once
+     `settle_batch_timeout` has passed, or before any other disposition is sent.
+     The default is 1, sending a disposition for each message.
+    :type settle_batch_size: int
+    :param settle_batch_timeout: The time in milliseconds after which a pending batch
+     of settled messages is sent, when checked on each iteration of the receiver.
+     The default is 10.
+    :type settle_batch_timeout: int
+    :param compact: Whether received messages, and the properties, header and body
+     decoded from them, hold their attributes in slots rather than instance
+     dictionaries to reduce the memory held by each message. The default is `False`.
+    :type compact: bool
     :param loop: A user specified event loop.
     :type loop: ~asycnio.AbstractEventLoop
     """
@@ -87,6 +101,9 @@ class MessageReceiverAsync(receiver.MessageReceiver):
                  debug=False,
                  encoding='UTF-8',
                  desired_capabilities=None,
+                 settle_batch_size=1,
+                 settle_batch_timeout=10,
+                 compact=False,
                  loop=None):
         self.loop = loop or get_running_loop()
         super(MessageReceiverAsync, self).__init__(
@@ -101,7 +118,10 @@ class MessageReceiverAsync(receiver.MessageReceiver):
             error_policy=error_policy,
             debug=debug,
             encoding=encoding,
-            desired_capabilities=desired_capabilities)
+            desired_capabilities=desired_capabilities,
+            settle_batch_size=settle_batch_size,
+            settle_batch_timeout=settle_batch_timeout,
+            compact=compact)
 
     async def __aenter__(self):
         """Open the MessageReceiver in an async context manager."""
@@ -134,6 +154,7 @@ class MessageReceiverAsync(receiver.MessageReceiver):
     async def work_async(self):
         """Update the link status."""
         await asyncio.sleep(0, loop=self.loop)
+        self.flush_settlements(expired_only=True)
         self._link.do_work()
 
     async def reset_link_credit_async(self, link_credit, **kwargs):
@@ -158,6 +158,45 @@ class MessageSenderAsync(sender.MessageSender):
         finally:
             self._session._connection.release_async()
 
+    async def send_many_async(self, messages, callback, timeout=0):
+        """Add multiple messages to the internal pending queue to be processed
+        by the Connection without waiting for them to be sent. The Connection
+        lock is acquired once for the whole set of messages.
+
+        :param messages: The messages to send.
+        :type messages: list[~uamqp.message.Message]
+        :param callback: The callback to be run once a disposition is received
+         in receipt of each message. The callback must take three arguments, the message,
+         the send result and the optional delivery condition (exception).
+        :type callback:
+         callable[~uamqp.message.Message, ~uamqp.constants.MessageSendResult, ~uamqp.errors.MessageException]
+        :param timeout: An expiry time for the messages added to the queue. If a
+         message is not sent within this timeout it will be discarded with an error
+         state. If set to 0, the messages will not expire. The default is 0. A list of
+         timeouts, one per message, can also be provided.
+        :type timeout: int or list[int]
+        :returns: Whether each message was accepted onto the outgoing queue.
+        :rtype: list[bool]
+        """
+        # pylint: disable=protected-access
+        try:
+            raise self._error
+        except TypeError:
+            pass
+        except Exception as e:
+            _logger.warning("%r", e)
+            raise
+        messages = list(messages)
+        c_messages = [message.get_message() for message in messages]
+        for message in messages:
+            message._on_message_sent = callback
+        timeouts = list(timeout) if isinstance(timeout, (list, tuple)) else [timeout] * len(messages)
+        try:
+            await self._session._connection.lock_async(timeout=None)
+            return self._sender.send_many(c_messages, timeouts, messages)
+        finally:
+            self._session._connection.release_async()
+
     async def work_async(self):
         """Update the link status."""
         await asyncio.sleep(0, loop=self.loop)
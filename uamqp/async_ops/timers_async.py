@@ -0,0 +1,137 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+
+import asyncio
+import heapq
+import itertools
+import logging
+import weakref
+
+from uamqp import timers
+
+_logger = logging.getLogger(__name__)
+
+
+class TimerAsync(timers.Timer):
+    """A repeating timer scheduled on a TimerServiceAsync. The coroutine function
+    is awaited every `interval` seconds until it returns False or the timer is cancelled.
+    """
+
+    async def cancel_async(self):
+        """Cancel the timer. If the callback is running, this waits for it to complete,
+        so it must not be awaited from the callback itself.
+        """
+        await self._service.cancel_async(self)
+
+
+class TimerServiceAsync(object):
+    """A heap of timers run from a single task on an event loop. The timers of all the
+    async clients on the loop, such as their keep-alives, are scheduled on the service
+    returned by `get_timer_service_async` rather than each client creating a task of its
+    own. The task only wakes when the earliest timer is due, and completes once no
+    timers remain.
+
+    :param loop: The event loop on which to run the timers.
+    :type loop: ~asyncio.AbstractEventLoop
+    """
+
+    def __init__(self, loop):
+        self.loop = loop
+        self._wakeup = asyncio.Event(loop=loop)
+        self._timers = []
+        self._sequence = itertools.count()
+        self._task = None
+        self._running = None
+
+    def __len__(self):
+        return len([t for _, _, t in self._timers if not t.cancelled])
+
+    def _push(self, timer, due):
+        heapq.heappush(self._timers, (due, next(self._sequence), timer))
+
+    def schedule(self, interval, callback):
+        """Await a coroutine function every `interval` seconds, until it returns False
+        or the returned timer is cancelled.
+
+        :param interval: The time in seconds between runs of the callback.
+        :type interval: float
+        :param callback: The coroutine function to await. It takes no arguments.
+        :type callback: callable
+        :rtype: ~uamqp.async_ops.timers_async.TimerAsync
+        """
+        timer = TimerAsync(self, interval, callback)
+        self._push(timer, self.loop.time() + interval)
+        if not self._task:
+            self._task = asyncio.ensure_future(self._run(), loop=self.loop)
+        self._wakeup.set()
+        return timer
+
+    def cancel(self, timer):
+        """Cancel a timer, without waiting for its callback if it is running.
+
+        :param timer: The timer to cancel.
+        :type timer: ~uamqp.async_ops.timers_async.TimerAsync
+        """
+        timer.cancelled = True
+        self._wakeup.set()
+
+    async def cancel_async(self, timer):
+        """Cancel a timer. If its callback is running, this waits for it to complete,
+        so it must not be awaited from the callback of the same timer.
+
+        :param timer: The timer to cancel.
+        :type timer: ~uamqp.async_ops.timers_async.TimerAsync
+        """
+        self.cancel(timer)
+        if self._running and self._running[0] is timer:
+            await asyncio.wait([self._running[1]], loop=self.loop)
+
+    async def _run(self):
+        while True:
+            while self._timers and self._timers[0][2].cancelled:
+                heapq.heappop(self._timers)
+            if not self._timers:
+                self._task = None
+                return
+            due = self._timers[0][0]
+            now = self.loop.time()
+            if due > now:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), due - now, loop=self.loop)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            timer = heapq.heappop(self._timers)[2]
+            callback = asyncio.ensure_future(timer.callback(), loop=self.loop)
+            self._running = (timer, callback)
+            try:
+                repeat = (await callback) is not False
+            except Exception as e:  # pylint: disable=broad-except
+                _logger.warning("Timer callback %r failed: %r.", timer.callback, e)
+                repeat = False
+            finally:
+                self._running = None
+            if repeat and not timer.cancelled:
+                # If the callback overran, skip the missed runs rather than catching up.
+                self._push(timer, max(due + timer.interval, self.loop.time()))
+
+
+_SERVICES = weakref.WeakKeyDictionary()
+
+
+def get_timer_service_async(loop):
+    """Get the timer service shared by all the async clients on an event loop.
+
+    :param loop: The event loop.
+    :type loop: ~asyncio.AbstractEventLoop
+    :rtype: ~uamqp.async_ops.timers_async.TimerServiceAsync
+    """
+    service = _SERVICES.get(loop)
+    if service is None:
+        service = TimerServiceAsync(loop)
+        _SERVICES[loop] = service
+    return service
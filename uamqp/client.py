@@ -6,17 +6,26 @@
 
 # pylint: disable=too-many-lines
 
+import collections
+import functools
+import heapq
+import itertools
 import logging
 import threading
 import time
 import uuid
 
 from uamqp import (Connection, Session, address, authentication, c_uamqp,
-                   compat, constants, errors, receiver, sender)
+                   compat, constants, errors, pool, receiver, sender, timers)
 from uamqp.constants import TransportType
+from uamqp.message import ColumnarBatch, Message, _CompactMessage
 
 _logger = logging.getLogger(__name__)
 
+# Bounds in seconds of the wait between iterations of an idle receive loop.
+_MIN_IDLE_WAIT = 0.001
+_MAX_IDLE_WAIT = 0.05
+
 
 class AMQPClient(object):
     """An AMQP client.
@@ -40,11 +49,16 @@ class AMQPClient(object):
     :param error_policy: A policy for parsing errors on link, connection and message
      disposition to determine whether the error should be retryable.
     :type error_policy: ~uamqp.errors.ErrorPolicy
-    :param keep_alive_interval: If set, a thread will be started to keep the connection
-     alive during periods of user inactivity. The value will determine how long the
-     thread will sleep (in seconds) between pinging the connection. If 0 or None, no
-     thread will be started.
+    :param keep_alive_interval: If set, the connection is kept alive during periods of user
+     inactivity by a timer shared by all clients. The value will determine how long to
+     wait (in seconds) between pinging the connection. If 0 or None, the connection will
+     not be kept alive.
     :type keep_alive_interval: int
+    :param connection_pool: If set, the Connection is leased from this pool, and may be
+     shared with other clients of the same host and credentials, rather than created for
+     this client alone. Unlike a Connection passed to `open`, a pooled Connection can be
+     redirected.
+    :type connection_pool: ~uamqp.pool.ConnectionPool
     :param max_frame_size: Maximum AMQP frame size. Default is 63488 bytes.
     :type max_frame_size: int
     :param channel_max: Maximum number of Session channels in the Connection.
@@ -117,7 +131,13 @@ class AMQPClient(object):
         self._backoff = 0
         self._error_policy = error_policy or errors.ErrorPolicy()
         self._keep_alive_interval = int(keep_alive_interval) if keep_alive_interval else 0
-        self._keep_alive_thread = None
+        self._keep_alive_timer = None
+        self._connection_pool = kwargs.pop('connection_pool', None)
+        self._leased_connection = False
+        self._reactor = None
+        self._reactor_wait = None
+        self._reactor_error = None
+        self._iteration_done = threading.Event()
 
         # Connection settings
         self._max_frame_size = kwargs.pop('max_frame_size', None) or constants.MAX_FRAME_SIZE_BYTES
@@ -156,18 +176,24 @@ class AMQPClient(object):
         self.close()
 
     def _keep_alive(self):
-        start_time = self._counter.get_current_ms()
+        """Keep the connection alive during periods of user inactivity. This is run
+        every `keep_alive_interval` seconds by the shared timer service. Working the
+        connection sends any empty frames due to the remote idle timeout.
+
+        :rtype: bool
+        """
+        if not self._connection or self._shutdown:
+            return False
+        if self._connection._pinned_to_other_thread():  # pylint: disable=protected-access
+            _logger.debug("Connection of %r is pinned, skipping keep-alive.", self.__class__.__name__)
+            return True  # The owning thread keeps working the connection.
         try:
-            while self._connection and not self._shutdown:
-                current_time = self._counter.get_current_ms()
-                elapsed_time = (current_time - start_time)/1000
-                if elapsed_time >= self._keep_alive_interval:
-                    _logger.debug("Keeping %r connection alive.", self.__class__.__name__)
-                    self._connection.work()
-                    start_time = current_time
-                time.sleep(1)
+            _logger.debug("Keeping %r connection alive.", self.__class__.__name__)
+            self._connection.work()
         except Exception as e:  # pylint: disable=broad-except
-            _logger.info("Connection keep-alive for %r failed: %r.", self.__class__.__name__, e)
+            _logger.warning("Connection keep-alive for %r failed: %r.", self.__class__.__name__, e)
+            return False
+        return True
 
     def _client_ready(self):  # pylint: disable=no-self-use
         """Determine whether the client is ready to start sending and/or
@@ -182,6 +208,88 @@ class AMQPClient(object):
         """Perform a single Connection iteration."""
         self._connection.work()
 
+    def _wait_idle(self, seconds):
+        """Wait between iterations of an idle client. If the client is driven by
+        a Reactor, it is instead scheduled to run again once the wait has passed.
+
+        :param seconds: The time to wait in seconds.
+        :type seconds: float
+        """
+        if self._reactor:
+            self._reactor_wait = seconds
+        else:
+            time.sleep(seconds)
+
+    def _reactor_idle_wait(self):  # pylint: disable=no-self-use
+        """The time in seconds until a client driven by a Reactor, that is ready
+        and did not wait during its last iteration, should be run again.
+
+        :rtype: float
+        """
+        return _MAX_IDLE_WAIT
+
+    def _reactor_iteration(self):
+        """Run a Connection iteration of a client driven by a Reactor, and wake any
+        thread waiting in `do_work`. Returns the time in seconds until the client
+        should next be run, or None if it has shut down.
+
+        :rtype: float
+        """
+        self._reactor_wait = None
+        wait = None
+        try:
+            if self._shutdown:
+                return None
+            self._connection._check_owner("work")  # pylint: disable=protected-access
+            if not self.client_ready():
+                wait = _MIN_IDLE_WAIT
+            elif self._client_run() and not self._shutdown:
+                wait = self._reactor_wait if self._reactor_wait is not None else self._reactor_idle_wait()
+        except Exception as e:  # pylint: disable=broad-except
+            _logger.info("Reactor iteration of %r failed: %r.", self.__class__.__name__, e)
+            self._reactor_error = e
+        finally:
+            self._iteration_done.set()
+        return wait
+
+    def _lease_connection(self):
+        """Lease a Connection for the client from its connection pool. The client then
+        authenticates with the credentials of the Connection, so they must be the same
+        as those of the client.
+
+        :rtype: ~uamqp.connection.Connection
+        :raises: ValueError if the Connection has other credentials.
+        """
+        connection = self._connection_pool.lease(self._hostname, self._auth, **self._lease_settings())
+        if not self._leased_auth_matches(connection):
+            self._connection_pool.release(connection)
+            raise ValueError("Pooled connection {!r} has different credentials to the client.".format(
+                connection.container_id))
+        return connection
+
+    def _leased_auth_matches(self, connection):
+        # pylint: disable=protected-access
+        return pool._auth_identity(connection.auth) == pool._auth_identity(self._auth)
+
+    def _lease_settings(self):
+        """The settings of the Connection leased from the connection pool.
+
+        :rtype: dict
+        """
+        return dict(
+            transport_type=self._transport_type,
+            connection_type=self.connection_type,
+            handle_max=self._handle_max,
+            container_id=self._name,
+            max_frame_size=self._max_frame_size,
+            channel_max=self._channel_max,
+            idle_timeout=self._idle_timeout,
+            properties=self._properties,
+            remote_idle_timeout_empty_frame_send_ratio=self._remote_idle_timeout_empty_frame_send_ratio,
+            error_policy=self._error_policy,
+            debug=self._debug_trace,
+            encoding=self._encoding)
+
     def _redirect(self, redirect, auth):
         """Redirect the client endpoint using a Link DETACH redirect
         response.
@@ -191,12 +299,25 @@ class AMQPClient(object):
         :param auth: Authentication credentials to the redirected endpoint.
         :type auth: ~uamqp.authentication.common.AMQPAuth
         """
-        if not self._connection._cbs:  # pylint: disable=protected-access
+        # pylint: disable=protected-access
+        self._connection._check_owner("redirect")
+        if not self._connection._cbs:
             _logger.debug("Closing non-CBS session.")
             self._session.destroy()
         self._session = None
         self._auth = auth
         self._hostname = self._remote_address.hostname
+        if self._leased_connection:
+            # A pooled connection may be shared, so lease another rather than redirect it.
+            self._connection_pool.release(self._connection)
+            self._connection = self._lease_connection()
+            self._auth = self._connection.auth
+            try:
+                self._connection.lock()
+                self._build_session()
+            finally:
+                self._connection.release()
+            return
         self._connection.redirect(redirect, auth)
         self._build_session()
 
@@ -239,6 +360,9 @@ class AMQPClient(object):
             return  # already open.
         _logger.debug("Opening client connection.")
         try:
+            if not connection and self._connection_pool:
+                connection = self._lease_connection()
+                self._leased_connection = True
             if connection:
                 _logger.debug("Using existing connection.")
                 self._auth = connection.auth
@@ -257,9 +381,9 @@ class AMQPClient(object):
                 debug=self._debug_trace,
                 encoding=self._encoding)
             self._build_session()
-            if self._keep_alive_interval:
-                self._keep_alive_thread = threading.Thread(target=self._keep_alive)
-                self._keep_alive_thread.start()
+            if self._keep_alive_interval and not self._reactor:
+                self._keep_alive_timer = timers.get_timer_service().schedule(
+                    self._keep_alive_interval, self._keep_alive)
         finally:
             if self._ext_connection:
                 connection.release()
@@ -275,14 +399,20 @@ class AMQPClient(object):
 
         All pending, unsent messages will remain uncleared to allow
         them to be inspected and queued to a new client.
+
+        :raises: ValueError if the Connection of the client is pinned to another thread.
         """
+        if self._connection:
+            self._connection._check_owner("close a client of")  # pylint: disable=protected-access
+        if self._reactor:
+            self._reactor.unregister(self)
         if self.message_handler:
             self.message_handler.destroy()
             self.message_handler = None
         self._shutdown = True
-        if self._keep_alive_thread:
-            self._keep_alive_thread.join()
-            self._keep_alive_thread = None
+        if self._keep_alive_timer:
+            self._keep_alive_timer.cancel()
+            self._keep_alive_timer = None
         if not self._session:
             return  # already closed.
         if not self._connection._cbs:  # pylint: disable=protected-access
@@ -291,7 +421,11 @@ class AMQPClient(object):
         else:
             _logger.debug("CBS session pending.")
         self._session = None
-        if not self._ext_connection:
+        if self._leased_connection:
+            _logger.debug("Returning pooled connection.")
+            self._connection_pool.release(self._connection)
+            self._leased_connection = False
+        elif not self._ext_connection:
             _logger.debug("Closing exclusive connection.")
             self._connection.destroy()
         else:
@@ -387,9 +521,20 @@ class AMQPClient(object):
         and ready to be used for further work, or `False` if it needs
         to be shut down.
 
+        If the client is registered with a Reactor, this waits for the next
+        iteration run by the reactor instead.
+
         :rtype: bool
         :raises: TimeoutError or ~uamqp.errors.ClientTimeout if CBS authentication timeout reached.
         """
+        if self._reactor:
+            self._iteration_done.wait(_MAX_IDLE_WAIT)
+            self._iteration_done.clear()
+        if self._reactor_error:
+            error, self._reactor_error = self._reactor_error, None
+            raise error
+        if self._reactor:
+            return not self._shutdown
         if self._shutdown:
             return False
         if not self.client_ready():
@@ -397,6 +542,248 @@ class AMQPClient(object):
         return self._client_run()
 
 
+class _ReceiveBuffer(compat.queue.Queue):
+    """The queue of received messages held by a ReceiveClient until they are consumed.
+    If `track_bytes` is set, the total encoded size of the buffered messages is
+    kept in `buffered_bytes`.
+
+    :param track_bytes: Whether to track the encoded size of the buffered messages.
+    :type track_bytes: bool
+    """
+
+    def __init__(self, track_bytes=False):
+        self.track_bytes = track_bytes
+        self.buffered_bytes = 0
+        compat.queue.Queue.__init__(self)
+
+    def _put(self, item):
+        size = 0
+        if self.track_bytes:
+            c_message = item if isinstance(item, c_uamqp.cMessage) else item._message  # pylint: disable=protected-access
+            size = c_uamqp.get_encoded_message_size(c_message, None)
+            self.buffered_bytes += size
+        self.queue.append((item, size))
+
+    def _get(self):
+        item, size = self.queue.popleft()
+        self.buffered_bytes -= size
+        return item
+
+    def wrap_raw_messages(self, encoding, compact=False):
+        """Wrap the undecoded messages left in the queue by a columnar receive in
+        Messages, so that they can be consumed as usual. They have already been
+        accepted, so the Messages are settled.
+
+        :param encoding: The encoding of the Messages.
+        :type encoding: str
+        :param compact: Whether to wrap the messages in compact Messages.
+        :type compact: bool
+        """
+        message_type = _CompactMessage if compact else Message
+        with self.mutex:
+            self.queue = collections.deque(
+                (message_type(message=item, encoding=encoding) if isinstance(item, c_uamqp.cMessage) else item, size)
+                for item, size in self.queue)
+
+
+class _MessageDispatcher(object):
+    """Runs the callback of a ReceiveClient for each received message on an executor.
+    The callbacks of messages with the same ordering key are run one at a time, in the
+    order the messages were received. Settling a message from a callback does not send
+    the disposition, but queues it to be sent by the thread running the connection.
+
+    :param executor: The executor to run the callbacks on.
+    :type executor: ~concurrent.futures.Executor
+    :param callback: The callback to run for each message.
+    :type callback: callable[~uamqp.message.Message]
+    :param ordering_key: A function that returns the ordering key of a message.
+    :type ordering_key: callable[~uamqp.message.Message]
+    :param auto_complete: Whether to accept messages that were not settled by the callback.
+    :type auto_complete: bool
+    """
+
+    def __init__(self, executor, callback, ordering_key=None, auto_complete=True):
+        self.pending = 0
+        self._executor = executor
+        self._callback = callback
+        self._ordering_key = ordering_key
+        self._auto_complete = auto_complete
+        self._lock = threading.Lock()
+        self._ordered = {}
+        self._settlements = compat.queue.Queue()
+
+    def _queue_settlement(self, settler, response):
+        self._settlements.put((settler, response))
+
+    def _run_callback(self, message):
+        try:
+            self._callback(message)
+            if self._auto_complete:
+                message.accept()
+        except Exception as e:  # pylint: disable=broad-except
+            _logger.error("Error processing message no %r: %r\nRejecting message.", message.delivery_no, e)
+            message.modify(True, True)
+
+    def _process(self, message, key):
+        while True:
+            self._run_callback(message)
+            with self._lock:
+                self.pending -= 1
+                if key is None:
+                    return
+                waiting = self._ordered[key]
+                if not waiting:
+                    del self._ordered[key]
+                    return
+                message = waiting.popleft()
+
+    def dispatch(self, message):
+        """Run the callback for a received message on the executor, once the callbacks
+        of any earlier messages with the same ordering key have completed.
+
+        :param message: The received message.
+        :type message: ~uamqp.message.Message
+        """
+        # pylint: disable=protected-access
+        if message._settler:
+            message._settler = functools.partial(self._queue_settlement, message._settler)
+        key = self._ordering_key(message) if self._ordering_key else None
+        with self._lock:
+            self.pending += 1
+            if key is not None:
+                if key in self._ordered:
+                    self._ordered[key].append(message)
+                    return
+                self._ordered[key] = collections.deque()
+        self._executor.submit(self._process, message, key)
+
+    def send_settlements(self):
+        """Send the dispositions of the messages settled by the callbacks. This must
+        be called from the thread running the connection.
+        """
+        while not self._settlements.empty():
+            settler, response = self._settlements.get()
+            try:
+                settler(response)
+            except RuntimeError as e:
+                _logger.info("Unable to settle message: %r", e)
+
+
+class _PendingMessages(object):
+    """The queue of messages held by a SendClient that have not yet reached
+    a completed state.
+
+    Messages are bucketed by their current state so that each connection
+    iteration only needs to touch the messages that changed state, rather
+    than scanning the whole queue. Messages waiting to be sent are held in
+    FIFO order, while messages awaiting a send acknowledgement are keyed by
+    their delivery so they can be removed as soon as the disposition arrives.
+    Where a message timeout is set, send deadlines are held in a min-heap so
+    that only the messages that have actually expired need to be visited.
+
+    :param msg_timeout: A timeout in milliseconds for messages from when they
+     have been added to the send queue. Default is 0, meaning no timeout.
+    :type msg_timeout: int
+    """
+
+    def __init__(self, msg_timeout=0):
+        self._msg_timeout = msg_timeout
+        self._waiting_to_be_sent = collections.deque()
+        self._waiting_for_send_ack = {}
+        self._deadlines = []
+        self._expired = set()
+        self._sequence = itertools.count()
+
+    def __len__(self):
+        return self.waiting_to_be_sent + len(self._waiting_for_send_ack)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    __nonzero__ = __bool__
+
+    def __iter__(self):
+        for message in list(self._waiting_for_send_ack.values()):
+            yield message
+        for message in list(self._waiting_to_be_sent):
+            if id(message) not in self._expired:
+                yield message
+
+    @property
+    def waiting_to_be_sent(self):
+        """The number of messages queued that have not yet been transferred.
+
+        :rtype: int
+        """
+        return len(self._waiting_to_be_sent) - len(self._expired)
+
+    @property
+    def waiting_for_send_ack(self):
+        """The number of messages that have been transferred and are awaiting
+        a disposition from the service.
+
+        :rtype: int
+        """
+        return len(self._waiting_for_send_ack)
+
+    def append(self, message):
+        """Add a new message to the back of the send queue. If a message timeout
+        is set, the message deadline is calculated from its `idle_time`.
+
+        :param message: The message to be sent.
+        :type message: ~uamqp.message.Message
+        """
+        self._waiting_to_be_sent.append(message)
+        if self._msg_timeout > 0:
+            deadline = message.idle_time + self._msg_timeout
+            heapq.heappush(self._deadlines, (deadline, next(self._sequence), message))
+
+    def pop_waiting(self, count):
+        """Remove and return up to `count` messages from the front of the
+        send queue.
+
+        :param count: The maximum number of messages to return.
+        :type count: int
+        :rtype: generator[~uamqp.message.Message]
+        """
+        while count > 0 and self._waiting_to_be_sent:
+            message = self._waiting_to_be_sent.popleft()
+            if id(message) in self._expired:
+                self._expired.discard(id(message))
+                continue
+            count -= 1
+            yield message
+
+    def pop_expired(self, current_time):
+        """Remove and return the messages still waiting to be sent whose
+        deadline has passed. Messages that have already been transferred are
+        left to time out against the timeout passed to the message sender.
+
+        :param current_time: The current tick count in milliseconds.
+        :type current_time: int
+        :rtype: generator[~uamqp.message.Message]
+        """
+        while self._deadlines and self._deadlines[0][0] < current_time:
+            _, _, message = heapq.heappop(self._deadlines)
+            if message.state == constants.MessageState.WaitingToBeSent:
+                self._expired.add(id(message))
+                yield message
+
+    def update(self, message):
+        """Move a message into the bucket for its current state. Messages
+        in a completed state are dropped from the queue.
+
+        :param message: The message whose state has changed.
+        :type message: ~uamqp.message.Message
+        """
+        if message.state == constants.MessageState.WaitingForSendAck:
+            self._waiting_for_send_ack[id(message)] = message
+            return
+        self._waiting_for_send_ack.pop(id(message), None)
+        if message.state == constants.MessageState.WaitingToBeSent:
+            self._waiting_to_be_sent.append(message)
+
+
 class SendClient(AMQPClient):
     """An AMQP client for sending messages.
 
@@ -423,11 +810,16 @@ class SendClient(AMQPClient):
     :param error_policy: A policy for parsing errors on link, connection and message
      disposition to determine whether the error should be retryable.
     :type error_policy: ~uamqp.errors.ErrorPolicy
-    :param keep_alive_interval: If set, a thread will be started to keep the connection
-     alive during periods of user inactivity. The value will determine how long the
-     thread will sleep (in seconds) between pinging the connection. If 0 or None, no
-     thread will be started.
+    :param keep_alive_interval: If set, the connection is kept alive during periods of user
+     inactivity by a timer shared by all clients. The value will determine how long to
+     wait (in seconds) between pinging the connection. If 0 or None, the connection will
+     not be kept alive.
     :type keep_alive_interval: int
+    :param connection_pool: If set, the Connection is leased from this pool, and may be
+     shared with other clients of the same host and credentials, rather than created for
+     this client alone. Unlike a Connection passed to `open`, a pooled Connection can be
+     redirected.
+    :type connection_pool: ~uamqp.pool.ConnectionPool
     :param send_settle_mode: The mode by which to settle message send
      operations. If set to `Unsettled`, the client will wait for a confirmation
      from the service that the message was successfully sent. If set to 'Settled',
@@ -478,8 +870,9 @@ class SendClient(AMQPClient):
             error_policy=None, keep_alive_interval=None, **kwargs):
         target = target if isinstance(target, address.Address) else address.Target(target)
         self._msg_timeout = msg_timeout
-        self._pending_messages = []
-        self._waiting_messages = []
+        self._pending_messages = _PendingMessages(msg_timeout)
+        self._submitted = collections.deque()
+        self._waiting_messages = 0
         self._shutdown = None
 
         # Sender and Link settings
@@ -593,6 +986,8 @@ class SendClient(AMQPClient):
         except KeyboardInterrupt:
             _logger.error("Received shutdown signal while processing message send completion.")
             self.message_handler._error = errors.AMQPClientShutdown()
+        finally:
+            self._pending_messages.update(message)
 
     def _get_msg_timeout(self, message):
         current_time = self._counter.get_current_ms()
@@ -607,29 +1002,52 @@ class SendClient(AMQPClient):
             _logger.info("Message not sent, raising RuntimeError.")
             raise RuntimeError("Message sender failed to add message data to outgoing queue.")
 
+    def _transfer_messages(self, messages, timeouts):
+        """Transfer a set of messages to the message sender under a single
+        acquisition of the Connection lock. Returns a list with an exception for
+        each message that could not be transferred, or None where it succeeded.
+        If the bulk transfer fails, each message will be retried individually
+        so that the error is only attributed to the messages that caused it.
+        """
+        if not messages:
+            return []
+        try:
+            accepted = self.message_handler.send_many(messages, self._on_message_sent, timeout=timeouts)
+        except Exception:  # pylint: disable=broad-except
+            _logger.debug("Bulk message transfer failed, transferring messages individually.")
+        else:
+            return [None if sent else RuntimeError("Message sender failed to add message data to outgoing queue.")
+                    for sent in accepted]
+        results = []
+        for message, timeout in zip(messages, timeouts):
+            try:
+                self._transfer_message(message, timeout)
+            except Exception as exp:  # pylint: disable=broad-except
+                results.append(exp)
+            else:
+                results.append(None)
+        return results
+
     def _filter_pending(self):
-        filtered = []
-        for message in self._pending_messages:
-            if message.state in constants.DONE_STATES:
+        self._waiting_messages = self._pending_messages.waiting_for_send_ack
+        for message in self._pending_messages.pop_expired(self._counter.get_current_ms()):
+            self._on_message_sent(message, constants.MessageSendResult.Timeout)
+        batch = []
+        timeouts = []
+        for message in self._pending_messages.pop_waiting(self._pending_messages.waiting_to_be_sent):
+            message.state = constants.MessageState.WaitingForSendAck
+            timeout = self._get_msg_timeout(message)
+            if timeout is None:
+                self._on_message_sent(message, constants.MessageSendResult.Timeout)
                 continue
+            batch.append(message)
+            timeouts.append(timeout)
+        for message, exp in zip(batch, self._transfer_messages(batch, timeouts)):
+            if exp is not None:
+                self._on_message_sent(message, constants.MessageSendResult.Error, delivery_state=exp)
             elif message.state == constants.MessageState.WaitingForSendAck:
-                self._waiting_messages += 1
-            elif message.state == constants.MessageState.WaitingToBeSent:
-                message.state = constants.MessageState.WaitingForSendAck
-                try:
-                    timeout = self._get_msg_timeout(message)
-                    if timeout is None:
-                        self._on_message_sent(message, constants.MessageSendResult.Timeout)
-                        if message.state != constants.MessageState.WaitingToBeSent:
-                            continue
-                    else:
-                        self._transfer_message(message, timeout)
-                except Exception as exp:  # pylint: disable=broad-except
-                    self._on_message_sent(message, constants.MessageSendResult.Error, delivery_state=exp)
-                    if message.state != constants.MessageState.WaitingToBeSent:
-                        continue
-            filtered.append(message)
-        return filtered
+                self._pending_messages.update(message)
+        return self._pending_messages
 
     def _client_run(self):
         """MessageSender Link is now open - perform message send
@@ -640,8 +1058,9 @@ class SendClient(AMQPClient):
         :rtype: bool
         """
         # pylint: disable=protected-access
+        while self._submitted:
+            self._pending_messages.append(self._submitted.popleft())
         self.message_handler.work()
-        self._waiting_messages = 0
         self._pending_messages = self._filter_pending()
         if self._backoff and not self._waiting_messages:
             _logger.info("Client told to backoff - sleeping for %r seconds", self._backoff)
@@ -657,9 +1076,27 @@ class SendClient(AMQPClient):
         """
         return self.message_handler
 
+    def _reactor_idle_wait(self):
+        if self._pending_messages or self._submitted:
+            return _MIN_IDLE_WAIT
+        return _MAX_IDLE_WAIT
+
+    def _queue_pending(self, message):
+        """Add a message to the pending messages. If the client is driven by a Reactor,
+        the message is handed to the reactor thread to be added, and the thread is woken.
+
+        :param message: The message to be sent.
+        :type message: ~uamqp.message.Message
+        """
+        if self._reactor:
+            self._submitted.append(message)
+            self._reactor.wake(self)
+        else:
+            self._pending_messages.append(message)
+
     @property
     def pending_messages(self):
-        return [m for m in self._pending_messages if m.state in constants.PENDING_STATES]
+        return list(self._pending_messages) + list(self._submitted)
 
     def redirect(self, redirect, auth):
         """Redirect the client endpoint using a Link DETACH redirect
@@ -670,14 +1107,14 @@ class SendClient(AMQPClient):
         :param auth: Authentication credentials to the redirected endpoint.
         :type auth: ~uamqp.authentication.common.AMQPAuth
         """
-        if self._ext_connection:
+        if self._ext_connection and not self._leased_connection:
             raise ValueError(
                 "Clients with a shared connection cannot be "
                 "automatically redirected.")
         if self.message_handler:
             self.message_handler.destroy()
             self.message_handler = None
-        self._pending_messages = []
+        self._pending_messages = _PendingMessages(self._msg_timeout)
         self._remote_address = address.Target(redirect.address)
         self._redirect(redirect, auth)
 
@@ -699,7 +1136,7 @@ class SendClient(AMQPClient):
             for internal_message in message.gather():
                 internal_message.idle_time = self._counter.get_current_ms()
                 internal_message.state = constants.MessageState.WaitingToBeSent
-                self._pending_messages.append(internal_message)
+                self._queue_pending(internal_message)
 
     def send_message(self, messages, close_on_done=False):
         """Send a single message or batched message.
@@ -716,12 +1153,18 @@ class SendClient(AMQPClient):
         pending_batch = []
         for message in batch:
             message.idle_time = self._counter.get_current_ms()
-            self._pending_messages.append(message)
+            self._queue_pending(message)
             pending_batch.append(message)
         self.open()
         running = True
         try:
-            while running and any([m for m in pending_batch if m.state not in constants.DONE_STATES]):
+            completed = 0
+            while running:
+                # Messages generally complete in order, so only advance past those that are done.
+                while completed < len(pending_batch) and pending_batch[completed].state in constants.DONE_STATES:
+                    completed += 1
+                if completed == len(pending_batch):
+                    break
                 running = self.do_work()
             failed = [m for m in pending_batch if m.state == constants.MessageState.SendFailed]
             if any(failed):
@@ -742,7 +1185,7 @@ class SendClient(AMQPClient):
 
         :rtype: bool
         """
-        return bool(self._pending_messages)
+        return bool(self._pending_messages) or bool(self._submitted)
 
     def wait(self):
         """Run the client until all pending message in the queue
@@ -770,7 +1213,7 @@ class SendClient(AMQPClient):
         self.open()
         running = True
         try:
-            messages = self._pending_messages[:]
+            messages = self.pending_messages
             running = self.wait()
             results = [m.state for m in messages]
             return results
@@ -815,11 +1258,16 @@ class ReceiveClient(AMQPClient):
     :param error_policy: A policy for parsing errors on link, connection and message
      disposition to determine whether the error should be retryable.
     :type error_policy: ~uamqp.errors.ErrorPolicy
-    :param keep_alive_interval: If set, a thread will be started to keep the connection
-     alive during periods of user inactivity. The value will determine how long the
-     thread will sleep (in seconds) between pinging the connection. If 0 or None, no
-     thread will be started.
+    :param keep_alive_interval: If set, the connection is kept alive during periods of user
+     inactivity by a timer shared by all clients. The value will determine how long to
+     wait (in seconds) between pinging the connection. If 0 or None, the connection will
+     not be kept alive.
     :type keep_alive_interval: int
+    :param connection_pool: If set, the Connection is leased from this pool, and may be
+     shared with other clients of the same host and credentials, rather than created for
+     this client alone. Unlike a Connection passed to `open`, a pooled Connection can be
+     redirected.
+    :type connection_pool: ~uamqp.pool.ConnectionPool
     :param send_settle_mode: The mode by which to settle message send
      operations. If set to `Unsettled`, the client will wait for a confirmation
      from the service that the message was successfully sent. If set to 'Settled',
@@ -844,6 +1292,30 @@ class ReceiveClient(AMQPClient):
      messages the Link will attempt to handle per connection iteration.
      The default is 300.
     :type prefetch: int
+    :param adaptive_prefetch: Whether to resize the Link credit from the rate at which
+     received messages are consumed, up to `prefetch` messages. No further credit is
+     issued while the consumer falls behind. The default is `False`.
+    :type adaptive_prefetch: bool
+    :param max_prefetch_bytes: With `adaptive_prefetch`, the maximum number of bytes of
+     messages to hold in the receive buffer and in flight, estimated from the average
+     encoded message size. The default is no limit.
+    :type max_prefetch_bytes: int
+    :param max_buffered_bytes: The maximum total encoded size in bytes of received messages
+     held in the buffer until they are consumed. Once reached, the outstanding Link credit
+     is withdrawn and no further messages are requested until the buffer has drained to
+     half this size. The current size is available as `buffered_bytes`. The default is no limit.
+    :type max_buffered_bytes: int
+    :param settle_batch_size: The maximum number of received messages settled by a single
+     disposition. If greater than 1, contiguous messages that are accepted or released
+     are settled together with a range disposition. The default is 1.
+    :type settle_batch_size: int
+    :param settle_batch_timeout: The time in milliseconds after which a pending batch
+     of settled messages is sent. The default is 10.
+    :type settle_batch_timeout: int
+    :param compact: Whether received messages, and the properties, header and body
+     decoded from them, hold their attributes in slots rather than instance
+     dictionaries to reduce the memory held by each message. The default is `False`.
+    :type compact: bool
     :param max_frame_size: Maximum AMQP frame size. Default is 63488 bytes.
     :type max_frame_size: int
     :param channel_max: Maximum number of Session channels in the Connection.
@@ -880,7 +1352,13 @@ class ReceiveClient(AMQPClient):
         self._was_message_received = False
         self._message_received_callback = None
         self._streaming_receive = False
-        self._received_messages = compat.queue.Queue()
+        self._max_buffered_bytes = kwargs.pop('max_buffered_bytes', None)
+        self._received_messages = _ReceiveBuffer(track_bytes=bool(self._max_buffered_bytes))
+        self._credit_paused = False
+        self._dispatcher = None
+        self._columnar_receive = False
+        self._idle_wait = 0
+        self._wait_deadline = 0
 
         self._shutdown_after_timeout = kwargs.pop('shutdown_after_timeout', True)
         self._timeout_reached = False
@@ -889,6 +1367,14 @@ class ReceiveClient(AMQPClient):
         self._max_message_size = kwargs.pop('max_message_size', None) or constants.MAX_MESSAGE_LENGTH_BYTES
         self._prefetch = kwargs.pop('prefetch', None) or 300
         self._link_properties = kwargs.pop('link_properties', None)
+        self._settle_batch_size = kwargs.pop('settle_batch_size', None) or 1
+        self._settle_batch_timeout = kwargs.pop('settle_batch_timeout', None) or 10
+        self._compact = kwargs.pop('compact', False)
+        adaptive_prefetch = kwargs.pop('adaptive_prefetch', False)
+        max_prefetch_bytes = kwargs.pop('max_prefetch_bytes', None)
+        self._credit_controller = None
+        if adaptive_prefetch:
+            self._credit_controller = receiver.LinkCreditController(self._prefetch, max_bytes=max_prefetch_bytes)
 
         # AMQP object settings
         self.receiver_type = receiver.MessageReceiver
@@ -897,6 +1383,16 @@ class ReceiveClient(AMQPClient):
         super(ReceiveClient, self).__init__(
             source, auth=auth, client_name=client_name, error_policy=error_policy, debug=debug, **kwargs)
 
+    @property
+    def buffered_bytes(self):
+        """The total encoded size in bytes of the received messages that are
+        buffered and have not yet been consumed. This is only tracked if
+        `max_buffered_bytes` is set, otherwise it is always 0.
+
+        :rtype: int
+        """
+        return self._received_messages.buffered_bytes
+
     @property
     def _message_receiver(self):
         """Temporary property to support backwards compatibility
@@ -916,6 +1412,7 @@ class ReceiveClient(AMQPClient):
         """
         # pylint: disable=protected-access
         if not self.message_handler:
+            self._credit_paused = False
             self.message_handler = self.receiver_type(
                 self._session, self._remote_address, self._name,
                 on_message_received=self._message_received,
@@ -928,7 +1425,10 @@ class ReceiveClient(AMQPClient):
                 properties=self._link_properties,
                 error_policy=self._error_policy,
                 encoding=self._encoding,
-                desired_capabilities=self._desired_capabilities)
+                desired_capabilities=self._desired_capabilities,
+                settle_batch_size=self._settle_batch_size,
+                settle_batch_timeout=self._settle_batch_timeout,
+                compact=self._compact)
             self.message_handler.open()
             return False
         if self.message_handler.get_state() == constants.MessageReceiverState.Error:
@@ -941,7 +1441,9 @@ class ReceiveClient(AMQPClient):
             return False
 
         # once the receiver client is ready/connection established, we set prefetch as per the config
-        self.message_handler._link.set_prefetch_count(self._prefetch)  # pylint: disable=protected-access
+        if not self._credit_controller:
+            self.message_handler._link.set_prefetch_count(self._prefetch)  # pylint: disable=protected-access
+        self.message_handler.on_raw_message_received = self._raw_message_received if self._columnar_receive else None
         return True
 
     def _client_run(self):
@@ -951,12 +1453,17 @@ class ReceiveClient(AMQPClient):
 
         :rtype: bool
         """
-        self.message_handler.work()
+        if self._dispatcher:
+            self._dispatcher.send_settlements()
+        if self._link_credit_available():
+            self.message_handler.work()
+        else:
+            self.message_handler.flush_settlements(expired_only=True)
         self._connection.work()
         now = self._counter.get_current_ms()
         if self._last_activity_timestamp and not self._was_message_received:
             # If no messages are coming through, back off a little to keep CPU use low.
-            time.sleep(0.05)
+            self._wait_idle(self._get_idle_wait(now))
             if self._timeout > 0:
                 timespan = now - self._last_activity_timestamp
                 if timespan >= self._timeout:
@@ -969,9 +1476,87 @@ class ReceiveClient(AMQPClient):
                         _logger.info("Timeout reached, keeping receiver open.")
         else:
             self._last_activity_timestamp = now
+            self._idle_wait = 0
         self._was_message_received = False
         return True
 
+    def _link_credit_available(self):
+        """Determine whether the MessageReceiver Link may issue further credit to
+        the sender. If `max_buffered_bytes` is set and reached, or if as many messages
+        as the prefetch are waiting for their callback on an executor, the outstanding
+        credit is withdrawn and none is issued until the backlog has drained to half the limit.
+
+        :rtype: bool
+        """
+        if self._credit_paused:
+            if self._backlog_exceeds(0.5):
+                return False
+            _logger.debug("Receive backlog drained, resuming link credit.")
+            self._credit_paused = False
+        elif self._backlog_exceeds(1):
+            _logger.debug("Receive backlog reached its limit, pausing link credit.")
+            self._credit_paused = True
+            self.message_handler.reset_link_credit(0)
+            return False
+        if self._credit_controller:
+            return self._update_link_credit()
+        return True
+
+    def _backlog_exceeds(self, fraction):
+        """Whether the received messages waiting to be consumed have reached the
+        given fraction of the limits on the receive backlog.
+
+        :param fraction: The fraction of the limits to check against.
+        :type fraction: float
+        :rtype: bool
+        """
+        if self._max_buffered_bytes and self._received_messages.buffered_bytes >= self._max_buffered_bytes * fraction:
+            return True
+        if self._dispatcher and self._dispatcher.pending >= self._prefetch * fraction:
+            return True
+        if self._reactor and self._received_messages.qsize() >= self._prefetch * fraction:
+            # Messages are received by the reactor between calls, so bound them by the prefetch.
+            return True
+        return False
+
+    def _update_link_credit(self):
+        """Resize the link credit according to the adaptive prefetch controller.
+        Returns False if no further credit should be issued to the sender until
+        more of the received messages have been consumed.
+
+        :rtype: bool
+        """
+        buffered = self._received_messages.qsize()
+        if self._dispatcher:
+            buffered += self._dispatcher.pending
+        credit = self._credit_controller.get_credit(self._counter.get_current_ms(), buffered)
+        if credit:
+            self.message_handler._link.set_prefetch_count(credit)  # pylint: disable=protected-access
+        return credit > 0
+
+    def _reactor_idle_wait(self):  # pylint: disable=no-self-use
+        # Messages are arriving, so the client is run again straight away.
+        return 0
+
+    def _get_idle_wait(self, now):
+        """Get the time to wait before the next iteration of the receive loop when no
+        message was received in the last one. The wait starts short, so that a message
+        arriving soon after the last one is picked up with little delay, and doubles on
+        each idle iteration up to a maximum. It is also limited to the remaining time
+        before the receive timeout, and before the deadline of a batch being received.
+
+        :param now: The current time in milliseconds.
+        :type now: int
+        :rtype: float
+        """
+        self._idle_wait = min(max(self._idle_wait * 2, _MIN_IDLE_WAIT), _MAX_IDLE_WAIT)
+        wait = self._idle_wait
+        if self._timeout > 0:
+            wait = min(wait, (self._last_activity_timestamp + self._timeout - now) / 1000.0)
+        if self._wait_deadline:
+            wait = min(wait, (self._wait_deadline - now) / 1000.0)
+        return max(wait, 0)
+
     def _complete_message(self, message, auto):  # pylint: disable=no-self-use
         if not message or not auto:
             return
@@ -1014,6 +1599,11 @@ class ReceiveClient(AMQPClient):
         :type message: ~uamqp.message.Message
         """
         self._was_message_received = True
+        if self._credit_controller:
+            self._credit_controller.message_received(message._message)  # pylint: disable=protected-access
+        if self._dispatcher:
+            self._dispatcher.dispatch(message)
+            return
         if self._message_received_callback:
             self._message_received_callback(message)
         self._complete_message(message, self.auto_complete)
@@ -1024,7 +1614,57 @@ class ReceiveClient(AMQPClient):
             # Message was received with callback processing and wasn't settled.
             _logger.info("Message was not settled.")
 
-    def receive_message_batch(self, max_batch_size=None, on_message_received=None, timeout=0):
+    def _raw_message_received(self, message, message_number):
+        """Callback run on receipt of every message while receiving a columnar
+        batch. The message is accepted and queued without being decoded.
+
+        :param message: Received message.
+        :type message: ~uamqp.c_uamqp.cMessage
+        :param message_number: The delivery number of the message.
+        :type message_number: int
+        """
+        # pylint: disable=protected-access
+        self._was_message_received = True
+        if self._credit_controller:
+            self._credit_controller.message_received(message)
+        if self._receive_settle_mode != constants.ReceiverSettleMode.ReceiveAndDelete:
+            self.message_handler._settle_in_range(receiver._ACCEPTED, message_number)
+        self._received_messages.put(message)
+
+    def receive_columnar_batch(self, fields, max_batch_size=None, timeout=0, missing=-1):
+        """Receive a batch of messages decoded into columns, without creating a
+        ~uamqp.message.Message for each message. Messages are accepted as they are received,
+        regardless of `auto_complete`. The batching behaviour is the same as `receive_message_batch`.
+
+        :param fields: The fields to decode. Use `'body'` for the message body data, and
+         message annotation keys such as `b"x-opt-sequence-number"` for integer annotations.
+        :type fields: list[str or bytes]
+        :param max_batch_size: The maximum number of messages that can be returned in
+         one call. This value cannot be larger than the prefetch value, and if not specified,
+         the prefetch value will be used.
+        :type max_batch_size: int
+        :param timeout: I timeout in milliseconds for which to wait to receive any messages.
+         If no messages are received in this time, an empty batch will be returned. If set to
+         0, the client will continue to wait until at least one message is received. The
+         default is 0.
+        :type timeout: float
+        :param missing: The value to use where a message does not have a requested annotation,
+         or where its value cannot be represented as an int64. Default is -1.
+        :type missing: int
+        :rtype: ~uamqp.message.ColumnarBatch
+        """
+        self._columnar_receive = True
+        try:
+            batch = self.receive_message_batch(max_batch_size=max_batch_size, timeout=timeout)
+        finally:
+            self._columnar_receive = False
+            if self.message_handler:
+                self.message_handler.on_raw_message_received = None
+            self._received_messages.wrap_raw_messages(self._encoding, compact=self._compact)
+        return ColumnarBatch(batch, fields, missing=missing)
+
+    def receive_message_batch(
+            self, max_batch_size=None, on_message_received=None, timeout=0, min_batch_size=None, max_wait_time=None):
         """Receive a batch of messages. Messages returned in the batch have already been
         accepted - if you wish to add logic to accept or reject messages based on custom
         criteria, pass in a callback. This method will return as soon as some messages are
@@ -1048,6 +1688,14 @@ class ReceiveClient(AMQPClient):
          0, the client will continue to wait until at least one message is received. The
          default is 0.
         :type timeout: float
+        :param min_batch_size: If set, rather than returning as soon as some messages are
+         available, wait until at least this many messages have been received or until
+         `max_wait_time` has passed. This cannot be larger than `max_batch_size`.
+        :type min_batch_size: int
+        :param max_wait_time: With `min_batch_size`, the maximum time in milliseconds to wait
+         for the minimum number of messages, after which the messages received so far are
+         returned, which may be none. If not set, `timeout` applies as usual.
+        :type max_wait_time: float
         """
         self._message_received_callback = on_message_received
         max_batch_size = max_batch_size or self._prefetch
@@ -1055,37 +1703,51 @@ class ReceiveClient(AMQPClient):
             raise ValueError(
                 'Maximum batch size cannot be greater than the '
                 'connection link credit: {}'.format(self._prefetch))
+        if min_batch_size and min_batch_size > max_batch_size:
+            raise ValueError(
+                'Minimum batch size {} cannot be greater than the '
+                'maximum batch size: {}'.format(min_batch_size, max_batch_size))
+        target_size = min_batch_size or max_batch_size
         timeout = self._counter.get_current_ms() + timeout if timeout else 0
         expired = False
+        wait_deadline = 0
+        if min_batch_size and max_wait_time:
+            wait_deadline = self._counter.get_current_ms() + int(max_wait_time)
         self.open()
         receiving = True
         batch = []
         while not self._received_messages.empty() and len(batch) < max_batch_size:
             batch.append(self._received_messages.get())
             self._received_messages.task_done()
-        if len(batch) >= max_batch_size:
+        if len(batch) >= target_size:
             return batch
 
         self._timeout_reached = False
         self._last_activity_timestamp = None
-        while receiving and not expired and len(batch) < max_batch_size and not self._timeout_reached:
-            while receiving and self._received_messages.qsize() < max_batch_size and not self._timeout_reached:
-                if timeout and self._counter.get_current_ms() > timeout:
-                    expired = True
-                    break
-                before = self._received_messages.qsize()
-                receiving = self.do_work()
-                received = self._received_messages.qsize() - before
-                if self._received_messages.qsize() > 0 and received == 0:
-                    # No new messages arrived, but we have some - so return what we have.
-                    expired = True
-                    break
-            while not self._received_messages.empty() and len(batch) < max_batch_size:
-                batch.append(self._received_messages.get())
-                self._received_messages.task_done()
+        self._wait_deadline = wait_deadline
+        try:
+            while receiving and not expired and len(batch) < target_size and not self._timeout_reached:
+                while (receiving and len(batch) + self._received_messages.qsize() < target_size
+                       and not self._timeout_reached):
+                    now = self._counter.get_current_ms()
+                    if (timeout and now > timeout) or (wait_deadline and now >= wait_deadline):
+                        expired = True
+                        break
+                    before = self._received_messages.qsize()
+                    receiving = self.do_work()
+                    received = self._received_messages.qsize() - before
+                    if not min_batch_size and self._received_messages.qsize() > 0 and received == 0:
+                        # No new messages arrived, but we have some - so return what we have.
+                        expired = True
+                        break
+                while not self._received_messages.empty() and len(batch) < max_batch_size:
+                    batch.append(self._received_messages.get())
+                    self._received_messages.task_done()
+        finally:
+            self._wait_deadline = 0
         return batch
 
-    def receive_messages(self, on_message_received):
+    def receive_messages(self, on_message_received, executor=None, ordering_key=None):
         """Receive messages. This function will run indefinitely, until the client
         closes either via timeout, error or forced interruption (e.g. keyboard interrupt).
 
@@ -1098,10 +1760,25 @@ class ReceiveClient(AMQPClient):
         :param on_message_received: A callback to process messages as they arrive from the
          service. It takes a single argument, a ~uamqp.message.Message object.
         :type on_message_received: callable[~uamqp.message.Message]
+        :param executor: If set, the callback is run for each message on this executor,
+         e.g. a `concurrent.futures.ThreadPoolExecutor`, rather than on the thread running the
+         connection. Settling a message from the callback is deferred to the connection
+         thread. No further messages are requested while as many messages as the prefetch
+         are waiting for their callback to complete. Before returning, this function waits
+         for the callbacks of all the messages received to complete.
+        :type executor: ~concurrent.futures.Executor
+        :param ordering_key: With `executor`, a function that returns the ordering key of a
+         message, e.g. its group ID. The callbacks of messages with the same key are run one
+         at a time in the order the messages were received. The callbacks of messages with a
+         key of `None`, or of all messages if not set, may run in any order.
+        :type ordering_key: callable[~uamqp.message.Message]
         """
         self._streaming_receive = True
         self.open()
         self._message_received_callback = on_message_received
+        if executor:
+            self._dispatcher = _MessageDispatcher(
+                executor, on_message_received, ordering_key=ordering_key, auto_complete=self.auto_complete)
         self._timeout_reached = False
         self._last_activity_timestamp = None
         receiving = True
@@ -1114,9 +1791,36 @@ class ReceiveClient(AMQPClient):
             raise
         finally:
             self._streaming_receive = False
+            if self._dispatcher:
+                try:
+                    self._wait_for_dispatched()
+                except Exception as e:  # pylint: disable=broad-except
+                    _logger.warning("Unable to send the settlements of dispatched messages: %r", e)
+                self._dispatcher = None
             if not receiving and self._shutdown_after_timeout:
                 self.close()
 
+    def _wait_for_dispatched(self):
+        """Wait for the callbacks of all the messages dispatched to the executor to
+        complete, and send their settlements. No further credit is issued to the sender.
+        If the client has a timeout, this waits no longer than the timeout for the
+        callbacks to complete, and the settlements of those still running are not sent.
+        """
+        deadline = self._counter.get_current_ms() + self._timeout if self._timeout > 0 else None
+        while True:
+            self._dispatcher.send_settlements()
+            self._connection.work()
+            if not self._dispatcher.pending:
+                break
+            if deadline and self._counter.get_current_ms() >= deadline:
+                _logger.warning("Timed out waiting for the callbacks of %r dispatched messages.",
+                                self._dispatcher.pending)
+                break
+            time.sleep(_MIN_IDLE_WAIT)
+        self._dispatcher.send_settlements()
+        self.message_handler.flush_settlements()
+        self._connection.work()
+
     def receive_messages_iter(self, on_message_received=None):
         """Receive messages by generator. Messages returned in the generator have already been
         accepted - if you wish to add logic to accept or reject messages based on custom
@@ -1138,7 +1842,7 @@ class ReceiveClient(AMQPClient):
         :param auth: Authentication credentials to the redirected endpoint.
         :type auth: ~uamqp.authentication.common.AMQPAuth
         """
-        if self._ext_connection:
+        if self._ext_connection and not self._leased_connection:
             raise ValueError(
                 "Clients with a shared connection cannot be "
                 "automatically redirected.")
@@ -1148,7 +1852,101 @@ class ReceiveClient(AMQPClient):
         self._shutdown = False
         self._last_activity_timestamp = None
         self._was_message_received = False
-        self._received_messages = compat.queue.Queue()
+        self._received_messages = _ReceiveBuffer(track_bytes=bool(self._max_buffered_bytes))
 
         self._remote_address = address.Source(redirect.address)
         self._redirect(redirect, auth)
+
+
+class _OpenBackoff(object):
+    """The wait between the passes of `open_all`. There is no wait after a pass in
+    which an opening client moved on: a client was opened or became ready, or the
+    state of a Connection or Link changed. After each pass without progress, the
+    wait doubles from `_MIN_IDLE_WAIT` up to `_MAX_IDLE_WAIT`.
+    """
+
+    def __init__(self):
+        self._stages = None
+        self._idle_wait = 0
+
+    @staticmethod
+    def _open_stage(client):
+        # pylint: disable=protected-access
+        connection = client._connection
+        handler = client.message_handler
+        return (
+            id(client),
+            connection._state if connection else None,
+            handler._state if handler else None)
+
+    def next_wait(self, opening):
+        """The time in seconds to wait before the next pass.
+
+        :param opening: The clients that are not yet ready.
+        :type opening: list[~uamqp.client.AMQPClient]
+        :rtype: float
+        """
+        stages = [self._open_stage(c) for c in opening]
+        if stages == self._stages:
+            self._idle_wait = min(max(self._idle_wait * 2, _MIN_IDLE_WAIT), _MAX_IDLE_WAIT)
+        else:
+            self._idle_wait = 0
+        self._stages = stages
+        return self._idle_wait
+
+
+def open_all(clients, concurrency=None, connection=None, timeout=0):
+    """Open a number of clients and wait until all of them are ready to send or
+    receive. Rather than each client being opened and made ready in turn, every
+    opening client is worked once per pass, so that their connection handshakes,
+    CBS authentication and Link attaches are in flight at the same time.
+
+    If a Connection is passed, all the clients are opened on it. Clients using CBS
+    authentication then share its CBS Session, and their Links are attached on that
+    Session together.
+
+    If a client fails to open, or the timeout is reached, all the clients opened by
+    this call are closed before the error is raised.
+
+    :param clients: The clients to open.
+    :type clients: list[~uamqp.client.AMQPClient]
+    :param concurrency: The maximum number of clients opening at a time. By default
+     all the clients are opened at once.
+    :type concurrency: int
+    :param connection: An existing Connection on which to open all the clients.
+    :type connection: ~uamqp.connection.Connection
+    :param timeout: A timeout in milliseconds for all the clients to be ready. The
+     default is 0, meaning no timeout.
+    :type timeout: int
+    :raises: TimeoutError or ~uamqp.errors.ClientTimeout if the timeout is reached.
+    """
+    # pylint: disable=protected-access
+    clients = list(clients)
+    if any(c._reactor for c in clients):
+        raise ValueError("Clients registered with a Reactor are opened by the Reactor.")
+    deadline = time.time() + timeout / 1000.0 if timeout else None
+    waiting = collections.deque(clients)
+    opening = []
+    opened = []
+    backoff = _OpenBackoff()
+    try:
+        while waiting or opening:
+            while waiting and (not concurrency or len(opening) < concurrency):
+                client = waiting.popleft()
+                opened.append(client)
+                client.open(connection=connection)
+                opening.append(client)
+            opening = [c for c in opening if not c.client_ready()]
+            if opening:
+                if deadline and time.time() >= deadline:
+                    raise compat.TimeoutException("Clients were not ready within the timeout.")
+                wait = backoff.next_wait(opening)
+                if wait:
+                    time.sleep(wait)
+    except:
+        for client in opened:
+            try:
+                client.close()
+            except Exception as e:  # pylint: disable=broad-except
+                _logger.warning("Failed to close client %r: %r", client.__class__.__name__, e)
+        raise
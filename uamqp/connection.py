@@ -4,6 +4,7 @@
 # license information.
 #--------------------------------------------------------------------------
 
+import collections
 import logging
 import threading
 import time
@@ -82,6 +83,8 @@ class Connection(object):
         self._conn = self._create_connection(sasl)
         self._sessions = []
         self._lock = threading.Lock()
+        self._owner = None
+        self._submitted = collections.deque()
         self._state = c_uamqp.ConnectionState.UNKNOWN
         self._encoding = encoding
         self._settings = {}
@@ -188,13 +191,23 @@ class Connection(object):
             self._error = errors.AMQPClientShutdown()
 
     def lock(self, timeout=3.0):
+        owner = self._owner
+        if owner is threading.current_thread():
+            return  # Only the owning thread works a pinned connection, so no lock is needed.
+        if owner:
+            raise compat.TimeoutException("Connection is pinned to another thread.")
         try:
             if not self._lock.acquire(timeout=timeout):  # pylint: disable=unexpected-keyword-arg
                 raise compat.TimeoutException("Failed to acquire connection lock.")
         except TypeError:  # Timeout isn't supported in Py2.7
             self._lock.acquire()
+        if self._owner:
+            self._lock.release()
+            raise compat.TimeoutException("Connection is pinned to another thread.")
 
     def release(self):
+        if self._owner is threading.current_thread():
+            return
         try:
             self._lock.release()
         except (RuntimeError, threading.ThreadError):
@@ -207,10 +220,80 @@ class Connection(object):
                 pass
             raise
 
+    def pin(self):
+        """Pin the Connection to the calling thread. Until `unpin` is called, only this
+        thread may work the Connection, and it does so without acquiring the Connection
+        lock. Other threads must pass operations on the Connection to `submit`, to be run
+        by the owning thread in its next call to `work`. Their calls to `work` return
+        without doing anything, and other operations needing the lock fail with a
+        TimeoutException.
+
+        While pinned, the Connection can only be destroyed or redirected, and its clients
+        closed, from the owning thread; doing so from another thread raises a ValueError.
+        The owning thread must keep working the Connection, as the keep-alive of its clients
+        is skipped, and clients on a pinned Connection cannot be driven by a Reactor.
+        """
+        with self._lock:
+            self._owner = threading.current_thread()
+
+    def unpin(self):
+        """Release the Connection from the thread it is pinned to, so that it can be
+        worked from any thread under the Connection lock again. Any submitted operations
+        not yet run are run now. This must be called from the owning thread.
+        """
+        if self._owner is not threading.current_thread():
+            raise ValueError("Connection is not pinned to the calling thread.")
+        self._run_submitted()
+        self._owner = None
+
+    def submit(self, operation, *args):
+        """Run an operation on the Connection. If the Connection is pinned to another
+        thread, the operation is added to a submission queue, without locking, and run
+        by the owning thread in its next call to `work`, in which case None is returned.
+        Otherwise it is run straight away under the Connection lock and its result
+        is returned.
+
+        :param operation: The operation to run.
+        :type operation: callable
+        :param args: The arguments to the operation.
+        """
+        if self._pinned_to_other_thread():
+            self._submitted.append((operation, args))
+            return None
+        try:
+            self.lock(timeout=-1)
+            return operation(*args)
+        finally:
+            self.release()
+
+    def _pinned_to_other_thread(self):
+        """Whether the Connection is pinned to a thread other than the calling thread.
+
+        :rtype: bool
+        """
+        owner = self._owner
+        return bool(owner) and owner is not threading.current_thread()
+
+    def _check_owner(self, operation):
+        if self._pinned_to_other_thread():
+            raise ValueError("Cannot {} connection {!r} as it is pinned to another thread.".format(
+                operation, self.container_id))
+
+    def _run_submitted(self):
+        while self._submitted:
+            operation, args = self._submitted.popleft()
+            try:
+                operation(*args)
+            except Exception as e:  # pylint: disable=broad-except
+                _logger.warning("Submitted operation %r on connection %r failed: %r", operation, self.container_id, e)
+
     def destroy(self):
         """Close the connection, and close any associated
         CBS authentication session.
+
+        :raises: ValueError if the Connection is pinned to another thread.
         """
+        self._check_owner("destroy")
         try:
             self.lock()
             _logger.debug("Unlocked connection %r to close.", self.container_id)
@@ -225,7 +308,9 @@ class Connection(object):
         :type redirect: ~uamqp.errors.LinkRedirect
         :param auth: Authentication credentials to the redirected endpoint.
         :type auth: ~uamqp.authentication.common.AMQPAuth
+        :raises: ValueError if the Connection is pinned to another thread.
         """
+        self._check_owner("redirect")
         try:
             self.lock()
             _logger.info("Redirecting connection %r.", self.container_id)
@@ -254,8 +339,11 @@ class Connection(object):
         except Exception as e:
             _logger.warning("%r", e)
             raise
+        if self._pinned_to_other_thread():
+            return  # A pinned connection is only worked by its owning thread.
         try:
             self.lock()
+            self._run_submitted()
             self._conn.do_work()
         except compat.TimeoutException:
             _logger.debug("Connection %r timed out while waiting for lock acquisition.", self.container_id)
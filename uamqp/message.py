@@ -13,6 +13,28 @@ from uamqp import c_uamqp, constants, errors, utils
 
 _logger = logging.getLogger(__name__)
 
+# Flags for the sections of a received message that have not yet been decoded.
+_PROPERTIES = 0x01
+_HEADER = 0x02
+_FOOTER = 0x04
+_APPLICATION_PROPERTIES = 0x08
+_ANNOTATIONS = 0x10
+_DELIVERY_ANNOTATIONS = 0x20
+_RECEIVED_SECTIONS = 0x3F
+
+
+def _is_immutable(value):
+    """Whether a section value cannot be modified in place, so that a change to it
+    is always visible as a new object.
+
+    :rtype: bool
+    """
+    if isinstance(value, (list, dict, set, bytearray)):
+        return False
+    if isinstance(value, tuple):
+        return all(_is_immutable(v) for v in value)
+    return True
+
 
 class Message(object):
     """An AMQP message.
@@ -60,6 +82,9 @@ class Message(object):
     :type encoding: str
     """
 
+    # Whether the sections of a received message are wrapped in their compact classes.
+    _compact = False
+
     def __init__(self,
                  body=None,
                  properties=None,
@@ -86,7 +111,8 @@ class Message(object):
         self._header = None
         self._footer = None
         self._delivery_annotations = None
-        self._need_further_parse = False
+        self._sections = None
+        self._unparsed_sections = 0
 
         if message:
             if settler:
@@ -118,75 +144,103 @@ class Message(object):
 
     @property
     def properties(self):
-        if self._need_further_parse:
-            self._parse_message_properties()
+        if self._unparsed_sections & _PROPERTIES:
+            self._parse_message_section(_PROPERTIES)
         return self._properties
 
     @properties.setter
     def properties(self, value):
         if value and not isinstance(value, MessageProperties):
             raise TypeError("Properties must be a MessageProperties.")
+        self._unparsed_sections &= ~_PROPERTIES
         self._properties = value
 
     @property
     def header(self):
-        if self._need_further_parse:
-            self._parse_message_properties()
+        if self._unparsed_sections & _HEADER:
+            self._parse_message_section(_HEADER)
         return self._header
 
     @header.setter
     def header(self, value):
         if value and not isinstance(value, MessageHeader):
             raise TypeError("Header must be a MessageHeader.")
+        self._unparsed_sections &= ~_HEADER
         self._header = value
 
     @property
     def footer(self):
-        if self._need_further_parse:
-            self._parse_message_properties()
+        if self._unparsed_sections & _FOOTER:
+            self._parse_message_section(_FOOTER)
         return self._footer
 
     @footer.setter
     def footer(self, value):
         if value and not isinstance(value, dict):
             raise TypeError("Footer must be a dictionary")
-        footer_props = c_uamqp.create_footer(
-            utils.data_factory(value, encoding=self._encoding))
+        if value:
+            footer_props = self._get_section('footer', value, c_uamqp.create_footer)
+        else:
+            footer_props = c_uamqp.create_footer(
+                utils.data_factory(value, encoding=self._encoding))
         self._message.footer = footer_props
+        self._unparsed_sections &= ~_FOOTER
         self._footer = value
 
     @property
     def application_properties(self):
-        if self._need_further_parse:
-            self._parse_message_properties()
+        if self._unparsed_sections & _APPLICATION_PROPERTIES:
+            self._parse_message_section(_APPLICATION_PROPERTIES)
         return self._application_properties
 
     @application_properties.setter
     def application_properties(self, value):
         if value and not isinstance(value, dict):
             raise TypeError("Application properties must be a dictionary.")
+        self._unparsed_sections &= ~_APPLICATION_PROPERTIES
         self._application_properties = value
 
     @property
     def annotations(self):
-        if self._need_further_parse:
-            self._parse_message_properties()
+        if self._unparsed_sections & _ANNOTATIONS:
+            self._parse_message_section(_ANNOTATIONS)
         return self._annotations
 
     @annotations.setter
     def annotations(self, value):
         if value and not isinstance(value, dict):
             raise TypeError("Message annotations must be a dictionary.")
+        self._unparsed_sections &= ~_ANNOTATIONS
         self._annotations = value
 
+    def get_annotation(self, key, default=None):
+        """Get the value of a single message annotation. If the annotations
+        of a received message have not yet been accessed, only the value for
+        this key will be decoded.
+
+        :param key: The annotation key, e.g. `b"x-opt-sequence-number"`.
+        :type key: bytes
+        :param default: The value to return if the annotation is not present.
+        :rtype: Any
+        """
+        if self._unparsed_sections & _ANNOTATIONS:
+            _ann = self._message.message_annotations
+            if not _ann:
+                return default
+            return _ann.get(key, default)
+        if not self._annotations:
+            return default
+        return self._annotations.get(key, default)
+
     @property
     def delivery_annotations(self):
-        if self._need_further_parse:
-            self._parse_message_properties()
+        if self._unparsed_sections & _DELIVERY_ANNOTATIONS:
+            self._parse_message_section(_DELIVERY_ANNOTATIONS)
         return self._delivery_annotations
 
     @delivery_annotations.setter
     def delivery_annotations(self, value):
+        self._unparsed_sections &= ~_DELIVERY_ANNOTATIONS
         self._delivery_annotations = value
 
     @classmethod
@@ -201,38 +255,72 @@ class Message(object):
         decoded_message = c_uamqp.decode_message(len(data), data)
         return cls(message=decoded_message)
 
+    @classmethod
+    def from_encoded(cls, data, msg_format=None, encoding='UTF-8'):
+        """Create a message to be sent from AMQP wire-encoded bytes, for example
+        those returned by `encode_message()`. The encoded sections will be sent as-is
+        without being rebuilt on each send attempt.
+
+        :param data: The AMQP wire-encoded bytes of the message.
+        :type data: bytes or bytearray
+        :param msg_format: A custom message format. Default is 0.
+        :type msg_format: int
+        :param encoding: The encoding to use for parameters supplied as strings.
+         Default is 'UTF-8'
+        :type encoding: str
+        :rtype: ~uamqp.message.PreEncodedMessage
+        """
+        return PreEncodedMessage(data, msg_format=msg_format, encoding=encoding)
+
     def __str__(self):
         if not self._message:
             return ""
         return str(self._body)
 
     def _parse_message_properties(self):
-        if self._need_further_parse:
+        for section in (_PROPERTIES, _HEADER, _FOOTER, _APPLICATION_PROPERTIES, _ANNOTATIONS, _DELIVERY_ANNOTATIONS):
+            if self._unparsed_sections & section:
+                self._parse_message_section(section)
+
+    def _parse_message_section(self, section):
+        """Decode a single section of a received message on first access.
+
+        :param section: The flag of the message section.
+        :type section: int
+        """
+        self._unparsed_sections &= ~section
+        if section == _PROPERTIES:
             _props = self._message.properties
             if _props:
                 _logger.debug("Parsing received message properties %r.", self.delivery_no)
-                self._properties = MessageProperties(properties=_props, encoding=self._encoding)
+                properties_type = _CompactMessageProperties if self._compact else MessageProperties
+                self._properties = properties_type(properties=_props, encoding=self._encoding)
+        elif section == _HEADER:
             _header = self._message.header
             if _header:
                 _logger.debug("Parsing received message header %r.", self.delivery_no)
-                self._header = MessageHeader(header=_header)
+                header_type = _CompactMessageHeader if self._compact else MessageHeader
+                self._header = header_type(header=_header)
+        elif section == _FOOTER:
             _footer = self._message.footer
             if _footer:
                 _logger.debug("Parsing received message footer %r.", self.delivery_no)
                 self._footer = _footer.map
+        elif section == _APPLICATION_PROPERTIES:
             _app_props = self._message.application_properties
             if _app_props:
                 _logger.debug("Parsing received message application properties %r.", self.delivery_no)
                 self._application_properties = _app_props.map
+        elif section == _ANNOTATIONS:
             _ann = self._message.message_annotations
             if _ann:
                 _logger.debug("Parsing received message annotations %r.", self.delivery_no)
                 self._annotations = _ann.map
+        elif section == _DELIVERY_ANNOTATIONS:
             _delivery_ann = self._message.delivery_annotations
             if _delivery_ann:
                 _logger.debug("Parsing received message delivery annotations %r.", self.delivery_no)
                 self._delivery_annotations = _delivery_ann.map
-            self._need_further_parse = False
 
     def _parse_message_body(self, message):
         """Parse a message received from an AMQP service.
@@ -250,12 +338,12 @@ class Message(object):
         if body_type == c_uamqp.MessageBodyType.NoneType:
             self._body = None
         elif body_type == c_uamqp.MessageBodyType.DataType:
-            self._body = DataBody(self._message)
+            self._body = (_CompactDataBody if self._compact else DataBody)(self._message)
         elif body_type == c_uamqp.MessageBodyType.SequenceType:
             raise TypeError("Message body type Sequence not supported.")
         else:
-            self._body = ValueBody(self._message)
-        self._need_further_parse = True
+            self._body = (_CompactValueBody if self._compact else ValueBody)(self._message)
+        self._unparsed_sections = _RECEIVED_SECTIONS
 
     def _can_settle_message(self):
         if self.state not in constants.RECEIVE_STATES:
@@ -264,35 +352,60 @@ class Message(object):
             return False
         return True
 
+    def _get_section(self, name, value, create_section=None):
+        """Get the C value for a dictionary message section, reusing the value built
+        on a previous call if the contents of the dictionary have not changed since.
+        Values are compared by identity, so a section holding a container that could
+        be modified in place, such as a list, is not reused.
+
+        :param name: The name of the message section.
+        :type name: str
+        :param value: The dictionary contents of the section.
+        :type value: dict
+        :param create_section: A function to wrap the AMQP value in the C section type.
+        :type create_section: callable
+        """
+        if self._sections is None:
+            self._sections = {}
+        try:
+            snapshot, c_section = self._sections[name]
+            if len(snapshot) == len(value) and all(k in value and value[k] is v for k, v in snapshot.items()):
+                return c_section
+        except KeyError:
+            pass
+        c_section = utils.data_factory(value, encoding=self._encoding)
+        if create_section:
+            c_section = create_section(c_section)
+        if all(_is_immutable(v) for v in value.values()):
+            self._sections[name] = (dict(value), c_section)
+        else:
+            self._sections.pop(name, None)
+        return c_section
+
     def _populate_message_attributes(self, c_message):
         if self.properties:
             c_message.properties = self.properties.get_properties_obj()
         if self.application_properties:
             if not isinstance(self.application_properties, dict):
                 raise TypeError("Application properties must be a dictionary.")
-            amqp_props = utils.data_factory(self.application_properties, encoding=self._encoding)
-            c_message.application_properties = amqp_props
+            c_message.application_properties = self._get_section(
+                'application_properties', self.application_properties)
         if self.annotations:
             if not isinstance(self.annotations, dict):
                 raise TypeError("Message annotations must be a dictionary.")
-            ann_props = c_uamqp.create_message_annotations(
-                utils.data_factory(self.annotations, encoding=self._encoding))
-            c_message.message_annotations = ann_props
+            c_message.message_annotations = self._get_section(
+                'annotations', self.annotations, c_uamqp.create_message_annotations)
         if self.delivery_annotations:
             if not isinstance(self.delivery_annotations, dict):
                 raise TypeError("Delivery annotations must be a dictionary.")
-            delivery_ann_props = c_uamqp.create_delivery_annotations(
-                utils.data_factory(self.delivery_annotations, encoding=self._encoding))
-            c_message.delivery_annotations = delivery_ann_props
+            c_message.delivery_annotations = self._get_section(
+                'delivery_annotations', self.delivery_annotations, c_uamqp.create_delivery_annotations)
         if self.header:
             c_message.header = self.header.get_header_obj()
         if self.footer:
             if not isinstance(self.footer, dict):
                 raise TypeError("Footer must be a dictionary.")
-            footer = c_uamqp.create_footer(
-                utils.data_factory(self.footer, encoding=self._encoding))
-            c_message.footer = footer
-
+            c_message.footer = self._get_section('footer', self.footer, c_uamqp.create_footer)
 
     @property
     def settled(self):
@@ -333,9 +446,27 @@ class Message(object):
             raise ValueError("No message data to encode.")
         cloned_data = self._message.clone()
         self._populate_message_attributes(cloned_data)
-        encoded_data = []
+        encoded_data = bytearray()
         c_uamqp.get_encoded_message_size(cloned_data, encoded_data)
-        return b"".join(encoded_data)
+        return bytes(encoded_data)
+
+    def encode_into(self, buffer, offset=0):
+        """Encode message to AMQP wire-encoded bytes, writing directly into
+        a writable buffer such as a preallocated bytearray or an mmap.
+
+        :param buffer: The buffer to write the encoded message into.
+        :type buffer: bytearray or memoryview or mmap.mmap
+        :param offset: The position in the buffer at which to start writing. Default is 0.
+        :type offset: int
+        :returns: The number of bytes written.
+        :rtype: int
+        :raises: ValueError if the encoded message does not fit in the buffer.
+        """
+        if not self._message:
+            raise ValueError("No message data to encode.")
+        cloned_data = self._message.clone()
+        self._populate_message_attributes(cloned_data)
+        return c_uamqp.encode_message_into(cloned_data, buffer, offset)
 
     def get_data(self):
         """Get the body data of the message. The format may vary depending
@@ -466,6 +597,83 @@ class Message(object):
         return False
 
 
+class PreEncodedMessage(Message):
+    """An AMQP message to be sent that has already been wire-encoded.
+
+    The message sections are decoded once into the underlying C message, which
+    is then transferred as-is on every send attempt. This avoids rebuilding the
+    properties, annotations and footer each time the message is sent or retried.
+    The same encoded data can be used to create a message for each of multiple
+    targets. The message sections can be read, but changes made to them will not
+    be sent.
+
+    :ivar on_send_complete: A custom callback to be run on completion of
+     the send operation of this message. The callback must take two parameters,
+     a result (of type `MessageSendResult`) and an error (of type
+     Exception). The error parameter may be None if no error ocurred or the error
+     information was undetermined.
+    :vartype on_send_complete: callable[~uamqp.constants.MessageSendResult, Exception]
+
+    :param data: The AMQP wire-encoded bytes of the message.
+    :type data: bytes or bytearray
+    :param msg_format: A custom message format. Default is 0.
+    :type msg_format: int
+    :param encoding: The encoding to use for parameters supplied as strings.
+     Default is 'UTF-8'
+    :type encoding: str
+    """
+
+    def __init__(self, data, msg_format=None, encoding='UTF-8'):
+        self._encoded_data = six.binary_type(data)
+        decoded_message = c_uamqp.decode_message(len(self._encoded_data), self._encoded_data)
+        super(PreEncodedMessage, self).__init__(message=decoded_message, encoding=encoding)
+        self.state = constants.MessageState.WaitingToBeSent
+        self._response = None
+        if msg_format:
+            self._message.message_format = msg_format
+
+    def get_message_encoded_size(self):
+        """Get the size of the message once it has been encoded
+        to go over the wire.
+
+        :rtype: int
+        """
+        return len(self._encoded_data)
+
+    def encode_message(self):
+        """Get the AMQP wire-encoded bytes of the message.
+
+        :rtype: bytes
+        """
+        return self._encoded_data
+
+    def encode_into(self, buffer, offset=0):
+        """Copy the AMQP wire-encoded bytes of the message into a writable buffer.
+
+        :param buffer: The buffer to write the encoded message into.
+        :type buffer: bytearray or memoryview or mmap.mmap
+        :param offset: The position in the buffer at which to start writing. Default is 0.
+        :type offset: int
+        :returns: The number of bytes written.
+        :rtype: int
+        :raises: ValueError if the encoded message does not fit in the buffer.
+        """
+        encoded_size = len(self._encoded_data)
+        view = memoryview(buffer)
+        if offset < 0 or offset + encoded_size > len(view):
+            raise ValueError("Buffer is too small to encode message of {} bytes at offset {}.".format(
+                encoded_size, offset))
+        view[offset:offset + encoded_size] = self._encoded_data
+        return encoded_size
+
+    def get_message(self):
+        """Get the underlying C message from this object.
+
+        :rtype: uamqp.c_uamqp.cMessage
+        """
+        return self._message
+
+
 class BatchMessage(Message):
     """A Batched AMQP message.
 
@@ -535,7 +743,9 @@ class BatchMessage(Message):
         self._application_properties = application_properties
         self._annotations = annotations
         self._header = header
-        self._need_further_parse = False
+        self._unparsed_sections = 0
+        self._batch_message = None
+        self._batch_size = 0
 
     def _create_batch_message(self):
         """Create a ~uamqp.message.Message for a value supplied by the data
@@ -550,6 +760,80 @@ class BatchMessage(Message):
                        header=self.header,
                        encoding=self._encoding)
 
+    def _encode_batch_data(self, data):
+        """Encode a single value supplied by the data generator into
+        AMQP wire-encoded bytes to be added to the batch body.
+
+        :rtype: bytearray
+        """
+        encoded_data = bytearray()
+        try:
+            # try to get the internal uamqp Message
+            internal_uamqp_message = data.message
+        except AttributeError:
+            # no inernal message, data could be uamqp Message or raw data
+            internal_uamqp_message = data
+        try:
+            # uamqp Message
+            if not internal_uamqp_message.application_properties and self.application_properties:
+                internal_uamqp_message.application_properties = self.application_properties
+            c_message = internal_uamqp_message.get_message()
+        except AttributeError:  # raw data
+            wrap_message = Message(body=internal_uamqp_message, application_properties=self.application_properties)
+            c_message = wrap_message.get_message()
+        c_uamqp.get_encoded_message_size(c_message, encoded_data)
+        return encoded_data
+
+    def _add_batch_data(self, batch_message, batch_size, encoded_data):
+        """Add encoded data as a new body section of the batch message if it
+        will fit within the maximum message size. Returns the new encoded size
+        of the batch message, or None if the data did not fit.
+
+        :rtype: int or None
+        """
+        # A data section is a 3 byte descriptor followed by the binary value,
+        # with a 1 byte length prefix for up to 255 bytes and 4 bytes beyond that.
+        data_length = len(encoded_data)
+        section_size = data_length + (5 if data_length <= 255 else 8)
+        if batch_size + section_size > self.max_message_length:
+            return None
+        batch_message._message.add_body_data(encoded_data)  # pylint: disable=protected-access
+        return batch_size + section_size
+
+    def try_add(self, data):
+        """Encode a value and add it to the batch if the batch will not exceed
+        `max_message_length` as a result. Each value is encoded only once, and the
+        encoded size of the batch is tracked as values are added. Values added here
+        will be sent ahead of any data supplied when the batch was created.
+        This is only supported for batches sent as a single message.
+
+        :param data: The value to add to the batch. This can be a
+         ~uamqp.message.Message or raw data to be used as a message body.
+        :returns: Whether the value was added to the batch.
+        :rtype: bool
+        """
+        if self._multi_messages:
+            raise TypeError("Values can only be added to a batch sent as a single message.")
+        if self._batch_message is None:
+            self._batch_message = self._create_batch_message()
+            self._batch_size = self._batch_message.get_message_encoded_size() + self.size_offset
+        batch_size = self._add_batch_data(self._batch_message, self._batch_size, self._encode_batch_data(data))
+        if batch_size is None:
+            return False
+        self._batch_size = batch_size
+        return True
+
+    @property
+    def encoded_size(self):
+        """The encoded size of the batch built with `try_add`, including the
+        configured `size_offset`.
+
+        :rtype: int
+        """
+        if self._batch_message is None:
+            return self._create_batch_message().get_message_encoded_size() + self.size_offset
+        return self._batch_size
+
     def _multi_message_generator(self):
         """Generate multiple ~uamqp.message.Message objects from a single data
         stream that in total may exceed the maximum individual message size.
@@ -559,49 +843,25 @@ class BatchMessage(Message):
 
         :rtype: generator[~uamqp.message.Message]
         """
-        unappended_message_bytes = None
-        while True:
-            new_message = self._create_batch_message()
-            message_size = new_message.get_message_encoded_size() + self.size_offset
-            body_size = 0
-            if unappended_message_bytes:
-                new_message._body.append(unappended_message_bytes)  # pylint: disable=protected-access
-                body_size += len(unappended_message_bytes)
-            try:
-                for data in self._body_gen:
-                    message_bytes = None
-                    try:
-                        # try to get the internal uamqp Message
-                        internal_uamqp_message = data.message
-                    except AttributeError:
-                        # no inernal message, data could be uamqp Message or raw data
-                        internal_uamqp_message = data
-                    try:
-                        # uamqp Message
-                        if not internal_uamqp_message.application_properties and self.application_properties:
-                            internal_uamqp_message.application_properties = self.application_properties
-                        message_bytes = internal_uamqp_message.encode_message()
-                    except AttributeError:  # raw data
-                        wrap_message = Message(
-                            body=internal_uamqp_message,
-                            application_properties=self.application_properties
-                        )
-                        message_bytes = wrap_message.encode_message()
-                    body_size += len(message_bytes)
-                    if (body_size + message_size) > self.max_message_length:
-                        new_message.on_send_complete = self.on_send_complete
-                        unappended_message_bytes = message_bytes
-                        yield new_message
-                        raise StopIteration()
-                    new_message._body.append(message_bytes)  # pylint: disable=protected-access
-            except StopIteration:
-                _logger.debug("Sent partial message.")
-                continue
-            else:
+        new_message = self._create_batch_message()
+        empty_size = new_message.get_message_encoded_size() + self.size_offset
+        message_size = empty_size
+        for data in self._body_gen or []:
+            encoded_data = self._encode_batch_data(data)
+            batch_size = self._add_batch_data(new_message, message_size, encoded_data)
+            if batch_size is None and message_size > empty_size:
                 new_message.on_send_complete = self.on_send_complete
                 yield new_message
-                _logger.debug("Sent all batched data.")
-                break
+                _logger.debug("Sent partial message.")
+                new_message = self._create_batch_message()
+                message_size = empty_size
+                batch_size = self._add_batch_data(new_message, message_size, encoded_data)
+            if batch_size is None:
+                raise errors.MessageContentTooLarge()
+            message_size = batch_size
+        new_message.on_send_complete = self.on_send_complete
+        yield new_message
+        _logger.debug("Sent all batched data.")
 
     def gather(self):
         """Return all the messages represented by this object. This will convert
@@ -614,33 +874,75 @@ class BatchMessage(Message):
             return self._multi_message_generator()
 
         new_message = self._create_batch_message()
-        message_size = new_message.get_message_encoded_size() + self.size_offset
-        body_size = 0
-
-        for data in self._body_gen:
-            message_bytes = None
-            try:
-                # try to get the internal uamqp Message
-                internal_uamqp_message = data.message
-            except AttributeError:
-                # no inernal message, data could be uamqp Message or raw data
-                internal_uamqp_message = data
-            try:
-                # uamqp Message
-                if not internal_uamqp_message.application_properties and self.application_properties:
-                    internal_uamqp_message.application_properties = self.application_properties
-                message_bytes = internal_uamqp_message.encode_message()
-            except AttributeError:  # raw data
-                wrap_message = Message(body=internal_uamqp_message, application_properties=self.application_properties)
-                message_bytes = wrap_message.encode_message()
-            body_size += len(message_bytes)
-            if (body_size + message_size) > self.max_message_length:
+        if self._batch_message is None:
+            message_size = new_message.get_message_encoded_size() + self.size_offset
+        else:
+            # Start from a copy of the data added with try_add, so the batch can be gathered again.
+            new_message._message = self._batch_message._message.clone()  # pylint: disable=protected-access
+            new_message._body = DataBody(new_message._message)  # pylint: disable=protected-access
+            message_size = self._batch_size
+
+        for data in self._body_gen or []:
+            message_size = self._add_batch_data(new_message, message_size, self._encode_batch_data(data))
+            if message_size is None:
                 raise errors.MessageContentTooLarge()
-            new_message._body.append(message_bytes)  # pylint: disable=protected-access
         new_message.on_send_complete = self.on_send_complete
         return [new_message]
 
 
+class ColumnarBatch(object):
+    """A batch of received messages decoded into contiguous columns rather
+    than individual Message objects. The body data of all messages is held in
+    a single buffer, and each annotation field in an int64 `array.array`,
+    both of which support the buffer protocol and can be wrapped without copying,
+    for example with `numpy.frombuffer`.
+
+    :ivar body: The body data of all messages concatenated. Only populated
+     if `'body'` is one of the requested fields.
+    :vartype body: bytearray
+    :ivar body_offsets: The offset of the body of each message within `body`, with
+     a final entry for the total length, such that the body of message `i` is
+     `body[body_offsets[i]:body_offsets[i + 1]]`.
+    :vartype body_offsets: array.array
+    :ivar columns: An int64 array for each requested annotation key.
+    :vartype columns: dict[bytes, array.array]
+
+    :param messages: The received messages to decode.
+    :type messages: list[~uamqp.message.Message] or list[~uamqp.c_uamqp.cMessage]
+    :param fields: The fields to decode. Use `'body'` for the message body data, and
+     message annotation keys such as `b"x-opt-sequence-number"` for annotations with integer
+     values. Annotations with string values, such as `b"x-opt-offset"`, will be converted to int.
+    :type fields: list[str or bytes]
+    :param missing: The value to use where a message does not have a requested annotation,
+     or where its value cannot be represented as an int64. Default is -1.
+    :type missing: int
+    """
+
+    def __init__(self, messages, fields, missing=-1):
+        c_messages = [m._message if isinstance(m, Message) else m for m in messages]  # pylint: disable=protected-access
+        annotation_keys = [f for f in fields if f != 'body']
+        self.body, self.body_offsets, columns = c_uamqp.decode_columnar_batch(
+            c_messages, annotation_keys, body='body' in fields, missing=missing)
+        self.columns = dict(zip(annotation_keys, columns))
+
+    def __len__(self):
+        return len(self.body_offsets) - 1
+
+    def __getitem__(self, field):
+        if field == 'body':
+            return self.body
+        return self.columns[field]
+
+    def get_body(self, index):
+        """Get the body data of a single message in the batch without copying.
+
+        :param index: The index of the message in the batch.
+        :type index: int
+        :rtype: memoryview
+        """
+        return memoryview(self.body)[self.body_offsets[index]:self.body_offsets[index + 1]]
+
+
 class MessageProperties(object):
     """Message properties.
     The properties that are actually used will depend on the service implementation.
@@ -726,6 +1028,11 @@ class MessageProperties(object):
             self.group_sequence = group_sequence
             self.reply_to_group_id = reply_to_group_id
 
+    def __setattr__(self, name, value):
+        # Any change to the properties invalidates the C properties built from them.
+        object.__setattr__(self, '_properties_obj', None)
+        object.__setattr__(self, name, value)
+
     def __str__(self):
         return str({
             'message_id': self.message_id,
@@ -917,6 +1224,8 @@ class MessageProperties(object):
 
         :rtype: uamqp.c_uamqp.cProperties
         """
+        if self._properties_obj is not None:
+            return self._properties_obj
         properties = c_uamqp.cProperties()
         self._set_attr('message_id', properties)
         self._set_attr('user_id', properties)
@@ -931,6 +1240,7 @@ class MessageProperties(object):
         self._set_attr('group_id', properties)
         self._set_attr('group_sequence', properties)
         self._set_attr('reply_to_group_id', properties)
+        object.__setattr__(self, '_properties_obj', properties)
         return properties
 
 
@@ -962,6 +1272,12 @@ class DataBody(MessageBody):
      a generator to iterate over each section in the body, where
      each section will be a byte string.
     :vartype data: Generator[bytes]
+    :ivar views: The data contained in the message body without copying. This
+     returns a generator to iterate over each section in the body, where each
+     section will be a read-only memoryview.
+    :vartype views: Generator[memoryview]
+    :ivar total_length: The combined length in bytes of all the sections in the body.
+    :vartype total_length: int
     """
 
     def __str__(self):
@@ -973,7 +1289,7 @@ class DataBody(MessageBody):
         return u"".join(d.decode(self._encoding) for d in self.data)
 
     def __bytes__(self):
-        return b"".join(self.data)
+        return b"".join(self.views)
 
     def __len__(self):
         return self._message.count_body_data()
@@ -1000,6 +1316,25 @@ class DataBody(MessageBody):
         for i in range(len(self)):
             yield self._message.get_body_data(i)
 
+    @property
+    def views(self):
+        """Iterate over each section in the body as a read-only memoryview of
+        the underlying message data, without copying it. The views are only
+        valid for as long as the message has not been destroyed.
+
+        :rtype: generator[memoryview]
+        """
+        for i in range(len(self)):
+            yield self._message.get_body_data_view(i)
+
+    @property
+    def total_length(self):
+        """The combined length in bytes of all the sections in the body.
+
+        :rtype: int
+        """
+        return self._message.get_body_data_length()
+
 
 class ValueBody(MessageBody):
     """An AMQP message body of type Value. This represents
@@ -1050,7 +1385,7 @@ class ValueBody(MessageBody):
     def data(self):
         _value = self._message.get_body_value()
         if _value:
-            return _value.value
+            return c_uamqp.to_python(_value)
         return None
 
 
@@ -1105,6 +1440,11 @@ class MessageHeader(object):
             self.durable = header.durable
             self.priority = header.priority
 
+    def __setattr__(self, name, value):
+        # Any change to the header invalidates the C header built from it.
+        object.__setattr__(self, '_header_obj', None)
+        object.__setattr__(self, name, value)
+
     def __str__(self):
         return str({
             'delivery_count': self.delivery_count,
@@ -1119,6 +1459,8 @@ class MessageHeader(object):
 
         :rtype: uamqp.c_uamqp.cHeader
         """
+        if self._header_obj is not None:
+            return self._header_obj
         header = c_uamqp.create_header()
         header.delivery_count = self.delivery_count or 0
         if self.time_to_live is not None:
@@ -1129,4 +1471,117 @@ class MessageHeader(object):
             header.durable = self.durable
         if self.priority is not None:
             header.priority = self.priority
+        object.__setattr__(self, '_header_obj', header)
         return header
+
+
+class _CompactMessage(Message):
+    """A received Message that holds its attributes in slots rather than an
+    instance dictionary, as do the properties, header and body decoded from it.
+    These are used by receivers opened with `compact=True` to reduce the memory
+    held by each received message. Arbitrary attributes can still be set, but
+    doing so creates the instance dictionary.
+    """
+
+    _compact = True
+
+    __slots__ = (
+        'state',
+        'idle_time',
+        'retries',
+        'delivery_no',
+        'delivery_tag',
+        'on_send_complete',
+        '_response',
+        '_settler',
+        '_encoding',
+        '_message',
+        '_body',
+        '_properties',
+        '_application_properties',
+        '_annotations',
+        '_header',
+        '_footer',
+        '_delivery_annotations',
+        '_sections',
+        '_unparsed_sections',
+        '_on_message_sent')
+
+
+class _CompactMessageProperties(MessageProperties):
+
+    __slots__ = (
+        '_encoding',
+        '_message_id',
+        '_user_id',
+        '_to',
+        '_subject',
+        '_reply_to',
+        '_correlation_id',
+        '_content_type',
+        '_content_encoding',
+        '_absolute_expiry_time',
+        '_creation_time',
+        '_group_id',
+        '_group_sequence',
+        '_reply_to_group_id',
+        '_properties_obj')
+
+
+class _CompactMessageHeader(MessageHeader):
+
+    __slots__ = (
+        'delivery_count',
+        'time_to_live',
+        'first_acquirer',
+        'durable',
+        'priority',
+        '_header_obj')
+
+
+class _CompactDataBody(DataBody):
+
+    __slots__ = ('_message', '_encoding')
+
+
+class _CompactValueBody(ValueBody):
+
+    __slots__ = ('_message', '_encoding')
+
+
+def decode_stream(source, chunk_size=1024 * 1024, encoding='UTF-8'):
+    """Lazily decode a stream of concatenated AMQP wire-encoded messages, reusing a single
+    decoder for the whole stream. Each message must be preceded by its encoded size as a
+    4-byte big-endian unsigned integer, as the sections of consecutive messages cannot
+    otherwise be told apart. The GIL is released while each chunk is decoded.
+    The returned messages will not have a delivery context and therefore will be
+    considered to be in an "already settled" state.
+
+    :param source: The encoded messages. This can be any object supporting the buffer
+     protocol, such as bytes, memoryview or mmap, or a binary file object.
+    :type source: bytes or memoryview or mmap.mmap or file
+    :param chunk_size: The number of bytes to decode at a time. Default is 1MB.
+    :type chunk_size: int
+    :param encoding: The encoding to use for parameters supplied as strings.
+     Default is 'UTF-8'
+    :type encoding: str
+    :rtype: generator[~uamqp.message.Message]
+    """
+    decoder = c_uamqp.cMessageStreamDecoder()
+    if hasattr(source, 'readinto'):
+        buffer = bytearray(chunk_size)
+        view = memoryview(buffer)
+        size = source.readinto(buffer)
+        while size:
+            for decoded in decoder.decode(view[:size]):
+                yield Message(message=decoded, encoding=encoding)
+            size = source.readinto(buffer)
+    else:
+        view = memoryview(source)
+        if view.ndim != 1 or view.itemsize != 1:
+            view = view.cast('B')
+        for offset in range(0, len(view), chunk_size):
+            for decoded in decoder.decode(view[offset:offset + chunk_size]):
+                yield Message(message=decoded, encoding=encoding)
+    for decoded in decoder.finish():
+        yield Message(message=decoded, encoding=encoding)
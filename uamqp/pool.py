@@ -0,0 +1,203 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+
+import logging
+import threading
+
+import six
+from uamqp import c_uamqp
+from uamqp.connection import Connection
+
+_logger = logging.getLogger(__name__)
+
+
+def _auth_identity(auth):
+    """The identity of the authentication credentials of a Connection. Clients
+    whose credentials have the same identity may share a Connection, so it includes
+    the secret itself: the password or shared access key, or otherwise the callable
+    issuing tokens or the fixed token.
+
+    :param auth: Authentication credentials.
+    :type auth: ~uamqp.authentication.common.AMQPAuth
+    :rtype: tuple
+    """
+    credential = getattr(auth, 'password', None)
+    if credential is None:
+        credential = getattr(auth, 'get_token', None)
+    if credential is None:
+        credential = getattr(auth, 'token', None)
+    return (
+        type(auth),
+        getattr(auth, 'username', None),
+        getattr(auth, 'audience', None),
+        credential)
+
+
+class _PooledConnection(object):
+
+    def __init__(self, connection, max_links):
+        self.connection = connection
+        self.max_links = max_links
+        self.links = 0
+        self.idle_since = None
+
+
+class ConnectionPool(object):
+    """A pool of Connections shared between clients. Clients opened with the same pool
+    share a Connection, and its CBS authentication Session, with the other clients
+    connecting to the same host with the same credentials and transport. The number
+    of clients leasing a Connection is limited so that their Links fit within the
+    `channel_max` of the Connection and the `handle_max` of the Sessions, and a new
+    Connection is opened once it is reached. A Connection that no client has leased
+    for `idle_ttl` is closed.
+
+    A client uses the pool if it is passed as the `connection_pool` keyword argument.
+    Async clients must use a ~uamqp.async_ops.pool_async.ConnectionPoolAsync, whose
+    Connections are only shared by clients running on the same event loop.
+
+    :param max_links_per_connection: The maximum number of clients that may lease the
+     same Connection. By default this is only limited by the channel and handle limits.
+    :type max_links_per_connection: int
+    :param idle_ttl: The time in milliseconds after which a Connection that is not
+     leased by any client is closed. The default is 60000.
+    :type idle_ttl: int
+    """
+
+    def __init__(self, max_links_per_connection=None, idle_ttl=60000):
+        self.max_links_per_connection = max_links_per_connection
+        self.idle_ttl = idle_ttl
+        self._counter = c_uamqp.TickCounter()
+        self._lock = threading.Lock()
+        self._connections = {}
+        self._leases = {}
+
+    def __enter__(self):
+        """Use the pool in a context manager."""
+        return self
+
+    def __exit__(self, *args):
+        """Close all pooled Connections on exiting a context manager."""
+        self.close()
+
+    def _max_links(self, connection, handle_max):
+        limits = [connection.channel_max + 1]
+        if handle_max:
+            limits.append(handle_max + 1)
+        if self.max_links_per_connection:
+            limits.append(self.max_links_per_connection)
+        return min(limits)
+
+    def _remove(self, pooled_connections, pooled):
+        pooled_connections.remove(pooled)
+        del self._leases[id(pooled.connection)]
+        return pooled.connection
+
+    def _remove_idle(self, now):
+        """Remove the Connections that have not been leased for `idle_ttl` from the pool.
+        Must be called holding the lock. The removed Connections are returned to be
+        closed once the lock is released.
+
+        :rtype: list[~uamqp.connection.Connection]
+        """
+        removed = []
+        for key, pooled_connections in list(self._connections.items()):
+            for pooled in list(pooled_connections):
+                if pooled.links or now - pooled.idle_since < self.idle_ttl:
+                    continue
+                _logger.info("Closing idle pooled connection %r.", pooled.connection.container_id)
+                removed.append(self._remove(pooled_connections, pooled))
+            if not pooled_connections:
+                del self._connections[key]
+        return removed
+
+    def _lease(self, hostname, auth, transport_type, connection_type, handle_max, kwargs):
+        hostname = hostname.encode('UTF-8') if isinstance(hostname, six.text_type) else hostname
+        key = (connection_type, hostname, transport_type, _auth_identity(auth), kwargs.get('loop'))
+        with self._lock:
+            removed = self._remove_idle(self._counter.get_current_ms())
+            pooled_connections = self._connections.setdefault(key, [])
+            for pooled in list(pooled_connections):
+                if pooled.connection._error:  # pylint: disable=protected-access
+                    if not pooled.links:
+                        removed.append(self._remove(pooled_connections, pooled))
+                    continue
+                if pooled.links < pooled.max_links:
+                    break
+            else:
+                connection = connection_type(hostname, auth, **kwargs)
+                pooled = _PooledConnection(connection, self._max_links(connection, handle_max))
+                pooled_connections.append(pooled)
+                self._leases[id(connection)] = pooled
+                _logger.debug("Created pooled connection %r.", connection.container_id)
+            pooled.links += 1
+            pooled.idle_since = None
+            return pooled.connection, removed
+
+    def _release(self, connection):
+        with self._lock:
+            pooled = self._leases.get(id(connection))
+            if not pooled or not pooled.links:
+                raise ValueError("Connection {!r} is not leased from this pool.".format(connection.container_id))
+            pooled.links -= 1
+            now = self._counter.get_current_ms()
+            if not pooled.links:
+                pooled.idle_since = now
+            return self._remove_idle(now)
+
+    def _remove_all(self):
+        with self._lock:
+            removed = [p.connection for c in self._connections.values() for p in c]
+            self._connections = {}
+            self._leases = {}
+        return removed
+
+    def lease(self, hostname, auth, transport_type=None, connection_type=Connection, handle_max=None, **kwargs):
+        """Lease a Connection to a host. An open Connection with the same host, credentials
+        and transport is returned if it has room for another Link, otherwise a new Connection
+        is created. Each lease must be returned with `release`.
+
+        :param hostname: The hostname of the AMQP service.
+        :type hostname: bytes or str
+        :param auth: Authentication credentials. A pooled Connection is only returned if it
+         was created with the same credential, such as the same password, shared access key,
+         token or `get_token` callable.
+        :type auth: ~uamqp.authentication.common.AMQPAuth
+        :param transport_type: The transport protocol type.
+        :type transport_type: ~uamqp.TransportType
+        :param connection_type: The type of Connection to create.
+        :type connection_type: type
+        :param handle_max: The maximum number of Links per Session of the client.
+        :type handle_max: int
+        :param kwargs: The settings of the Connection, if a new one is created.
+        :rtype: ~uamqp.connection.Connection
+        """
+        connection, removed = self._lease(
+            hostname, auth, transport_type, connection_type, handle_max, kwargs)
+        for idle in removed:
+            idle.destroy()
+        return connection
+
+    def release(self, connection):
+        """Return a Connection leased from the pool. Once no client holds a lease on
+        the Connection, it is left open to be reused until `idle_ttl` has passed.
+
+        :param connection: The leased Connection.
+        :type connection: ~uamqp.connection.Connection
+        """
+        for idle in self._release(connection):
+            idle.destroy()
+
+    def close_idle(self):
+        """Close the pooled Connections that have not been leased for `idle_ttl`."""
+        with self._lock:
+            removed = self._remove_idle(self._counter.get_current_ms())
+        for idle in removed:
+            idle.destroy()
+
+    def close(self):
+        """Close all the pooled Connections, including any still leased by a client."""
+        for connection in self._remove_all():
+            connection.destroy()
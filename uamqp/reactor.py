@@ -0,0 +1,254 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+_logger = logging.getLogger(__name__)
+
+
+class _ReactorThread(object):
+    """A thread of a Reactor, running the Connection iterations of its clients
+    as each one becomes due.
+
+    Each client has a single timer in the heap, replaced each time the client is
+    run. A timer that has been replaced, or that belongs to a client that has since
+    been unregistered, is discarded when it is popped.
+    """
+
+    def __init__(self, name, on_finished):
+        self.name = name
+        self.on_finished = on_finished
+        self.lock = threading.RLock()
+        self.clients = {}
+        self.connections = 0
+        self._wakeup = threading.Event()
+        self._timers = []
+        self._sequence = itertools.count()
+        self._running = False
+        self._thread = None
+
+    def _schedule(self, client, due):
+        timer = next(self._sequence)
+        self.clients[id(client)] = (client, timer)
+        heapq.heappush(self._timers, (due, timer, client))
+
+    def _pop_due(self, now):
+        due = []
+        while self._timers and self._timers[0][0] <= now:
+            _, timer, client = heapq.heappop(self._timers)
+            registered = self.clients.get(id(client))
+            if registered and registered[1] == timer:
+                due.append((client, timer))
+        return due
+
+    def add(self, client):
+        with self.lock:
+            self._schedule(client, 0)
+        self._wakeup.set()
+
+    def remove(self, client):
+        with self.lock:
+            return self.clients.pop(id(client), None) is not None
+
+    def wake(self, client):
+        with self.lock:
+            if id(client) in self.clients:
+                self._schedule(client, 0)
+        self._wakeup.set()
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self.run, name=self.name)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        self._wakeup.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def run(self):
+        while self._running:
+            self._wakeup.clear()
+            with self.lock:
+                due = self._pop_due(time.time())
+            for client, timer in due:
+                with self.lock:
+                    registered = self.clients.get(id(client))
+                    if not registered or registered[1] != timer:
+                        continue  # Unregistered or woken while waiting to run.
+                    wait = client._reactor_iteration()  # pylint: disable=protected-access
+                    if wait is None:
+                        self.on_finished(client)
+                    else:
+                        self._schedule(client, time.time() + wait)
+            with self.lock:
+                timeout = None
+                if self._timers:
+                    timeout = max(self._timers[0][0] - time.time(), 0)
+            if timeout is None or timeout > 0:
+                self._wakeup.wait(timeout)
+
+
+class Reactor(object):
+    """Drives the Connection iterations of many clients from a fixed number of threads,
+    rather than a thread per client. Registered clients act as handles on the reactor:
+    their blocking methods, such as `SendClient.send_message` or
+    `ReceiveClient.receive_message_batch`, wait for the iterations run by the reactor
+    instead of running them, and messages continue to be received and settlements and
+    keep-alives sent between calls.
+
+    Each client is run again once the wait it requested has passed: immediately while it
+    has messages to transfer, backing off to 50ms while it is idle. Queueing a message on a
+    SendClient wakes its reactor thread. Clients sharing a Connection are assigned to the
+    same reactor thread, and other clients to the thread with the fewest Connections.
+
+    Only synchronous clients can be registered. A client is unregistered when it is closed
+    or shuts down, and an error raised by one of its iterations is raised by the next call
+    made on the client.
+
+    :param threads: The number of reactor threads. The default is 1.
+    :type threads: int
+    """
+
+    def __init__(self, threads=1):
+        if threads < 1:
+            raise ValueError("A Reactor requires at least one thread.")
+        self._lock = threading.Lock()
+        self._threads = []
+        for index in range(threads):
+            self._threads.append(
+                _ReactorThread("uamqp-reactor-{}".format(index), self._on_finished))
+        self._assigned = {}
+        self._connections = {}
+        self._running = False
+
+    def __enter__(self):
+        """Run the Reactor in a context manager."""
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        """Stop the Reactor on exiting a context manager."""
+        self.stop()
+
+    @property
+    def clients(self):
+        """The number of clients registered with the reactor.
+
+        :rtype: int
+        """
+        return len(self._assigned)
+
+    def _assign(self, client):
+        # pylint: disable=protected-access
+        key = id(client._connection)
+        with self._lock:
+            if key in self._connections:
+                thread, count = self._connections[key]
+            else:
+                thread, count = min(self._threads, key=lambda t: t.connections), 0
+                thread.connections += 1
+            self._connections[key] = (thread, count + 1)
+            self._assigned[id(client)] = (thread, key)
+        return thread
+
+    def _release(self, client):
+        with self._lock:
+            thread, key = self._assigned.pop(id(client), (None, None))
+            if not thread:
+                return None
+            _, count = self._connections[key]
+            if count > 1:
+                self._connections[key] = (thread, count - 1)
+            else:
+                del self._connections[key]
+                thread.connections -= 1
+        return thread
+
+    def _on_finished(self, client):
+        thread = self._release(client)
+        if thread:
+            thread.remove(client)
+        client._reactor = None  # pylint: disable=protected-access
+        client._iteration_done.set()  # pylint: disable=protected-access
+
+    def start(self):
+        """Start the reactor threads."""
+        if self._running:
+            return
+        self._running = True
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        """Stop the reactor threads. Clients still registered are unregistered, but not closed."""
+        self._running = False
+        for thread in self._threads:
+            thread.stop()
+        for thread in self._threads:
+            with thread.lock:
+                clients = [c for c, _ in thread.clients.values()]
+            for client in clients:
+                self.unregister(client)
+
+    def register(self, client):
+        """Register a client to be driven by the reactor. The client is opened if it is
+        not already open. If the client has a `keep_alive_interval`, it should be registered
+        before it is opened, as the reactor keeps its Connection alive instead of a thread.
+        A client whose Connection is pinned to a thread cannot be registered.
+
+        :param client: The client to register.
+        :type client: ~uamqp.client.AMQPClient
+        """
+        # pylint: disable=protected-access
+        if client._reactor is self:
+            return
+        if client._reactor:
+            raise ValueError("Client is already registered with another Reactor.")
+        client._reactor = self
+        try:
+            client.open()
+            if client._connection._owner:
+                raise ValueError("A client on a pinned Connection cannot be registered with a Reactor.")
+        except Exception:
+            client._reactor = None
+            raise
+        self._assign(client).add(client)
+        _logger.debug("Registered %r with reactor.", client.__class__.__name__)
+
+    def unregister(self, client):
+        """Stop driving a client from the reactor. Once this returns, no further iteration
+        of the client is run by the reactor and the client can be used directly again.
+
+        :param client: The client to unregister.
+        :type client: ~uamqp.client.AMQPClient
+        """
+        # pylint: disable=protected-access
+        if client._reactor is not self:
+            return
+        thread = self._release(client)
+        if thread:
+            thread.remove(client)  # Waits for an iteration of the client in progress.
+        client._reactor = None
+        client._iteration_done.set()
+        _logger.debug("Unregistered %r from reactor.", client.__class__.__name__)
+
+    def wake(self, client):
+        """Run the next iteration of a registered client as soon as possible.
+
+        :param client: The registered client.
+        :type client: ~uamqp.client.AMQPClient
+        """
+        assigned = self._assigned.get(id(client))
+        if assigned:
+            assigned[0].wake(client)
@@ -14,6 +14,9 @@ from uamqp import c_uamqp, constants, errors, utils
 
 _logger = logging.getLogger(__name__)
 
+_ACCEPTED = 'accepted'
+_RELEASED = 'released'
+
 
 class MessageReceiver(object):
     """A Message Receiver that opens its own exclsuive Link on an
@@ -32,6 +35,10 @@ class MessageReceiver(object):
     :vartype send_settle_mode: ~uamqp.constants.SenderSettleMode
     :ivar max_message_size: The maximum allowed message size negotiated for the Link.
     :vartype max_message_size: int
+    :ivar on_raw_message_received: If set, a callback that will be run on receipt of
+     each message instead of `on_message_received`. It takes two arguments, the undecoded
+     ~uamqp.c_uamqp.cMessage and its delivery number, and is responsible for settling it.
+    :vartype on_raw_message_received: callable[~uamqp.c_uamqp.cMessage, int]
 
     :param session: The underlying Session with which to receive.
     :type session: ~uamqp.session.Session
@@ -73,6 +80,20 @@ class MessageReceiver(object):
     :param encoding: The encoding to use for parameters supplied as strings.
      Default is 'UTF-8'
     :type encoding: str
+    :param settle_batch_size: The maximum number of messages settled by a single
+     disposition. If greater than 1, contiguous messages that are accepted or released
+     are settled together with a range disposition once this many have been settled, once
+     `settle_batch_timeout` has passed, or before any other disposition is sent.
+     The default is 1, sending a disposition for each message.
+    :type settle_batch_size: int
+    :param settle_batch_timeout: The time in milliseconds after which a pending batch
+     of settled messages is sent, when checked on each iteration of the receiver.
+     The default is 10.
+    :type settle_batch_timeout: int
+    :param compact: Whether received messages, and the properties, header and body
+     decoded from them, hold their attributes in slots rather than instance
+     dictionaries to reduce the memory held by each message. The default is `False`.
+    :type compact: bool
     """
 
     def __init__(self, session, source, target,
@@ -86,7 +107,10 @@ class MessageReceiver(object):
                  error_policy=None,
                  debug=False,
                  encoding='UTF-8',
-                 desired_capabilities=None):
+                 desired_capabilities=None,
+                 settle_batch_size=1,
+                 settle_batch_timeout=10,
+                 compact=False):
         # pylint: disable=protected-access
         if name:
             self.name = name.encode(encoding) if isinstance(name, six.text_type) else name
@@ -98,7 +122,9 @@ class MessageReceiver(object):
         self.source = source._address.value
         self.target = c_uamqp.Messaging.create_target(target)
         self.on_message_received = on_message_received
+        self.on_raw_message_received = None
         self.encoding = encoding
+        self._message_type = uamqp.message._CompactMessage if compact else uamqp.Message
         self.error_policy = error_policy or errors.ErrorPolicy()
         self._settle_mode = receive_settle_mode
         self._conn = session._conn
@@ -122,6 +148,10 @@ class MessageReceiver(object):
         self._receiver.set_trace(debug)
         self._state = constants.MessageReceiverState.Idle
         self._error = None
+        self._settle_batch_size = settle_batch_size or 1
+        self._settle_batch_timeout = settle_batch_timeout
+        self._pending_settlement = None
+        self._counter = c_uamqp.TickCounter()
 
     def __enter__(self):
         """Open the MessageReceiver in a context manager."""
@@ -200,16 +230,18 @@ class MessageReceiver(object):
         if not response or isinstance(response, errors.MessageAlreadySettled):
             return
         if isinstance(response, errors.MessageAccepted):
-            self._receiver.settle_accepted_message(message_number)
+            self._settle_in_range(_ACCEPTED, message_number)
         elif isinstance(response, errors.MessageReleased):
-            self._receiver.settle_released_message(message_number)
+            self._settle_in_range(_RELEASED, message_number)
         elif isinstance(response, errors.MessageRejected):
+            self.flush_settlements()
             self._receiver.settle_rejected_message(
                 message_number,
                 response.error_condition,
                 response.error_description,
                 response.error_info)
         elif isinstance(response, errors.MessageModified):
+            self.flush_settlements()
             self._receiver.settle_modified_message(
                 message_number,
                 response.failed,
@@ -218,6 +250,53 @@ class MessageReceiver(object):
         else:
             raise ValueError("Invalid message response type: {}".format(response))
 
+    def _settle_in_range(self, outcome, message_number):
+        """Settle a message as accepted or released. If settlements are batched, the
+        message is added to the pending range of settled messages if it follows on from
+        it with the same outcome, otherwise the pending range is sent and a new one started.
+
+        :param outcome: Whether the message is accepted or released.
+        :type outcome: str
+        :param message_number: The delivery number of the message to settle.
+        :type message_number: int
+        """
+        if self._settle_batch_size <= 1:
+            if outcome == _ACCEPTED:
+                self._receiver.settle_accepted_message(message_number)
+            else:
+                self._receiver.settle_released_message(message_number)
+            return
+        pending = self._pending_settlement
+        if pending and (pending[0] != outcome or pending[2] + 1 != message_number):
+            self.flush_settlements()
+            pending = None
+        if pending:
+            pending[2] = message_number
+        else:
+            pending = [outcome, message_number, message_number, self._counter.get_current_ms()]
+            self._pending_settlement = pending
+        if pending[2] - pending[1] + 1 >= self._settle_batch_size:
+            self.flush_settlements()
+
+    def flush_settlements(self, expired_only=False):
+        """Send the disposition for the pending range of batched settlements.
+
+        :param expired_only: Only send the disposition if the pending range was
+         started more than `settle_batch_timeout` milliseconds ago.
+        :type expired_only: bool
+        """
+        pending = self._pending_settlement
+        if not pending:
+            return
+        if expired_only and self._counter.get_current_ms() - pending[3] < self._settle_batch_timeout:
+            return
+        self._pending_settlement = None
+        outcome, first, last, _ = pending
+        if outcome == _ACCEPTED:
+            self._receiver.settle_accepted_messages(first, last)
+        else:
+            self._receiver.settle_released_messages(first, last)
+
     def _message_received(self, message):
         """Callback run on receipt of every message. If there is
         a user-defined callback, this will be called.
@@ -228,12 +307,15 @@ class MessageReceiver(object):
         """
         # pylint: disable=protected-access
         message_number = self._receiver.last_received_message_number()
-        if self._settle_mode == constants.ReceiverSettleMode.ReceiveAndDelete:
-            settler = None
-        else:
-            settler = functools.partial(self._settle_message, message_number)
         try:
-            wrapped_message = uamqp.Message(
+            if self.on_raw_message_received:
+                self.on_raw_message_received(message, message_number)
+                return
+            if self._settle_mode == constants.ReceiverSettleMode.ReceiveAndDelete:
+                settler = None
+            else:
+                settler = functools.partial(self._settle_message, message_number)
+            wrapped_message = self._message_type(
                 message=message,
                 encoding=self.encoding,
                 settler=settler,
@@ -273,6 +355,7 @@ class MessageReceiver(object):
 
     def work(self):
         """Update the link status."""
+        self.flush_settlements(expired_only=True)
         self._link.do_work()
 
     def reset_link_credit(self, link_credit, **kwargs):
@@ -286,6 +369,13 @@ class MessageReceiver(object):
 
     def destroy(self):
         """Close both the Receiver and the Link. Clean up any C objects."""
+        if self._pending_settlement:
+            try:
+                self.flush_settlements()
+                self._link.do_work()
+            except Exception as e:  # pylint: disable=broad-except
+                _logger.warning("Unable to send pending settlements before closing the link: %r", e)
+                self._pending_settlement = None
         self._receiver.destroy()
         self._link.destroy()
 
@@ -305,6 +395,7 @@ class MessageReceiver(object):
 
     def close(self):
         """Close the Receiver, leaving the link intact."""
+        self.flush_settlements()
         self._receiver.close()
 
     def on_state_changed(self, previous_state, new_state):
@@ -344,3 +435,94 @@ class MessageReceiver(object):
     @max_message_size.setter
     def max_message_size(self, value):
         self._link.max_message_size = int(value)
+
+
+class LinkCreditController(object):
+    """Calculates the link credit of a receiver from the rate at which received
+    messages are consumed, the number of messages still buffered and their average
+    encoded size. The credit requested covers `target_buffer_time` of consumption,
+    so a fast consumer gets a large credit while a stalled one gets none, and is
+    bounded so that the buffered messages and the outstanding credit stay within
+    both `max_credit` messages and `max_bytes` bytes.
+
+    :param max_credit: The maximum number of messages buffered or in flight.
+    :type max_credit: int
+    :param max_bytes: The maximum number of bytes buffered or in flight, estimated from
+     the average encoded size of the messages received. The default is no limit.
+    :type max_bytes: int
+    :param min_credit: The credit requested while the consumption rate is too low to
+     justify more, as long as no messages are buffered. The default is 1.
+    :type min_credit: int
+    :param target_buffer_time: The time in milliseconds of consumption the credit should
+     cover. The default is 1000.
+    :type target_buffer_time: int
+    """
+
+    # Milliseconds over which the consumption rate is measured.
+    _rate_interval = 100
+    # Weight of the latest measurement in the moving averages.
+    _smoothing = 0.2
+
+    def __init__(self, max_credit, max_bytes=None, min_credit=1, target_buffer_time=1000):
+        self.max_credit = max_credit
+        self.max_bytes = max_bytes
+        self.min_credit = min(min_credit, max_credit)
+        self.target_buffer_time = target_buffer_time
+        self.credit = max_credit
+        self._received = 0
+        self._consumed = 0
+        self._rate = None
+        self._average_size = None
+        self._last_update = None
+
+    def _update_rate(self, now, buffered):
+        if self._last_update is None:
+            self._last_update = now
+            self._consumed = self._received - buffered
+            return
+        elapsed = now - self._last_update
+        if elapsed < self._rate_interval:
+            return
+        consumed = self._received - buffered
+        rate = (consumed - self._consumed) / float(elapsed)
+        if self._rate is None:
+            self._rate = rate
+        else:
+            self._rate += self._smoothing * (rate - self._rate)
+        self._consumed = consumed
+        self._last_update = now
+
+    def message_received(self, message):
+        """Record the receipt of a message.
+
+        :param message: The received message.
+        :type message: ~uamqp.c_uamqp.cMessage
+        """
+        self._received += 1
+        size = c_uamqp.get_encoded_message_size(message, None)
+        if self._average_size is None:
+            self._average_size = float(size)
+        else:
+            self._average_size += self._smoothing * (size - self._average_size)
+
+    def get_credit(self, now, buffered):
+        """Calculate the link credit for the next iteration of the receive loop.
+        Messages no longer buffered are counted as consumed.
+
+        :param now: The current time in milliseconds.
+        :type now: int
+        :param buffered: The number of received messages not yet consumed.
+        :type buffered: int
+        :rtype: int
+        """
+        self._update_rate(now, buffered)
+        if self._rate is None:
+            credit = self.max_credit
+        else:
+            credit = int(self._rate * self.target_buffer_time) + 1
+            credit = max(min(credit, self.max_credit), self.min_credit)
+        credit -= buffered
+        if self.max_bytes and self._average_size:
+            credit = min(credit, int(self.max_bytes // self._average_size) - buffered)
+        self.credit = max(credit, 0)
+        return self.credit
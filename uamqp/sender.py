@@ -5,6 +5,7 @@
 #--------------------------------------------------------------------------
 
 import logging
+import threading
 import uuid
 
 import six
@@ -230,6 +231,11 @@ class MessageSender(object):
         :param timeout: An expiry time for the message added to the queue. If the
          message is not sent within this timeout it will be discarded with an error
          state. If set to 0, the message will not expire. The default is 0.
+        :returns: Whether the message was accepted onto the outgoing queue. If the
+         Connection is pinned to another thread, the message is submitted to that thread
+         and True is returned. If the message then cannot be queued, the callback is run
+         with an error result.
+        :rtype: bool
         """
         # pylint: disable=protected-access
         try:
@@ -241,11 +247,79 @@ class MessageSender(object):
             raise
         c_message = message.get_message()
         message._on_message_sent = callback
+        sent = self._session._connection.submit(
+            self._transfer, threading.current_thread(), self._sender.send, [message], c_message, timeout, message)
+        return True if sent is None else sent
+
+    def send_many(self, messages, callback, timeout=0):
+        """Add multiple messages to the internal pending queue to be processed
+        by the Connection without waiting for them to be sent. The Connection
+        lock is acquired once for the whole set of messages.
+
+        :param messages: The messages to send.
+        :type messages: list[~uamqp.message.Message]
+        :param callback: The callback to be run once a disposition is received
+         in receipt of each message. The callback must take three arguments, the message,
+         the send result and the optional delivery condition (exception).
+        :type callback:
+         callable[~uamqp.message.Message, ~uamqp.constants.MessageSendResult, ~uamqp.errors.MessageException]
+        :param timeout: An expiry time for the messages added to the queue. If a
+         message is not sent within this timeout it will be discarded with an error
+         state. If set to 0, the messages will not expire. The default is 0. A list of
+         timeouts, one per message, can also be provided.
+        :type timeout: int or list[int]
+        :returns: Whether each message was accepted onto the outgoing queue. If the
+         Connection is pinned to another thread, the messages are submitted to that thread
+         and True is returned for each. If a message then cannot be queued, the callback
+         is run with an error result.
+        :rtype: list[bool]
+        """
+        # pylint: disable=protected-access
+        try:
+            raise self._error
+        except TypeError:
+            pass
+        except Exception as e:
+            _logger.warning("%r", e)
+            raise
+        messages = list(messages)
+        c_messages = [message.get_message() for message in messages]
+        for message in messages:
+            message._on_message_sent = callback
+        timeouts = list(timeout) if isinstance(timeout, (list, tuple)) else [timeout] * len(messages)
+        accepted = self._session._connection.submit(
+            self._transfer, threading.current_thread(), self._sender.send_many, messages,
+            c_messages, timeouts, messages)
+        return [True] * len(messages) if accepted is None else accepted
+
+    def _transfer(self, caller, operation, messages, *args):
+        """Run a send operation submitted to the Connection. If it is run by the thread
+        the Connection is pinned to rather than the calling thread, the caller has already
+        been told the messages were queued, so any message that could not be added to the
+        outgoing queue is completed with an error through its send callback instead.
+
+        :param caller: The thread that submitted the operation.
+        :type caller: ~threading.Thread
+        :param operation: The send operation of the underlying Sender.
+        :type operation: callable
+        :param messages: The messages being sent.
+        :type messages: list[~uamqp.message.Message]
+        """
+        # pylint: disable=protected-access
+        if threading.current_thread() is caller:
+            return operation(*args)
+        error = RuntimeError("Message sender failed to add message data to outgoing queue.")
         try:
-            self._session._connection.lock(timeout=-1)
-            return self._sender.send(c_message, timeout, message)
-        finally:
-            self._session._connection.release()
+            accepted = operation(*args)
+        except Exception as e:  # pylint: disable=broad-except
+            accepted, error = False, e
+        if not isinstance(accepted, list):
+            accepted = [accepted] * len(messages)
+        for message, sent in zip(messages, accepted):
+            if not sent:
+                _logger.info("Submitted message could not be sent: %r", error)
+                message._on_message_sent(message, constants.MessageSendResult.Error, delivery_state=error)
+        return accepted
 
     def on_state_changed(self, previous_state, new_state):
         """Callback called whenever the underlying Sender undergoes a change
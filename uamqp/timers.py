@@ -0,0 +1,145 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+_logger = logging.getLogger(__name__)
+
+
+class Timer(object):
+    """A repeating timer scheduled on a TimerService. The callback is run every
+    `interval` seconds until it returns False or the timer is cancelled.
+
+    :param service: The service the timer is scheduled on.
+    :type service: ~uamqp.timers.TimerService
+    :param interval: The time in seconds between runs of the callback.
+    :type interval: float
+    :param callback: The callback to run. It takes no arguments.
+    :type callback: callable
+    """
+
+    def __init__(self, service, interval, callback):
+        self.interval = interval
+        self.callback = callback
+        self.cancelled = False
+        self._service = service
+
+    def cancel(self):
+        """Cancel the timer. If the callback is running on another thread,
+        this waits for it to complete.
+        """
+        self._service.cancel(self)
+
+
+class TimerService(object):
+    """A heap of timers run from a single thread. The timers of all the clients in the
+    process, such as their keep-alives, are scheduled on the service returned by
+    `get_timer_service` rather than each client starting a thread of its own. The
+    thread only wakes when the earliest timer is due, and exits once no timers remain.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._timers = []
+        self._sequence = itertools.count()
+        self._thread = None
+        self._running = None
+
+    def __len__(self):
+        with self._condition:
+            return len([t for _, _, t in self._timers if not t.cancelled])
+
+    def _push(self, timer, due):
+        heapq.heappush(self._timers, (due, next(self._sequence), timer))
+
+    def _pop_due(self):
+        """Wait for the earliest timer to become due and remove it from the heap.
+        Returns None if no timers remain. Must be called holding the condition.
+
+        :rtype: tuple[float, ~uamqp.timers.Timer]
+        """
+        while True:
+            while self._timers and self._timers[0][2].cancelled:
+                heapq.heappop(self._timers)
+            if not self._timers:
+                return None
+            due = self._timers[0][0]
+            now = time.time()
+            if due <= now:
+                return due, heapq.heappop(self._timers)[2]
+            self._condition.wait(due - now)
+
+    def schedule(self, interval, callback):
+        """Run a callback every `interval` seconds, until it returns False or the
+        returned timer is cancelled. The callback is run on the service thread, so
+        it should return promptly.
+
+        :param interval: The time in seconds between runs of the callback.
+        :type interval: float
+        :param callback: The callback to run. It takes no arguments.
+        :type callback: callable
+        :rtype: ~uamqp.timers.Timer
+        """
+        timer = Timer(self, interval, callback)
+        with self._condition:
+            self._push(timer, time.time() + interval)
+            if not self._thread:
+                self._thread = threading.Thread(target=self._run, name="uamqp-timers")
+                self._thread.daemon = True
+                self._thread.start()
+            self._condition.notify()
+        return timer
+
+    def cancel(self, timer):
+        """Cancel a timer. If its callback is running on another thread, this waits
+        for it to complete.
+
+        :param timer: The timer to cancel.
+        :type timer: ~uamqp.timers.Timer
+        """
+        with self._condition:
+            timer.cancelled = True
+            self._condition.notify_all()
+            if threading.current_thread() is self._thread:
+                return
+            while self._running is timer:
+                self._condition.wait()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._running = None
+                self._condition.notify_all()
+                popped = self._pop_due()
+                if not popped:
+                    self._thread = None
+                    return
+                due, timer = popped
+                self._running = timer
+            try:
+                repeat = timer.callback() is not False
+            except Exception as e:  # pylint: disable=broad-except
+                _logger.warning("Timer callback %r failed: %r.", timer.callback, e)
+                repeat = False
+            with self._condition:
+                if repeat and not timer.cancelled:
+                    # If the callback overran, skip the missed runs rather than catching up.
+                    self._push(timer, max(due + timer.interval, time.time()))
+
+
+_SERVICE = TimerService()
+
+
+def get_timer_service():
+    """Get the timer service shared by all the clients in the process.
+
+    :rtype: ~uamqp.timers.TimerService
+    """
+    return _SERVICE